@@ -20,6 +20,7 @@ UTILISATION:
     app = create_app(settings=test_settings)
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -324,6 +325,35 @@ def configure_lifecycle(app: FastAPI) -> None:
         except Exception as e:
             logger.error(f"Error stopping scheduler: {e}")
 
+        # Envoyer les notifications de trades encore en file ou en cours
+        try:
+            from src.infrastructure.notifications.notification_queue import (
+                DRAIN_TIMEOUT_SECONDS,
+                get_notification_queue,
+            )
+            notification_queue = get_notification_queue()
+            if notification_queue.is_started:
+                await asyncio.wait_for(notification_queue.join(), timeout=DRAIN_TIMEOUT_SECONDS)
+                logger.info("Notification queue drained")
+        except asyncio.TimeoutError:
+            logger.warning("Notification queue not drained before shutdown timeout")
+        except Exception as e:
+            logger.error(f"Error draining notification queue: {e}")
+
+        # Terminer les sauvegardes du cache de news en arrière-plan
+        try:
+            from src.application.services.news_service import get_news_service
+            await get_news_service().flush()
+        except Exception as e:
+            logger.error(f"Error flushing news cache: {e}")
+
+        # Arrêter le pool de calcul des indicateurs
+        try:
+            from src.application.services.technical_calculator import shutdown_indicator_pool
+            shutdown_indicator_pool()
+        except Exception as e:
+            logger.error(f"Error stopping indicator pool: {e}")
+
         # Fermer la connexion à la base de données
         try:
             await close_database()
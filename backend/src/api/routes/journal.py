@@ -23,9 +23,10 @@ from typing import Optional, List
 from datetime import date
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from src.application.services.journal_service import JournalService
+from src.application.services.journal_service import get_journal_service
 from src.infrastructure.database.repositories.trade_repository import Trade, TradeStatus
 from src.infrastructure.database.repositories.journal_repository import JournalEntry
 
@@ -182,15 +183,6 @@ class JournalEntryResponse(BaseModel):
         )
 
 
-# =============================================================================
-# SERVICE
-# =============================================================================
-
-def get_journal_service() -> JournalService:
-    """Factory pour le service de journal."""
-    return JournalService()
-
-
 # =============================================================================
 # TRADES ROUTES
 # =============================================================================
@@ -490,12 +482,14 @@ async def get_recent_lessons(limit: int = Query(10, ge=1, le=50)):
     return await service.get_recent_lessons(limit)
 
 
-@router.get("/dashboard")
+@router.get("/dashboard", response_class=ORJSONResponse)
 async def get_dashboard():
     """
     Retourne un dashboard complet du journal.
 
     Inclut les stats, trades actifs, récents, erreurs et leçons.
+    Le dict (types natifs uniquement) est sérialisé directement par orjson,
+    sans passer par jsonable_encoder.
     """
     service = get_journal_service()
-    return await service.get_dashboard()
+    return ORJSONResponse(await service.get_dashboard())
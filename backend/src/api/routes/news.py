@@ -12,9 +12,10 @@ Endpoints:
 import logging
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from src.application.services.news_service import NewsService
+from src.application.services.news_service import get_news_service
 from src.infrastructure.database.repositories.news_repository import NewsArticle
 
 logger = logging.getLogger(__name__)
@@ -71,15 +72,6 @@ class SummaryRequest(BaseModel):
     limit_per_ticker: int = Field(5, ge=1, le=20)
 
 
-# =============================================================================
-# SERVICE
-# =============================================================================
-
-def get_news_service() -> NewsService:
-    """Factory pour le service de news."""
-    return NewsService()
-
-
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -157,12 +149,13 @@ async def get_ticker_sentiment(ticker: str):
         raise HTTPException(status_code=503, detail="Service temporairement indisponible")
 
 
-@router.post("/summary")
+@router.post("/summary", response_class=ORJSONResponse)
 async def get_news_summary(request: SummaryRequest):
     """
     Récupère un résumé des actualités pour plusieurs tickers.
 
-    Maximum 10 tickers par requête.
+    Maximum 10 tickers par requête. Le dictionnaire (types JSON natifs)
+    est sérialisé directement par orjson, sans jsonable_encoder.
     """
     service = get_news_service()
 
@@ -171,7 +164,7 @@ async def get_news_summary(request: SummaryRequest):
             tickers=request.tickers,
             limit_per_ticker=request.limit_per_ticker,
         )
-        return summary
+        return ORJSONResponse(summary)
     except Exception as e:
         logger.exception(f"Error fetching news summary: {e}")
         raise HTTPException(status_code=503, detail="Service temporairement indisponible")
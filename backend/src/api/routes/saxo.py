@@ -8,11 +8,13 @@ Architecture propre:
 """
 
 import logging
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, HTTPException, Query
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.config.settings import get_settings
@@ -460,6 +462,85 @@ async def get_portfolio():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _load_enhanced_base(
+    client: SaxoApiClient,
+    token: SaxoToken,
+) -> Tuple[List[dict], float, float, Optional[str]]:
+    """
+    Recupere les positions Saxo au format attendu par l'analyse enrichie.
+
+    Returns:
+        Tuple (positions, valeur totale, P&L total, account_key)
+    """
+    client_info = client.get_client_info(token.access_token)
+    client_key = client_info.get("ClientKey")
+
+    if not client_key:
+        raise HTTPException(status_code=404, detail="Client non trouve")
+
+    accounts = client.get_accounts(token.access_token, client_key)
+    account_key = accounts[0].get("AccountKey") if accounts else None
+
+    positions_data = client.get_positions(token.access_token, client_key)
+
+    # Construire les positions de base
+    positions = []
+    total_value = 0
+    total_pnl = 0
+
+    for pos in positions_data:
+        base = pos.get("PositionBase", {})
+        view = pos.get("PositionView", {})
+        display = pos.get("DisplayAndFormat", {})
+
+        symbol = display.get("Symbol", "")
+        if not symbol:
+            symbol = f"UIC:{base.get('Uic', 'N/A')}"
+
+        quantity = base.get("Amount", 0) or 0
+        current_price = view.get("CurrentPrice", 0) or 0
+        avg_price = view.get("AverageOpenPrice", 0) or base.get("OpenPrice", 0) or 0
+        value = view.get("MarketValue", 0) or view.get("Exposure", 0) or 0
+        if value == 0 and current_price > 0:
+            value = current_price * abs(quantity)
+        pnl = view.get("ProfitLossOnTrade", 0) or 0
+        pnl_percent = view.get("ProfitLossOnTradeInPercentage", 0) or 0
+
+        if pnl_percent == 0 and avg_price > 0 and current_price > 0:
+            pnl_percent = ((current_price - avg_price) / avg_price) * 100
+
+        positions.append({
+            "symbol": symbol,
+            "description": display.get("Description", ""),
+            "quantity": quantity,
+            "current_price": current_price,
+            "average_price": avg_price,
+            "market_value": value,
+            "pnl": pnl,
+            "pnl_percent": round(pnl_percent, 2),
+            "currency": display.get("Currency", "EUR"),
+            "asset_type": base.get("AssetType", "Stock"),
+            "uic": base.get("Uic"),
+        })
+
+        total_value += abs(value)
+        total_pnl += pnl
+
+    return positions, total_value, total_pnl, account_key
+
+
+def _enhanced_summary(positions: List[dict], total_value: float, total_pnl: float) -> dict:
+    """Resume du portefeuille enrichi."""
+    total_pnl_percent = (total_pnl / total_value * 100) if total_value > 0 else 0
+
+    return {
+        "total_positions": len(positions),
+        "total_value": round(total_value, 2),
+        "total_pnl": round(total_pnl, 2),
+        "total_pnl_percent": round(total_pnl_percent, 2),
+    }
+
+
 @router.get("/portfolio/enhanced")
 async def get_enhanced_portfolio():
     """
@@ -479,60 +560,7 @@ async def get_enhanced_portfolio():
     client = get_api_client()
 
     try:
-        # Recuperer le portfolio de base
-        client_info = client.get_client_info(token.access_token)
-        client_key = client_info.get("ClientKey")
-
-        if not client_key:
-            raise HTTPException(status_code=404, detail="Client non trouve")
-
-        accounts = client.get_accounts(token.access_token, client_key)
-        account_key = accounts[0].get("AccountKey") if accounts else None
-
-        positions_data = client.get_positions(token.access_token, client_key)
-
-        # Construire les positions de base
-        positions = []
-        total_value = 0
-        total_pnl = 0
-
-        for pos in positions_data:
-            base = pos.get("PositionBase", {})
-            view = pos.get("PositionView", {})
-            display = pos.get("DisplayAndFormat", {})
-
-            symbol = display.get("Symbol", "")
-            if not symbol:
-                symbol = f"UIC:{base.get('Uic', 'N/A')}"
-
-            quantity = base.get("Amount", 0) or 0
-            current_price = view.get("CurrentPrice", 0) or 0
-            avg_price = view.get("AverageOpenPrice", 0) or base.get("OpenPrice", 0) or 0
-            value = view.get("MarketValue", 0) or view.get("Exposure", 0) or 0
-            if value == 0 and current_price > 0:
-                value = current_price * abs(quantity)
-            pnl = view.get("ProfitLossOnTrade", 0) or 0
-            pnl_percent = view.get("ProfitLossOnTradeInPercentage", 0) or 0
-
-            if pnl_percent == 0 and avg_price > 0 and current_price > 0:
-                pnl_percent = ((current_price - avg_price) / avg_price) * 100
-
-            positions.append({
-                "symbol": symbol,
-                "description": display.get("Description", ""),
-                "quantity": quantity,
-                "current_price": current_price,
-                "average_price": avg_price,
-                "market_value": value,
-                "pnl": pnl,
-                "pnl_percent": round(pnl_percent, 2),
-                "currency": display.get("Currency", "EUR"),
-                "asset_type": base.get("AssetType", "Stock"),
-                "uic": base.get("Uic"),
-            })
-
-            total_value += abs(value)
-            total_pnl += pnl
+        positions, total_value, total_pnl, account_key = _load_enhanced_base(client, token)
 
         # Analyser chaque position
         analysis_service = PortfolioAnalysisService()
@@ -541,19 +569,17 @@ async def get_enhanced_portfolio():
             portfolio_total_value=total_value,
         )
 
-        total_pnl_percent = (total_pnl / total_value * 100) if total_value > 0 else 0
-
-        return {
-            "positions": [p.to_dict() for p in enhanced_positions],
-            "summary": {
-                "total_positions": len(positions),
-                "total_value": round(total_value, 2),
-                "total_pnl": round(total_pnl, 2),
-                "total_pnl_percent": round(total_pnl_percent, 2),
-            },
+        # Positions (dataclasses a slots) encodees directement par orjson
+        payload = {
+            "positions": enhanced_positions,
+            "summary": _enhanced_summary(positions, total_value, total_pnl),
             "account_key": account_key,
             "analyzed_at": datetime.now().isoformat(),
         }
+        return Response(
+            content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json",
+        )
 
     except HTTPException:
         raise
@@ -562,6 +588,51 @@ async def get_enhanced_portfolio():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/portfolio/enhanced/stream")
+async def stream_enhanced_portfolio():
+    """
+    Portefeuille enrichi en flux SSE (text/event-stream).
+
+    Evenements:
+    - summary: resume du portefeuille (envoye immediatement)
+    - position: une position enrichie, des que son analyse est terminee
+    - done: fin du flux
+    """
+    from src.application.services.portfolio_analysis_service import (
+        PortfolioAnalysisService,
+    )
+
+    token = require_token()
+    client = get_api_client()
+
+    try:
+        positions, total_value, total_pnl, account_key = _load_enhanced_base(client, token)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error fetching enhanced portfolio")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def event(name: str, data: bytes) -> bytes:
+        return b"event: " + name.encode() + b"\ndata: " + data + b"\n\n"
+
+    async def events() -> AsyncIterator[bytes]:
+        yield event("summary", orjson.dumps({
+            "summary": _enhanced_summary(positions, total_value, total_pnl),
+            "account_key": account_key,
+        }))
+        analysis_service = PortfolioAnalysisService()
+        async for enhanced in analysis_service.iter_portfolio(positions, total_value):
+            yield event("position", enhanced.to_json_bytes())
+        yield event("done", orjson.dumps({"analyzed_at": datetime.now().isoformat()}))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/orders")
 async def get_orders(status: str = Query("All")):
     """Recupere les ordres."""
@@ -681,7 +752,7 @@ async def analyze_instrument(symbol: str):
         service = get_instrument_analysis_service()
         analysis = await service.analyze_instrument(symbol.upper())
 
-        return analysis.to_dict()
+        return Response(content=analysis.to_json_bytes(), media_type="application/json")
 
     except ValueError as e:
         logger.warning(f"Analyse impossible pour {symbol}: {e}")
@@ -708,7 +779,6 @@ async def compare_instruments(symbols: str = Query(..., description="Symboles se
     Returns:
         Comparaison des instruments avec scores et rankings
     """
-    import asyncio
     from src.application.services.instrument_analysis_service import (
         get_instrument_analysis_service,
     )
@@ -730,9 +800,8 @@ async def compare_instruments(symbols: str = Query(..., description="Symboles se
     try:
         service = get_instrument_analysis_service()
 
-        # Analyser tous les instruments en parallele
-        tasks = [service.analyze_instrument(symbol) for symbol in symbol_list]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Analyser tous les instruments en parallele (concurrence bornee)
+        results = await service.analyze_many(symbol_list)
 
         comparisons = []
         errors = []
@@ -763,12 +832,17 @@ async def compare_instruments(symbols: str = Query(..., description="Symboles se
         for i, comp in enumerate(comparisons):
             comp["rank"] = i + 1
 
-        return {
+        # Encodage direct en bytes (pas de passage par jsonable_encoder)
+        payload = {
             "comparisons": comparisons,
             "best_pick": comparisons[0]["symbol"] if comparisons else None,
             "errors": errors if errors else None,
-            "analyzed_at": datetime.now().isoformat(),
+            "analyzed_at": datetime.now(),
         }
+        return Response(
+            content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json",
+        )
 
     except Exception as e:
         logger.exception("Erreur comparaison instruments")
@@ -24,7 +24,9 @@ UTILISATION DANS UN USE CASE:
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
+
+import numpy as np
 
 from src.domain.value_objects.ticker import Ticker
 
@@ -53,6 +55,48 @@ class HistoricalDataPoint:
     adj_close: Optional[float] = None
 
 
+@dataclass(frozen=True, slots=True)
+class HistoricalSeries:
+    """
+    Historique OHLCV en colonnes (Structure of Arrays).
+
+    Chaque champ est un tableau NumPy contigu, directement exploitable
+    par les calculs vectorisés (min/max, moyennes, indicateurs) sans
+    parcourir les HistoricalDataPoint un par un.
+
+    Attributs:
+        dates: Dates des points (dtype object)
+        open: Prix d'ouverture
+        high: Prix les plus hauts
+        low: Prix les plus bas
+        close: Prix de clôture
+        volume: Volumes échangés
+    """
+
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_points(cls, points: Sequence[HistoricalDataPoint]) -> "HistoricalSeries":
+        """Construit la série à partir d'une liste de HistoricalDataPoint."""
+        count = len(points)
+        return cls(
+            dates=np.array([p.date for p in points], dtype=object),
+            open=np.fromiter((p.open for p in points), dtype=np.float64, count=count),
+            high=np.fromiter((p.high for p in points), dtype=np.float64, count=count),
+            low=np.fromiter((p.low for p in points), dtype=np.float64, count=count),
+            close=np.fromiter((p.close for p in points), dtype=np.float64, count=count),
+            volume=np.fromiter((p.volume for p in points), dtype=np.int64, count=count),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
 @dataclass
 class StockQuote:
     """
@@ -20,12 +20,23 @@ UTILISATION:
 
 import asyncio
 import logging
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, List, Dict, Any, Optional, Sequence, Tuple, TypeVar, Union
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+from src.application.interfaces.stock_data_provider import (
+    HistoricalDataPoint,
+    HistoricalSeries,
+    StockQuote,
+)
 from src.application.services.technical_calculator import TechnicalCalculator
-from src.application.services.news_service import NewsService
+from src.application.services.news_service import NewsService, get_news_service
 from src.application.services.market_structure_analyzer import MarketStructureAnalyzer
 from src.infrastructure.providers.yahoo_finance_provider import (
     YahooFinanceProvider,
@@ -35,8 +46,39 @@ from src.domain.value_objects.ticker import Ticker
 
 logger = logging.getLogger(__name__)
 
+# Sentiment partage par symbole sur une fenetre d'une minute (appels concurrents fusionnes)
+MAX_SENTIMENT_CACHE_SIZE = 512
+SENTIMENT_CACHE_TTL_SECONDS = 60
+
+# Analyses simultanees max pour les traitements par lot (menage Yahoo Finance)
+DEFAULT_ANALYSIS_CONCURRENCY = 8
+
+T = TypeVar("T")
+
+# Seuils de classification des signaux
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+SENTIMENT_THRESHOLD = 0.2
+
+# Labels indexes par la somme des comparaisons aux seuils (bas, milieu, haut)
+_RSI_LABELS = ("oversold", "neutral", "overbought")
+_BOLLINGER_LABELS = ("below_lower", "middle", "above_upper")
+_SENTIMENT_LABELS = ("bearish", "neutral", "bullish")
+_POSITION_LABELS = ("below", "above")
+
+# Paliers du score de recommandation: bornes inferieures (incluses) et
+# (action, etoiles, resume) correspondants, du plus defavorable au plus favorable
+_SCORE_TIER_BOUNDS = (-20, 0, 20, 40)
+_SCORE_TIERS = (
+    ("AVOID", 1, "Conditions tres defavorables - eviter l'achat"),
+    ("WAIT", 2, "Conditions defavorables - prudence recommandee"),
+    ("WAIT", 3, "Conditions mitigees - attendre une meilleure opportunite"),
+    ("BUY", 4, "Signal d'achat modere - bonnes conditions"),
+    ("BUY", 5, "Signal d'achat fort - conditions favorables"),
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class InstrumentInfo:
     """Informations de base sur l'instrument."""
     symbol: str
@@ -48,10 +90,18 @@ class InstrumentInfo:
     market_cap: Optional[float] = None
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "symbol": self.symbol,
+            "name": self.name,
+            "currency": self.currency,
+            "exchange": self.exchange,
+            "sector": self.sector,
+            "industry": self.industry,
+            "market_cap": self.market_cap,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceData:
     """Donnees de prix actuelles."""
     current_price: float
@@ -67,10 +117,22 @@ class PriceData:
     week_52_low: Optional[float] = None
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "current_price": self.current_price,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "previous_close": self.previous_close,
+            "change": self.change,
+            "change_percent": self.change_percent,
+            "volume": self.volume,
+            "avg_volume": self.avg_volume,
+            "week_52_high": self.week_52_high,
+            "week_52_low": self.week_52_low,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TechnicalAnalysis:
     """Analyse technique complete."""
     # RSI
@@ -108,26 +170,56 @@ class TechnicalAnalysis:
     atr_percent: float
 
     # Support/Resistance
-    support_levels: List[float] = field(default_factory=list)
-    resistance_levels: List[float] = field(default_factory=list)
+    support_levels: Sequence[float] = ()
+    resistance_levels: Sequence[float] = ()
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "rsi": self.rsi,
+            "rsi_signal": self.rsi_signal,
+            "macd_line": self.macd_line,
+            "macd_signal": self.macd_signal,
+            "macd_histogram": self.macd_histogram,
+            "macd_trend": self.macd_trend,
+            "trend": self.trend,
+            "trend_strength": self.trend_strength,
+            "sma_20": self.sma_20,
+            "sma_50": self.sma_50,
+            "sma_200": self.sma_200,
+            "ema_12": self.ema_12,
+            "ema_26": self.ema_26,
+            "price_vs_sma50": self.price_vs_sma50,
+            "price_vs_sma200": self.price_vs_sma200,
+            "bollinger_upper": self.bollinger_upper,
+            "bollinger_middle": self.bollinger_middle,
+            "bollinger_lower": self.bollinger_lower,
+            "bollinger_position": self.bollinger_position,
+            "percent_b": self.percent_b,
+            "atr": self.atr,
+            "atr_percent": self.atr_percent,
+            "support_levels": list(self.support_levels),
+            "resistance_levels": list(self.resistance_levels),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class SentimentAnalysis:
     """Analyse du sentiment marche."""
     sentiment_score: float  # -1 (bearish) a +1 (bullish)
     sentiment_label: str  # "bullish", "bearish", "neutral"
     news_count: int
-    recent_headlines: List[Dict[str, str]] = field(default_factory=list)
+    recent_headlines: Sequence[Dict[str, str]] = ()
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "sentiment_score": self.sentiment_score,
+            "sentiment_label": self.sentiment_label,
+            "news_count": self.news_count,
+            "recent_headlines": list(self.recent_headlines),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingLevels:
     """Niveaux de trading suggeres pour un achat."""
     entry_price: float
@@ -141,24 +233,41 @@ class TradingLevels:
     invalidation_level: float  # Niveau qui invalide le setup
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "entry_price": self.entry_price,
+            "suggested_stop_loss": self.suggested_stop_loss,
+            "suggested_take_profit_1": self.suggested_take_profit_1,
+            "suggested_take_profit_2": self.suggested_take_profit_2,
+            "stop_loss_distance_pct": self.stop_loss_distance_pct,
+            "take_profit_1_distance_pct": self.take_profit_1_distance_pct,
+            "take_profit_2_distance_pct": self.take_profit_2_distance_pct,
+            "risk_reward_ratio": self.risk_reward_ratio,
+            "invalidation_level": self.invalidation_level,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class BuyRecommendation:
     """Recommandation d'achat."""
     action: str  # "BUY", "WAIT", "AVOID"
     confidence: float  # 0-100
     rating: int  # 1-5 etoiles
-    reasoning: List[str] = field(default_factory=list)
-    pros: List[str] = field(default_factory=list)
-    cons: List[str] = field(default_factory=list)
+    reasoning: Sequence[str] = ()
+    pros: Sequence[str] = ()
+    cons: Sequence[str] = ()
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "action": self.action,
+            "confidence": self.confidence,
+            "rating": self.rating,
+            "reasoning": list(self.reasoning),
+            "pros": list(self.pros),
+            "cons": list(self.cons),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class InstrumentAnalysis:
     """Analyse complete d'un instrument."""
     info: InstrumentInfo
@@ -167,7 +276,8 @@ class InstrumentAnalysis:
     sentiment: SentimentAnalysis
     trading_levels: TradingLevels
     recommendation: BuyRecommendation
-    analyzed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Horodatage brut : formate en ISO seulement a la serialisation
+    analyzed_at: datetime = field(default_factory=datetime.now)
 
     def to_dict(self) -> Dict:
         return {
@@ -177,9 +287,18 @@ class InstrumentAnalysis:
             "sentiment": self.sentiment.to_dict(),
             "trading_levels": self.trading_levels.to_dict(),
             "recommendation": self.recommendation.to_dict(),
-            "analyzed_at": self.analyzed_at,
+            "analyzed_at": self.analyzed_at.isoformat(),
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialise directement en JSON (bytes) via orjson.
+
+        orjson encode les dataclasses (tuples et datetime compris) nativement
+        en C, sans construire l'arbre de dicts intermediaire de to_dict().
+        """
+        return orjson.dumps(self, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 class InstrumentAnalysisService:
     """
@@ -198,8 +317,9 @@ class InstrumentAnalysisService:
     ):
         self._yahoo = yahoo_provider or get_yahoo_provider()
         self._tech_calc = technical_calculator or TechnicalCalculator()
-        self._news_service = news_service or NewsService()
+        self._news_service = news_service or get_news_service()
         self._structure = structure_analyzer or MarketStructureAnalyzer()
+        self._sentiment_cache: OrderedDict[Tuple[str, int], asyncio.Future] = OrderedDict()
 
     async def analyze_instrument(self, symbol: str) -> InstrumentAnalysis:
         """
@@ -213,29 +333,34 @@ class InstrumentAnalysisService:
         """
         ticker = Ticker(symbol)
 
-        # Lancer toutes les analyses en parallele
-        info_task = self._get_instrument_info(ticker)
-        price_task = self._get_price_data(ticker)
-        technical_task = self._get_technical_analysis(ticker)
-        sentiment_task = self._get_sentiment_analysis(symbol)
-
-        results = await asyncio.gather(
-            info_task,
-            price_task,
-            technical_task,
-            sentiment_task,
-            return_exceptions=True,
-        )
-
-        info = results[0] if not isinstance(results[0], Exception) else self._default_info(symbol)
-        price = results[1] if not isinstance(results[1], Exception) else None
-        technical = results[2] if not isinstance(results[2], Exception) else None
-        sentiment = results[3] if not isinstance(results[3], Exception) else self._default_sentiment(symbol)
+        # Demarrer immediatement les appels IO independants
+        info_task = asyncio.create_task(self._get_instrument_info(ticker))
+        sentiment_task = asyncio.create_task(self._get_sentiment_analysis(symbol))
+        quote_task = asyncio.create_task(self._yahoo.get_current_quote(ticker))
 
-        # Log des erreurs
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"Erreur analyse {symbol} (task {i}): {result}")
+        # Historique recupere une seule fois, partage par prix et technique
+        historical = await self._await_or_default(
+            self._get_historical_data(ticker), [], symbol, "historique"
+        )
+        technical_task = asyncio.create_task(self._get_technical_analysis(ticker, historical))
+
+        quote = await self._await_or_default(quote_task, None, symbol, "cotation")
+        price = None
+        if quote is not None:
+            try:
+                price = self._get_price_data(
+                    ticker, quote, HistoricalSeries.from_points(historical)
+                )
+            except Exception as e:
+                logger.warning(f"Erreur analyse {symbol} (prix): {e}")
+
+        technical = await self._await_or_default(technical_task, None, symbol, "technique")
+        info = await self._await_or_default(
+            info_task, self._default_info(symbol), symbol, "info"
+        )
+        sentiment = await self._await_or_default(
+            sentiment_task, self._default_sentiment(symbol), symbol, "sentiment"
+        )
 
         if price is None or technical is None:
             raise ValueError(f"Impossible d'analyser {symbol}: donnees insuffisantes")
@@ -257,6 +382,56 @@ class InstrumentAnalysisService:
             recommendation=recommendation,
         )
 
+    async def analyze_many(
+        self,
+        symbols: List[str],
+        concurrency: int = DEFAULT_ANALYSIS_CONCURRENCY,
+    ) -> List[Union[InstrumentAnalysis, Exception]]:
+        """
+        Analyse plusieurs instruments avec une concurrence bornee.
+
+        Args:
+            symbols: Symboles a analyser
+            concurrency: Nombre maximum d'analyses simultanees
+
+        Returns:
+            Resultats dans l'ordre des symboles (Exception en cas d'echec)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze_one(symbol: str) -> InstrumentAnalysis:
+            async with semaphore:
+                return await self.analyze_instrument(symbol)
+
+        return await asyncio.gather(
+            *(analyze_one(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+
+    async def _await_or_default(
+        self,
+        awaitable: Awaitable[T],
+        default: T,
+        symbol: str,
+        label: str,
+    ) -> T:
+        """Attend une tache d'analyse et retourne la valeur par defaut en cas d'erreur."""
+        try:
+            return await awaitable
+        except Exception as e:
+            logger.warning(f"Erreur analyse {symbol} ({label}): {e}")
+            return default
+
+    async def _get_historical_data(self, ticker: Ticker) -> List[HistoricalDataPoint]:
+        """
+        Recupere l'historique 1 an.
+
+        Pas de cache ici: le provider garde deja les historiques avec un TTL
+        court, ce qui evite de figer la derniere bougie (ouverture, plus
+        haut/bas, cloture precedente) pour toute la journee.
+        """
+        return await self._yahoo.get_historical_data(ticker, days=365)
+
     async def _get_instrument_info(self, ticker: Ticker) -> InstrumentInfo:
         """Recupere les informations de base de l'instrument."""
         try:
@@ -275,46 +450,48 @@ class InstrumentAnalysisService:
             logger.warning(f"Metadata non disponible pour {ticker.value}: {e}")
             return self._default_info(ticker.value)
 
-    async def _get_price_data(self, ticker: Ticker) -> PriceData:
-        """Recupere les donnees de prix actuelles."""
-        quote = await self._yahoo.get_current_quote(ticker)
-        historical = await self._yahoo.get_historical_data(ticker, days=365)
-
-        if not historical:
+    def _get_price_data(
+        self,
+        ticker: Ticker,
+        quote: StockQuote,
+        series: HistoricalSeries,
+    ) -> PriceData:
+        """Calcule les donnees de prix actuelles a partir de la cotation."""
+        if not len(series):
             raise ValueError(f"Donnees historiques non disponibles pour {ticker.value}")
 
-        # Calculer les stats
-        prices = [h.close for h in historical]
-        week_52_high = max(prices) if prices else None
-        week_52_low = min(prices) if prices else None
-        volumes = [h.volume for h in historical[-20:]]  # 20 derniers jours
-        avg_volume = int(sum(volumes) / len(volumes)) if volumes else None
+        # Calculer les stats (reductions NumPy sur colonnes contigues)
+        closes = series.close
+        week_52_high = float(closes.max())
+        week_52_low = float(closes.min())
+        avg_volume = int(series.volume[-20:].mean())  # 20 derniers jours
 
         # Derniere bougie
-        latest = historical[-1]
-        prev_close = historical[-2].close if len(historical) > 1 else latest.close
+        prev_close = float(closes[-2]) if len(closes) > 1 else float(closes[-1])
 
         change = quote.price - prev_close
         change_pct = (change / prev_close * 100) if prev_close > 0 else 0
 
         return PriceData(
             current_price=round(quote.price, 2),
-            open=round(latest.open, 2),
-            high=round(latest.high, 2),
-            low=round(latest.low, 2),
+            open=round(float(series.open[-1]), 2),
+            high=round(float(series.high[-1]), 2),
+            low=round(float(series.low[-1]), 2),
             previous_close=round(prev_close, 2),
             change=round(change, 2),
             change_percent=round(change_pct, 2),
-            volume=latest.volume,
+            volume=int(series.volume[-1]),
             avg_volume=avg_volume,
             week_52_high=round(week_52_high, 2) if week_52_high else None,
             week_52_low=round(week_52_low, 2) if week_52_low else None,
         )
 
-    async def _get_technical_analysis(self, ticker: Ticker) -> TechnicalAnalysis:
+    async def _get_technical_analysis(
+        self,
+        ticker: Ticker,
+        historical: List[HistoricalDataPoint],
+    ) -> TechnicalAnalysis:
         """Calcule l'analyse technique complete."""
-        historical = await self._yahoo.get_historical_data(ticker, days=365)
-
         if len(historical) < 50:
             raise ValueError(f"Donnees insuffisantes pour {ticker.value}: {len(historical)} points")
 
@@ -325,12 +502,7 @@ class InstrumentAnalysisService:
 
         # RSI signal
         rsi = indicators.rsi.value
-        if rsi > 70:
-            rsi_signal = "overbought"
-        elif rsi < 30:
-            rsi_signal = "oversold"
-        else:
-            rsi_signal = "neutral"
+        rsi_signal = _RSI_LABELS[(rsi >= RSI_OVERSOLD) + (rsi > RSI_OVERBOUGHT)]
 
         # MACD trend
         macd_hist = indicators.macd.histogram
@@ -354,90 +526,121 @@ class InstrumentAnalysisService:
             trend_strength = "weak"
 
         # Position vs MAs
-        price_vs_sma50 = "above" if ma.current_price > ma.sma_50 else "below"
-        price_vs_sma200 = "above" if ma.current_price > ma.sma_200 else "below"
+        price_vs_sma50 = _POSITION_LABELS[ma.current_price > ma.sma_50]
+        price_vs_sma200 = _POSITION_LABELS[ma.current_price > ma.sma_200]
 
         # Bollinger position
         bb = indicators.bollinger
-        if bb.current_price > bb.upper_band:
-            bb_position = "above_upper"
-        elif bb.current_price < bb.lower_band:
-            bb_position = "below_lower"
-        else:
-            bb_position = "middle"
+        bb_position = _BOLLINGER_LABELS[
+            (bb.current_price >= bb.lower_band) + (bb.current_price > bb.upper_band)
+        ]
 
-        # Support/resistance
-        support_levels = []
-        resistance_levels = []
+        # Support/resistance (3 niveaux les plus proches de chaque cote)
+        support_levels: Tuple[float, ...] = ()
+        resistance_levels: Tuple[float, ...] = ()
         try:
-            structure = await self._structure.analyze(ticker.value, historical)
-            if structure:
-                support_levels = [round(z.lower, 2) for z in (structure.demand_zones or [])][:3]
-                resistance_levels = [round(z.upper, 2) for z in (structure.supply_zones or [])][:3]
-        except Exception:
-            pass
+            supports, resistances = await self._structure.find_key_levels(
+                ticker.value, historical, max_levels=3
+            )
+            support_levels = tuple(round(level, 2) for level in supports)
+            resistance_levels = tuple(round(level, 2) for level in resistances)
+        except Exception as e:
+            logger.debug(f"Structure non disponible pour {ticker.value}: {e}")
+
+        # Arrondis groupes en un seul appel vectorise
+        (
+            rsi_r, sma_20, sma_50, sma_200, ema_12, ema_26,
+            bb_upper, bb_middle, bb_lower, percent_b, atr, atr_percent,
+        ) = np.round([
+            rsi, ma.sma_20, ma.sma_50, ma.sma_200, ma.ema_12, ma.ema_26,
+            bb.upper_band, bb.middle_band, bb.lower_band, bb.percent_b,
+            indicators.atr, indicators.atr_percent,
+        ], 2).tolist()
+        macd_line, macd_signal, macd_histogram = np.round([
+            indicators.macd.macd_line, indicators.macd.signal_line, macd_hist,
+        ], 4).tolist()
 
         return TechnicalAnalysis(
-            rsi=round(rsi, 2),
+            rsi=rsi_r,
             rsi_signal=rsi_signal,
-            macd_line=round(indicators.macd.macd_line, 4),
-            macd_signal=round(indicators.macd.signal_line, 4),
-            macd_histogram=round(macd_hist, 4),
+            macd_line=macd_line,
+            macd_signal=macd_signal,
+            macd_histogram=macd_histogram,
             macd_trend=macd_trend,
             trend=trend,
             trend_strength=trend_strength,
-            sma_20=round(ma.sma_20, 2),
-            sma_50=round(ma.sma_50, 2),
-            sma_200=round(ma.sma_200, 2),
-            ema_12=round(ma.ema_12, 2),
-            ema_26=round(ma.ema_26, 2),
+            sma_20=sma_20,
+            sma_50=sma_50,
+            sma_200=sma_200,
+            ema_12=ema_12,
+            ema_26=ema_26,
             price_vs_sma50=price_vs_sma50,
             price_vs_sma200=price_vs_sma200,
-            bollinger_upper=round(bb.upper_band, 2),
-            bollinger_middle=round(bb.middle_band, 2),
-            bollinger_lower=round(bb.lower_band, 2),
+            bollinger_upper=bb_upper,
+            bollinger_middle=bb_middle,
+            bollinger_lower=bb_lower,
             bollinger_position=bb_position,
-            percent_b=round(bb.percent_b, 2) if hasattr(bb, 'percent_b') else 0.5,
-            atr=round(indicators.atr, 2),
-            atr_percent=round(indicators.atr_percent, 2),
+            percent_b=percent_b,
+            atr=atr,
+            atr_percent=atr_percent,
             support_levels=support_levels,
             resistance_levels=resistance_levels,
         )
 
     async def _get_sentiment_analysis(self, symbol: str) -> SentimentAnalysis:
-        """Analyse du sentiment via les news."""
+        """
+        Analyse du sentiment via les news, mise en cache par (symbole, minute).
+
+        Les appels concurrents pour un meme symbole partagent une seule
+        requete en cours. Les echecs ne sont pas conserves en cache.
+        """
+        key = (symbol, int(time.time() // SENTIMENT_CACHE_TTL_SECONDS))
+        future = self._sentiment_cache.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_sentiment(symbol))
+            self._sentiment_cache[key] = future
+            if len(self._sentiment_cache) > MAX_SENTIMENT_CACHE_SIZE:
+                self._sentiment_cache.popitem(last=False)
+        else:
+            self._sentiment_cache.move_to_end(key)
+
         try:
-            news_articles = await self._news_service.get_news_for_ticker(symbol, limit=10)
-
-            if not news_articles:
-                return self._default_sentiment(symbol)
-
-            scores = [a.sentiment_score for a in news_articles if hasattr(a, 'sentiment_score')]
-            avg_score = sum(scores) / len(scores) if scores else 0.0
-
-            if avg_score > 0.2:
-                label = "bullish"
-            elif avg_score < -0.2:
-                label = "bearish"
-            else:
-                label = "neutral"
-
-            headlines = [
-                {"headline": a.headline, "source": getattr(a, 'source', 'Unknown')}
-                for a in news_articles[:5]
-                if hasattr(a, 'headline')
-            ]
-
-            return SentimentAnalysis(
-                sentiment_score=round(avg_score, 2),
-                sentiment_label=label,
-                news_count=len(news_articles),
-                recent_headlines=headlines,
-            )
+            return await asyncio.shield(future)
         except Exception as e:
+            if self._sentiment_cache.get(key) is future:
+                del self._sentiment_cache[key]
             logger.debug(f"Sentiment non disponible pour {symbol}: {e}")
             return self._default_sentiment(symbol)
 
+    async def _fetch_sentiment(self, symbol: str) -> SentimentAnalysis:
+        """Recupere les news et calcule le sentiment moyen."""
+        news_articles = await self._news_service.get_news_for_ticker(symbol, limit=10)
+
+        if not news_articles:
+            return self._default_sentiment(symbol)
+
+        scores = np.fromiter(
+            (a.sentiment_score for a in news_articles if a.sentiment_score is not None),
+            dtype=np.float64,
+        )
+        avg_score = float(scores.mean()) if scores.size else 0.0
+
+        label = _SENTIMENT_LABELS[
+            (avg_score >= -SENTIMENT_THRESHOLD) + (avg_score > SENTIMENT_THRESHOLD)
+        ]
+
+        headlines = tuple(
+            {"headline": a.headline, "source": a.source or "Unknown"}
+            for a in news_articles[:5]
+        )
+
+        return SentimentAnalysis(
+            sentiment_score=round(avg_score, 2),
+            sentiment_label=label,
+            news_count=len(news_articles),
+            recent_headlines=headlines,
+        )
+
     def _calculate_trading_levels(
         self,
         current_price: float,
@@ -448,8 +651,8 @@ class InstrumentAnalysisService:
         atr_sl = current_price - (2 * technical.atr)  # 2 ATR sous le prix
 
         # Utiliser le support le plus proche si disponible
-        if technical.support_levels:
-            nearest_support = max(s for s in technical.support_levels if s < current_price)
+        nearest_support = self._nearest_support(technical.support_levels, current_price)
+        if nearest_support > 0:
             sl = min(atr_sl, nearest_support * 0.98)  # 2% sous le support
         else:
             sl = atr_sl
@@ -496,19 +699,25 @@ class InstrumentAnalysisService:
         pros = []
         cons = []
 
+        # Scalaires lus une seule fois (evite les acces attributs repetes)
+        rsi = technical.rsi
+        macd_hist = technical.macd_histogram
+        atr_percent = technical.atr_percent
+        current_price = price.current_price
+
         # === Analyse RSI (20% du score) ===
-        if technical.rsi < 30:
+        if rsi < 30:
             score += 25
-            pros.append(f"RSI survendu ({technical.rsi:.0f}) - opportunite d'achat")
-        elif technical.rsi < 40:
+            pros.append(f"RSI survendu ({rsi:.0f}) - opportunite d'achat")
+        elif rsi < 40:
             score += 10
-            pros.append(f"RSI en zone basse ({technical.rsi:.0f})")
-        elif technical.rsi > 70:
+            pros.append(f"RSI en zone basse ({rsi:.0f})")
+        elif rsi > 70:
             score -= 25
-            cons.append(f"RSI surchauffe ({technical.rsi:.0f}) - risque de correction")
-        elif technical.rsi > 60:
+            cons.append(f"RSI surchauffe ({rsi:.0f}) - risque de correction")
+        elif rsi > 60:
             score -= 5
-            cons.append(f"RSI eleve ({technical.rsi:.0f})")
+            cons.append(f"RSI eleve ({rsi:.0f})")
 
         # === Analyse MACD (25% du score) ===
         if technical.macd_trend == "bullish":
@@ -519,7 +728,7 @@ class InstrumentAnalysisService:
             cons.append("MACD bearish - momentum negatif")
 
         # Croisement MACD (signal fort)
-        if technical.macd_histogram > 0 and abs(technical.macd_histogram) < 0.1:
+        if 0 < macd_hist < 0.1:
             score += 10
             reasoning.append("Croisement MACD recent - signal d'achat")
 
@@ -556,24 +765,25 @@ class InstrumentAnalysisService:
             cons.append(f"Sentiment marche negatif ({sentiment.sentiment_score:.2f})")
 
         # === Proximite des niveaux cles ===
-        if technical.support_levels:
-            nearest_support = max((s for s in technical.support_levels if s < price.current_price), default=0)
-            if nearest_support > 0:
-                distance_to_support = ((price.current_price - nearest_support) / price.current_price) * 100
-                if distance_to_support < 3:
-                    score += 15
-                    pros.append(f"Proche d'un support ({nearest_support:.2f}) - bon point d'entree")
+        nearest_support = self._nearest_support(technical.support_levels, current_price)
+        if nearest_support > 0:
+            distance_to_support = ((current_price - nearest_support) / current_price) * 100
+            if distance_to_support < 3:
+                score += 15
+                pros.append(f"Proche d'un support ({nearest_support:.2f}) - bon point d'entree")
 
         # === Volatilite ===
-        if technical.atr_percent > 5:
-            cons.append(f"Volatilite elevee (ATR {technical.atr_percent:.1f}%) - risque accru")
-        elif technical.atr_percent < 2:
-            reasoning.append(f"Faible volatilite (ATR {technical.atr_percent:.1f}%)")
+        if atr_percent > 5:
+            cons.append(f"Volatilite elevee (ATR {atr_percent:.1f}%) - risque accru")
+        elif atr_percent < 2:
+            reasoning.append(f"Faible volatilite (ATR {atr_percent:.1f}%)")
 
         # === 52-week position ===
-        if price.week_52_high and price.week_52_low:
-            range_52w = price.week_52_high - price.week_52_low
-            position_in_range = (price.current_price - price.week_52_low) / range_52w if range_52w > 0 else 0.5
+        week_52_high = price.week_52_high
+        week_52_low = price.week_52_low
+        if week_52_high and week_52_low:
+            range_52w = week_52_high - week_52_low
+            position_in_range = (current_price - week_52_low) / range_52w if range_52w > 0 else 0.5
             if position_in_range < 0.3:
                 score += 10
                 pros.append(f"Dans le bas de la fourchette 52 semaines ({position_in_range*100:.0f}%)")
@@ -584,26 +794,8 @@ class InstrumentAnalysisService:
         # === Determiner l'action finale ===
         confidence = min(abs(score), 100)
 
-        if score >= 40:
-            action = "BUY"
-            rating = 5
-            reasoning.insert(0, "Signal d'achat fort - conditions favorables")
-        elif score >= 20:
-            action = "BUY"
-            rating = 4
-            reasoning.insert(0, "Signal d'achat modere - bonnes conditions")
-        elif score >= 0:
-            action = "WAIT"
-            rating = 3
-            reasoning.insert(0, "Conditions mitigees - attendre une meilleure opportunite")
-        elif score >= -20:
-            action = "WAIT"
-            rating = 2
-            reasoning.insert(0, "Conditions defavorables - prudence recommandee")
-        else:
-            action = "AVOID"
-            rating = 1
-            reasoning.insert(0, "Conditions tres defavorables - eviter l'achat")
+        action, rating, summary = _SCORE_TIERS[bisect_right(_SCORE_TIER_BOUNDS, score)]
+        reasoning.insert(0, summary)
 
         return BuyRecommendation(
             action=action,
@@ -614,6 +806,15 @@ class InstrumentAnalysisService:
             cons=cons,
         )
 
+    @staticmethod
+    def _nearest_support(support_levels: Sequence[float], current_price: float) -> float:
+        """Support le plus proche sous le prix (0 si aucun)."""
+        nearest = 0.0
+        for level in support_levels:
+            if nearest < level < current_price:
+                nearest = level
+        return nearest
+
     def _default_info(self, symbol: str) -> InstrumentInfo:
         """Info par defaut si non disponible."""
         return InstrumentInfo(
@@ -628,11 +829,16 @@ class InstrumentAnalysisService:
             sentiment_score=0.0,
             sentiment_label="unknown",
             news_count=0,
-            recent_headlines=[],
         )
 
 
-# Factory
+# Singleton (partage le cache d'historique entre les requetes)
+_instrument_analysis_service: Optional[InstrumentAnalysisService] = None
+
+
 def get_instrument_analysis_service() -> InstrumentAnalysisService:
-    """Factory pour creer le service d'analyse."""
-    return InstrumentAnalysisService()
+    """Factory retournant le service d'analyse partage."""
+    global _instrument_analysis_service
+    if _instrument_analysis_service is None:
+        _instrument_analysis_service = InstrumentAnalysisService()
+    return _instrument_analysis_service
@@ -5,19 +5,22 @@ Ce service orchestre:
 - La création et gestion des trades
 - Les entrées de journal (analyse pré/post trade)
 - Le calcul des statistiques P&L
-- Les notifications Telegram pour les trades
+- Les notifications Telegram pour les trades (envoyées en arrière-plan)
 
 UTILISATION:
-    from src.application.services.journal_service import JournalService
+    from src.application.services.journal_service import get_journal_service
 
-    service = JournalService()
+    service = get_journal_service()
     trade = await service.create_trade("AAPL", "long", entry_price=150.0)
     await service.close_trade(trade.id, exit_price=160.0)
 """
 
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import date, datetime
+import time
+from enum import Enum
+from functools import lru_cache
+from typing import Awaitable, Callable, Hashable, Optional, List, Dict, Any, Tuple, Type
 
 from src.infrastructure.database.repositories.trade_repository import (
     TradeRepository,
@@ -32,10 +35,33 @@ from src.infrastructure.database.repositories.journal_repository import (
     EmotionalState,
     ProcessCompliance,
 )
-from src.infrastructure.notifications.telegram_service import get_telegram_service
+from src.infrastructure.notifications.notification_queue import (
+    NotificationQueue,
+    get_notification_queue,
+)
 
 logger = logging.getLogger(__name__)
 
+# Durée de vie des statistiques agrégées en cache (invalidées à chaque écriture)
+STATS_CACHE_TTL_SECONDS = 10
+
+# Sentinelle renvoyée par _parse_enum pour une valeur inconnue
+_INVALID = object()
+
+
+@lru_cache(maxsize=64)
+def _parse_enum(enum_cls: Type[Enum], value: str) -> Any:
+    """
+    Convertit une chaîne en membre d'enum, avec mémoïsation.
+
+    Les valeurs invalides sont aussi mises en cache (sentinelle _INVALID),
+    ce qui évite de reconstruire une exception à chaque appel.
+    """
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return _INVALID
+
 
 class JournalService:
     """
@@ -49,6 +75,7 @@ class JournalService:
         self,
         trade_repo: Optional[TradeRepository] = None,
         journal_repo: Optional[JournalRepository] = None,
+        notifier: Optional[NotificationQueue] = None,
     ):
         """
         Initialise le service.
@@ -56,10 +83,23 @@ class JournalService:
         Args:
             trade_repo: Repository des trades.
             journal_repo: Repository des entrées de journal.
+            notifier: File des notifications Telegram. Par défaut le singleton,
+                résolu à la première notification.
         """
         self._trade_repo = trade_repo or TradeRepository()
         self._journal_repo = journal_repo or JournalRepository()
-        self._telegram = get_telegram_service()
+        self._notifier_instance = notifier
+        self._stats_cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._stats_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._stats_generation = 0
+        self._rollup_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    @property
+    def _notifier(self) -> NotificationQueue:
+        """File de notifications, résolue à la première utilisation."""
+        if self._notifier_instance is None:
+            self._notifier_instance = get_notification_queue()
+        return self._notifier_instance
 
     # =========================================================================
     # TRADES
@@ -106,19 +146,16 @@ class JournalService:
             Trade créé
         """
         # Valider la direction
-        try:
-            direction_enum = TradeDirection(direction)
-        except ValueError:
+        direction_enum = _parse_enum(TradeDirection, direction)
+        if direction_enum is _INVALID:
             raise ValueError(f"Direction invalide: {direction}")
 
         # Valider le statut
-        try:
-            status_enum = TradeStatus(status)
-        except ValueError:
+        status_enum = _parse_enum(TradeStatus, status)
+        if status_enum is _INVALID:
             raise ValueError(f"Statut invalide: {status}")
 
-        # Créer le trade
-        trade = await self._trade_repo.create(
+        trade_fields = dict(
             ticker=ticker,
             direction=direction_enum,
             entry_price=entry_price,
@@ -128,30 +165,37 @@ class JournalService:
             status=status_enum,
         )
 
-        # Créer l'entrée de journal si des infos sont fournies
         if setup_type or trade_thesis:
-            await self._journal_repo.create(
-                trade_id=trade.id,
-                setup_type=setup_type,
-                trade_thesis=trade_thesis,
-                market_regime=market_regime,
-                market_bias=market_bias,
-                timeframe=timeframe,
-                confluence_factors=confluence_factors,
-            )
-
-        # Notification si trade actif
+            # Trade + entrée de journal: une seule transaction, un seul commit
+            async with self._trade_repo.db.transaction() as conn:
+                trade = await self._trade_repo.create(**trade_fields, conn=conn)
+                await self._journal_repo.create(
+                    trade_id=trade.id,
+                    setup_type=setup_type,
+                    trade_thesis=trade_thesis,
+                    market_regime=market_regime,
+                    market_bias=market_bias,
+                    timeframe=timeframe,
+                    confluence_factors=confluence_factors,
+                    conn=conn,
+                )
+        else:
+            trade = await self._trade_repo.create(**trade_fields)
+
+        # Notification si trade actif (envoyée en arrière-plan)
         if notify and status_enum == TradeStatus.ACTIVE and entry_price:
-            await self._telegram.send_trade_opened(
-                ticker=ticker,
-                direction=direction,
-                entry_price=entry_price,
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                position_size=position_size,
-            )
-
-        logger.info(f"Trade créé: {ticker} {direction} ({status})")
+            payload = {
+                "ticker": ticker,
+                "direction": direction,
+                "entry_price": entry_price,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "position_size": position_size,
+            }
+            self._notifier.enqueue((trade.id, "opened"), "send_trade_opened", **payload)
+
+        self._invalidate_stats()
+        logger.info("Trade créé: %s %s (%s)", ticker, direction, status)
         return trade
 
     async def get_trade(self, trade_id: str) -> Optional[Trade]:
@@ -176,11 +220,10 @@ class JournalService:
             Liste des trades
         """
         if status:
-            try:
-                status_enum = TradeStatus(status)
-                return await self._trade_repo.get_by_status(status_enum)
-            except ValueError:
+            status_enum = _parse_enum(TradeStatus, status)
+            if status_enum is _INVALID:
                 return []
+            return await self._trade_repo.get_by_status(status_enum)
 
         if ticker:
             return await self._trade_repo.get_by_ticker(ticker)
@@ -208,15 +251,18 @@ class JournalService:
 
         if trade and notify:
             # Utiliser le prix du trade (qui a été mis à jour par activate)
-            await self._telegram.send_trade_opened(
-                ticker=trade.ticker,
-                direction=trade.direction.value,
-                entry_price=trade.entry_price,  # Utiliser le prix du trade, pas le paramètre
-                stop_loss=trade.stop_loss,
-                take_profit=trade.take_profit,
-                position_size=trade.position_size,
-            )
-
+            payload = {
+                "ticker": trade.ticker,
+                "direction": trade.direction.value,
+                "entry_price": trade.entry_price,  # Utiliser le prix du trade, pas le paramètre
+                "stop_loss": trade.stop_loss,
+                "take_profit": trade.take_profit,
+                "position_size": trade.position_size,
+            }
+            self._notifier.enqueue((trade.id, "opened"), "send_trade_opened", **payload)
+            logger.info("Trade activé: %s", payload)
+
+        self._invalidate_stats()
         return trade
 
     async def close_trade(
@@ -241,24 +287,25 @@ class JournalService:
         trade = await self._trade_repo.close(trade_id, exit_price, fees)
 
         if trade and notify:
-            pnl_percent = 0
-            if trade.entry_price and trade.entry_price > 0:
-                pnl_percent = (trade.net_pnl / (trade.entry_price * (trade.position_size or 1))) * 100
-
-            await self._telegram.send_trade_closed(
-                ticker=trade.ticker,
-                direction=trade.direction.value,
-                entry_price=trade.entry_price or 0,
-                exit_price=exit_price,
-                pnl=trade.net_pnl or 0,
-                pnl_percent=pnl_percent,
-            )
-
+            payload = {
+                "ticker": trade.ticker,
+                "direction": trade.direction.value,
+                "entry_price": trade.entry_price or 0,
+                "exit_price": exit_price,
+                "pnl": trade.net_pnl or 0,
+                "pnl_percent": trade.pnl_percent,
+            }
+            self._notifier.enqueue((trade.id, "closed"), "send_trade_closed", **payload)
+            logger.info("Trade clôturé: %s", payload)
+
+        self._invalidate_stats()
         return trade
 
     async def cancel_trade(self, trade_id: str) -> Optional[Trade]:
         """Annule un trade."""
-        return await self._trade_repo.cancel(trade_id)
+        trade = await self._trade_repo.cancel(trade_id)
+        self._invalidate_stats()
+        return trade
 
     async def delete_trade(self, trade_id: str) -> bool:
         """
@@ -270,9 +317,11 @@ class JournalService:
         Returns:
             True si supprimé, False sinon
         """
-        # Supprimer aussi l'entrée de journal associée si elle existe
-        await self._journal_repo.delete_by_trade_id(trade_id)
-        return await self._trade_repo.delete(trade_id)
+        # L'entrée de journal associée est supprimée par la base
+        # (journal_entries.trade_id ... ON DELETE CASCADE)
+        deleted = await self._trade_repo.delete(trade_id)
+        self._invalidate_stats()
+        return deleted
 
     async def update_trade(
         self,
@@ -293,18 +342,23 @@ class JournalService:
         Returns:
             Trade mis à jour ou None
         """
-        trade = await self._trade_repo.get_by_id(trade_id)
-        if trade is None:
-            return None
-
-        if stop_loss is not None:
-            trade.stop_loss = stop_loss
-        if take_profit is not None:
-            trade.take_profit = take_profit
-        if position_size is not None:
-            trade.position_size = position_size
+        fields = {
+            name: value
+            for name, value in (
+                ("stop_loss", stop_loss),
+                ("take_profit", take_profit),
+                ("position_size", position_size),
+            )
+            if value is not None
+        }
+        if not fields:
+            # Rien à modifier: pas d'écriture ni d'invalidation du cache
+            return await self._trade_repo.get_by_id(trade_id)
 
-        return await self._trade_repo.update(trade)
+        trade = await self._trade_repo.update_fields(trade_id, fields)
+        if trade is not None:
+            self._invalidate_stats()
+        return trade
 
     # =========================================================================
     # JOURNAL ENTRIES
@@ -335,7 +389,7 @@ class JournalService:
         Returns:
             Entrée de journal créée
         """
-        return await self._journal_repo.create(
+        entry = await self._journal_repo.create(
             trade_id=trade_id,
             setup_type=setup_type,
             trade_thesis=trade_thesis,
@@ -344,6 +398,8 @@ class JournalService:
             timeframe=timeframe,
             confluence_factors=confluence_factors,
         )
+        self._invalidate_stats()
+        return entry
 
     async def get_journal_entry(self, trade_id: str) -> Optional[JournalEntry]:
         """Récupère l'entrée de journal pour un trade."""
@@ -378,14 +434,18 @@ class JournalService:
         Returns:
             Entrée mise à jour ou None
         """
-        try:
-            exec_q = ExecutionQuality(execution_quality)
-            emot_s = EmotionalState(emotional_state)
-            proc_c = ProcessCompliance(process_compliance)
-        except ValueError as e:
-            raise ValueError(f"Valeur invalide: {e}")
-
-        return await self._journal_repo.add_post_trade_analysis(
+        exec_q = _parse_enum(ExecutionQuality, execution_quality)
+        emot_s = _parse_enum(EmotionalState, emotional_state)
+        proc_c = _parse_enum(ProcessCompliance, process_compliance)
+        for enum_cls, value, parsed in (
+            (ExecutionQuality, execution_quality, exec_q),
+            (EmotionalState, emotional_state, emot_s),
+            (ProcessCompliance, process_compliance, proc_c),
+        ):
+            if parsed is _INVALID:
+                raise ValueError(f"Valeur invalide: {value!r} is not a valid {enum_cls.__name__}")
+
+        entry = await self._journal_repo.add_post_trade_analysis(
             trade_id=trade_id,
             execution_quality=exec_q,
             emotional_state=emot_s,
@@ -396,14 +456,70 @@ class JournalService:
             what_to_improve=what_to_improve,
             lessons_learned=lessons_learned,
         )
+        self._invalidate_stats()
+        return entry
 
     # =========================================================================
     # STATISTICS
     # =========================================================================
 
+    async def _cached_stats(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Retourne un agrégat depuis le cache TTL, ou le calcule.
+
+        Un verrou par clé garantit qu'un seul calcul est lancé quand
+        plusieurs requêtes arrivent en même temps sur un cache expiré.
+        """
+        cached = self._stats_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        lock = self._stats_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._stats_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+            generation = self._stats_generation
+            value = await factory()
+            # Ne pas stocker un résultat calculé avant une écriture concurrente
+            if generation == self._stats_generation:
+                self._stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL_SECONDS, value)
+            return value
+
+    async def _versioned_rollup(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Agrégat coûteux réutilisé tant que les données n'ont pas changé.
+
+        La version combine le compteur d'écritures de ce service et le
+        PRAGMA data_version de SQLite (écritures d'autres connexions).
+        Une seule requête PRAGMA remplace alors la jointure complète.
+        """
+        version = (self._stats_generation, await self._journal_repo.get_data_version())
+        cached = self._rollup_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        value = await factory()
+        self._rollup_cache[key] = (version, value)
+        return value
+
+    def _invalidate_stats(self) -> None:
+        """Vide le cache des statistiques après une écriture."""
+        self._stats_generation += 1
+        self._stats_cache.clear()
+
     async def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques globales de trading."""
-        return await self._trade_repo.get_stats()
+        return await self._cached_stats("stats", self._trade_repo.get_stats)
 
     async def get_monthly_stats(self, year: int, month: int) -> Dict[str, Any]:
         """Retourne les statistiques pour un mois donné."""
@@ -411,19 +527,29 @@ class JournalService:
 
     async def get_stats_by_setup(self) -> List[Dict[str, Any]]:
         """Retourne les statistiques par type de setup."""
-        return await self._journal_repo.get_stats_by_setup()
+        return await self._cached_stats(
+            "stats_by_setup",
+            lambda: self._versioned_rollup("stats_by_setup", self._journal_repo.get_stats_by_setup),
+        )
 
     async def get_emotional_stats(self) -> Dict[str, Dict[str, Any]]:
         """Retourne les statistiques par état émotionnel."""
-        return await self._journal_repo.get_emotional_stats()
+        return await self._cached_stats(
+            "emotional_stats",
+            lambda: self._versioned_rollup("emotional_stats", self._journal_repo.get_emotional_stats),
+        )
 
-    async def get_common_mistakes(self) -> Dict[str, int]:
-        """Retourne les erreurs les plus fréquentes."""
-        return await self._journal_repo.get_common_mistakes()
+    async def get_common_mistakes(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Retourne les erreurs les plus fréquentes (top `limit` si précisé)."""
+        return await self._cached_stats(
+            ("common_mistakes", limit), lambda: self._journal_repo.get_common_mistakes(limit)
+        )
 
     async def get_recent_lessons(self, limit: int = 10) -> List[str]:
         """Retourne les dernières leçons apprises."""
-        return await self._journal_repo.get_lessons(limit)
+        return await self._cached_stats(
+            ("recent_lessons", limit), lambda: self._journal_repo.get_lessons(limit)
+        )
 
     async def get_dashboard(self) -> Dict[str, Any]:
         """
@@ -436,34 +562,44 @@ class JournalService:
         - Erreurs fréquentes
         - Leçons récentes
         """
-        stats = await self.get_stats()
-        active_trades = await self.get_trades(status="active")
-        recent_closed = await self._trade_repo.get_by_status(TradeStatus.CLOSED)
-        mistakes = await self.get_common_mistakes()
-        lessons = await self.get_recent_lessons(5)
+        # Requêtes indépendantes lancées en parallèle (listes bornées et
+        # réduites aux colonnes affichées en SQL)
+        (
+            stats,
+            (active_count, active_trades),
+            recent_closed,
+            mistakes,
+            lessons,
+        ) = await asyncio.gather(
+            self.get_stats(),
+            self._trade_repo.get_dashboard_active(5),
+            self._trade_repo.get_dashboard_closed(5),
+            self.get_common_mistakes(5),
+            self.get_recent_lessons(5),
+        )
 
         return {
             "stats": stats,
-            "active_trades": len(active_trades),
-            "active_trades_list": [
-                {
-                    "id": t.id,
-                    "ticker": t.ticker,
-                    "direction": t.direction.value,
-                    "entry_price": t.entry_price,
-                }
-                for t in active_trades[:5]
-            ],
-            "recent_closed": [
-                {
-                    "id": t.id,
-                    "ticker": t.ticker,
-                    "direction": t.direction.value,
-                    "net_pnl": t.net_pnl,
-                    "r_multiple": t.r_multiple,
-                }
-                for t in recent_closed[:5]
-            ],
-            "top_mistakes": dict(list(mistakes.items())[:5]),
+            "active_trades": active_count,
+            "active_trades_list": active_trades,
+            "recent_closed": recent_closed,
+            "top_mistakes": mistakes,
             "recent_lessons": lessons,
         }
+
+
+# Singleton (repositories et file de notifications partagés entre les requêtes)
+_journal_service: Optional[JournalService] = None
+
+
+def get_journal_service() -> JournalService:
+    """
+    Retourne l'instance singleton du service de journal.
+
+    Returns:
+        JournalService partagé
+    """
+    global _journal_service
+    if _journal_service is None:
+        _journal_service = JournalService()
+    return _journal_service
@@ -18,12 +18,18 @@ UTILISATION :
     structure = await analyzer.analyze(ticker, historical_data)
 """
 
+import asyncio
+import heapq
 import logging
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from src.application.interfaces.stock_data_provider import HistoricalDataPoint
 from src.domain.entities.market_structure import (
@@ -40,6 +46,89 @@ from src.domain.entities.market_structure import (
 
 logger = logging.getLogger(__name__)
 
+# Nombre max d'analyses conservées par analyseur (LRU sur l'instantané des données)
+MAX_ANALYSIS_CACHE_SIZE = 64
+
+# Codes int8 des types de swing (stockage en colonnes) : pivots hauts < _HL <= pivots bas
+_SWING_TYPES = (
+    SwingType.HIGHER_HIGH,
+    SwingType.LOWER_HIGH,
+    SwingType.EQUAL_HIGH,
+    SwingType.HIGHER_LOW,
+    SwingType.LOWER_LOW,
+    SwingType.EQUAL_LOW,
+)
+_HH, _LH, _EH, _HL, _LL, _EL = range(len(_SWING_TYPES))
+# Table [is_high, signe + 1] -> code du swing (comparaison au précédent de même catégorie)
+_SWING_CODE_LUT = np.array([[_LL, _EL, _HL], [_LH, _EH, _HH]], dtype=np.int8)
+
+
+@dataclass(frozen=True)
+class _OHLCArrays:
+    """
+    Colonnes OHLC en tableaux NumPy, extraites une seule fois par analyse.
+
+    Les détecteurs lisent ces tableaux directement au lieu de passer par
+    df['col'].iloc[i] (indexeur pandas + objet scalaire à chaque accès).
+    """
+    dates: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "_OHLCArrays":
+        """Extrait les colonnes d'un DataFrame issu de _to_dataframe."""
+        return cls(
+            dates=df.index,
+            open=df['open'].to_numpy(dtype=np.float64),
+            high=df['high'].to_numpy(dtype=np.float64),
+            low=df['low'].to_numpy(dtype=np.float64),
+            close=df['close'].to_numpy(dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+@dataclass(frozen=True)
+class _SwingArrays:
+    """
+    Swing points en colonnes (Struct-of-Arrays), triés par date.
+
+    Les filtres (highs/lows, types récents, comptages) sont des masques
+    NumPy ; les SwingPoint ne sont construits qu'à la demande (points).
+    """
+    positions: np.ndarray  # Index des bougies dans _OHLCArrays
+    prices: np.ndarray
+    types: np.ndarray  # Codes int8 (index dans _SWING_TYPES)
+    dates: pd.DatetimeIndex  # Dates de toutes les bougies
+    strength: int
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def is_high(self) -> np.ndarray:
+        """Masque des pivots hauts (HH/LH/EH)."""
+        return self.types < _HL
+
+    @cached_property
+    def points(self) -> List[SwingPoint]:
+        """Vue en entités SwingPoint (construite une seule fois)."""
+        return [
+            SwingPoint(
+                date=date,
+                price=price,
+                swing_type=_SWING_TYPES[code],
+                strength=self.strength,
+            )
+            for date, price, code in zip(
+                self.dates[self.positions], self.prices.tolist(), self.types.tolist()
+            )
+        ]
+
 
 class MarketStructureAnalyzer:
     """
@@ -57,6 +146,8 @@ class MarketStructureAnalyzer:
             swing_strength: Nombre de bougies de chaque côté pour confirmer un swing
         """
         self.swing_strength = swing_strength
+        # Clé : (ticker, nb de points, première date, dernière date, dernière clôture)
+        self._analysis_cache: OrderedDict[tuple, MarketStructureAnalysis] = OrderedDict()
 
     async def analyze(
         self,
@@ -77,170 +168,307 @@ class MarketStructureAnalyzer:
             logger.warning(f"Données insuffisantes pour {ticker}: {len(data)} points")
             return None
 
+        # L'analyse ne dépend que des données : même instantané = même résultat
+        cache_key = (ticker, len(data), data[0].date, data[-1].date, data[-1].close)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return cached
+
+        # Calculs pandas/numpy synchrones : exécutés hors de la boucle d'événements
+        analysis = await asyncio.to_thread(self._analyze_sync, ticker, data)
+        if analysis is None:
+            return None
+
+        self._analysis_cache[cache_key] = analysis
+        if len(self._analysis_cache) > MAX_ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+        return analysis
+
+    async def analyze_batch(
+        self,
+        datasets: Dict[str, List[HistoricalDataPoint]],
+    ) -> Dict[str, Optional[MarketStructureAnalysis]]:
+        """
+        Analyse plusieurs actifs en parallèle.
+
+        Chaque analyse tourne dans un thread du pool par défaut : les noyaux
+        NumPy relâchent le GIL, les calculs des différents actifs se recouvrent.
+
+        Args:
+            datasets: Ticker -> données historiques
+
+        Returns:
+            Ticker -> analyse (None si données insuffisantes ou erreur)
+        """
+        tickers = list(datasets)
+        results = await asyncio.gather(
+            *(self.analyze(ticker, datasets[ticker]) for ticker in tickers)
+        )
+        return dict(zip(tickers, results))
+
+    def _analyze_sync(
+        self,
+        ticker: str,
+        data: List[HistoricalDataPoint],
+    ) -> Optional[MarketStructureAnalysis]:
+        """
+        Analyse synchrone complète (CPU-bound).
+
+        Seules la conversion des données et leur validité peuvent échouer :
+        elles sont vérifiées une fois, le reste du calcul est déterministe.
+        """
         try:
-            df = self._to_dataframe(data)
+            bars = _OHLCArrays.from_dataframe(self._to_dataframe(data))
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.error(f"Données invalides pour {ticker}: {e}")
+            return None
+
+        # Prix NaN / infinis : indicateurs inexploitables (et non sérialisables)
+        ohlc = (bars.open, bars.high, bars.low, bars.close)
+        if not all(np.isfinite(column).all() for column in ohlc):
+            logger.warning(f"Prix non finis pour {ticker}, analyse ignorée")
+            return None
 
-            # 1. Calculer ATR pour le contexte de volatilité
-            atr = self._calculate_atr(df)
+        current_price = float(bars.close[-1])
 
-            # 2. Détecter les swing points
-            swing_points = self._detect_swing_points(df)
+        # 1. Calculer ATR pour le contexte de volatilité
+        atr = self._calculate_atr(bars)
 
-            # 3. Identifier la structure (HH/HL/LH/LL)
-            structure_bias, last_high, last_low = self._identify_structure(swing_points)
+        # 2. Détecter les swing points
+        swings = self._detect_swing_points(bars)
 
-            # 4. Détecter BOS et CHoCH
-            bos_level, bos_direction = self._detect_bos(swing_points, df['close'].iloc[-1])
-            choch_detected, choch_level = self._detect_choch(swing_points, df['close'].iloc[-1])
+        # 3. Identifier la structure (HH/HL/LH/LL)
+        structure_bias, last_high, last_low = self._identify_structure(swings)
 
-            # 5. Identifier le régime de marché
-            regime, regime_confidence = self._identify_regime(df, swing_points, atr)
+        # 4. Détecter BOS et CHoCH
+        bos_level, bos_direction = self._detect_bos(swings, current_price)
+        choch_detected, choch_level = self._detect_choch(
+            swings, current_price, structure_bias
+        )
 
-            # 6. Détecter les Fair Value Gaps
-            fvgs = self._detect_fair_value_gaps(df)
-            unfilled_fvgs = [fvg for fvg in fvgs if not fvg.filled]
+        # 5. Identifier le régime de marché
+        regime, regime_confidence = self._identify_regime(
+            bars, swings, atr, structure_bias
+        )
 
-            # 7. Identifier les zones de liquidité
-            liquidity_zones = self._identify_liquidity_zones(swing_points, df['close'].iloc[-1])
+        # 6. Détecter les Fair Value Gaps
+        fvgs = self._detect_fair_value_gaps(bars)
+        unfilled_fvgs = [fvg for fvg in fvgs if not fvg.filled]
 
-            # 8. Détecter les Order Blocks
-            order_blocks = self._detect_order_blocks(df)
+        # 7. Identifier les zones de liquidité
+        liquidity_zones = self._identify_liquidity_zones(swings, current_price)
 
-            # 9. Trouver les niveaux les plus proches
-            current_price = df['close'].iloc[-1]
-            nearest_buy_liq = self._find_nearest_level(
-                [lz.price_level for lz in liquidity_zones if lz.zone_type == LiquidityType.BUY_SIDE],
-                current_price,
-                above=True
-            )
-            nearest_sell_liq = self._find_nearest_level(
-                [lz.price_level for lz in liquidity_zones if lz.zone_type == LiquidityType.SELL_SIDE],
-                current_price,
-                above=False
+        # 8. Détecter les Order Blocks
+        order_blocks = self._detect_order_blocks(bars, atr)
+
+        # 9. Trouver les niveaux les plus proches (buy-side = prix des highs,
+        # sell-side = prix des lows : lus dans les colonnes des swings)
+        is_high = swings.is_high
+        nearest_buy_liq = self._find_nearest_level(
+            swings.prices[is_high], current_price, above=True
+        )
+        nearest_sell_liq = self._find_nearest_level(
+            swings.prices[~is_high], current_price, above=False
+        )
+
+        # 10. Order Blocks les plus proches
+        bullish_obs = [ob for ob in order_blocks if ob.is_bullish and not ob.is_mitigated]
+        bearish_obs = [ob for ob in order_blocks if not ob.is_bullish and not ob.is_mitigated]
+
+        nearest_bullish_ob = None
+        if bullish_obs:
+            bullish_highs = np.fromiter(
+                (ob.high for ob in bullish_obs), dtype=np.float64, count=len(bullish_obs)
             )
+            nearest_bullish_ob = bullish_obs[int(bullish_highs.argmin())]
 
-            # 10. Order Blocks les plus proches
-            bullish_obs = [ob for ob in order_blocks if ob.is_bullish and not ob.is_mitigated]
-            bearish_obs = [ob for ob in order_blocks if not ob.is_bullish and not ob.is_mitigated]
-
-            nearest_bullish_ob = min(bullish_obs, key=lambda x: x.high, default=None) if bullish_obs else None
-            nearest_bearish_ob = max(bearish_obs, key=lambda x: x.low, default=None) if bearish_obs else None
-
-            return MarketStructureAnalysis(
-                ticker=ticker,
-                regime=regime,
-                regime_confidence=regime_confidence,
-                structure_bias=structure_bias,
-                swing_points=swing_points,
-                last_swing_high=last_high,
-                last_swing_low=last_low,
-                bos_level=bos_level,
-                bos_direction=bos_direction,
-                choch_detected=choch_detected,
-                choch_level=choch_level,
-                liquidity_zones=liquidity_zones,
-                nearest_buy_side_liquidity=nearest_buy_liq,
-                nearest_sell_side_liquidity=nearest_sell_liq,
-                fair_value_gaps=fvgs,
-                unfilled_fvg_count=len(unfilled_fvgs),
-                order_blocks=order_blocks,
-                nearest_bullish_ob=nearest_bullish_ob,
-                nearest_bearish_ob=nearest_bearish_ob,
-                current_price=current_price,
-                atr=atr,
+        nearest_bearish_ob = None
+        if bearish_obs:
+            bearish_lows = np.fromiter(
+                (ob.low for ob in bearish_obs), dtype=np.float64, count=len(bearish_obs)
             )
+            nearest_bearish_ob = bearish_obs[int(bearish_lows.argmax())]
+
+        return MarketStructureAnalysis(
+            ticker=ticker,
+            regime=regime,
+            regime_confidence=regime_confidence,
+            structure_bias=structure_bias,
+            swing_points=swings.points,
+            last_swing_high=last_high,
+            last_swing_low=last_low,
+            bos_level=bos_level,
+            bos_direction=bos_direction,
+            choch_detected=choch_detected,
+            choch_level=choch_level,
+            liquidity_zones=liquidity_zones,
+            nearest_buy_side_liquidity=nearest_buy_liq,
+            nearest_sell_side_liquidity=nearest_sell_liq,
+            fair_value_gaps=fvgs,
+            unfilled_fvg_count=len(unfilled_fvgs),
+            order_blocks=order_blocks,
+            nearest_bullish_ob=nearest_bullish_ob,
+            nearest_bearish_ob=nearest_bearish_ob,
+            current_price=current_price,
+            atr=atr,
+        )
+
+    async def find_key_levels(
+        self,
+        ticker: str,
+        data: List[HistoricalDataPoint],
+        max_levels: int = 3,
+    ) -> Tuple[List[float], List[float]]:
+        """
+        Supports et résistances les plus proches du prix actuel.
 
-        except Exception as e:
-            logger.error(f"Erreur analyse structure pour {ticker}: {e}")
-            return None
+        Version courte de analyze() : seuls les swing points sont calculés
+        (pas de FVG, order blocks ni régime), puis on ne garde que les
+        max_levels niveaux les plus proches de chaque côté.
+
+        Args:
+            ticker: Symbole de l'actif
+            data: Données historiques
+            max_levels: Nombre maximum de niveaux par côté
+
+        Returns:
+            (supports sous le prix, du plus proche au plus lointain,
+             résistances au-dessus du prix, du plus proche au plus lointain)
+        """
+        if len(data) < 50:
+            logger.warning(f"Données insuffisantes pour {ticker}: {len(data)} points")
+            return [], []
+
+        bars = _OHLCArrays.from_dataframe(self._to_dataframe(data))
+        current_price = float(bars.close[-1])
+        swings = self._detect_swing_points(bars)
+
+        # Prix lus directement dans les colonnes (aucun SwingPoint construit)
+        is_high = swings.is_high
+        lows = set(swings.prices[~is_high].tolist())
+        highs = set(swings.prices[is_high].tolist())
+
+        supports = heapq.nlargest(max_levels, (p for p in lows if p < current_price))
+        resistances = heapq.nsmallest(max_levels, (p for p in highs if p > current_price))
+
+        return supports, resistances
 
     def _to_dataframe(self, data: List[HistoricalDataPoint]) -> pd.DataFrame:
-        """Convertit les données en DataFrame."""
-        df = pd.DataFrame([
-            {
-                'date': point.date,
-                'open': point.open,
-                'high': point.high,
-                'low': point.low,
-                'close': point.close,
-                'volume': point.volume,
-            }
-            for point in data
-        ])
-        df.set_index('date', inplace=True)
-        df.sort_index(inplace=True)
+        """
+        Convertit les données en DataFrame.
+
+        Les colonnes sont remplies en une passe dans des tableaux préalloués
+        (pas de dict par point) et le tri n'est fait que si les dates ne
+        sont pas déjà croissantes.
+        """
+        n = len(data)
+        dates = [None] * n
+        opens = np.empty(n, dtype=np.float64)
+        highs = np.empty(n, dtype=np.float64)
+        lows = np.empty(n, dtype=np.float64)
+        closes = np.empty(n, dtype=np.float64)
+        volumes = [0] * n
+
+        for i, point in enumerate(data):
+            dates[i] = point.date
+            opens[i] = point.open
+            highs[i] = point.high
+            lows[i] = point.low
+            closes[i] = point.close
+            volumes[i] = point.volume
+
+        df = pd.DataFrame(
+            {'open': opens, 'high': highs, 'low': lows, 'close': closes, 'volume': volumes},
+            index=pd.DatetimeIndex(dates, name='date'),
+        )
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind='stable')
         return df
 
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        """Calcule l'Average True Range."""
-        high = df['high']
-        low = df['low']
-        close = df['close']
+    def _calculate_atr(self, bars: _OHLCArrays, period: int = 14) -> float:
+        """
+        Calcule l'Average True Range.
+
+        Moyenne simple des `period` derniers true ranges : seules les
+        period + 1 dernières bougies sont lues, en une passe sur des
+        tableaux NumPy (pas de Series intermédiaires ni de rolling complet).
+        """
+        if len(bars) < period:
+            return 0
 
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
+        high = bars.high[-period:]
+        low = bars.low[-period:]
+        close = bars.close[-period - 1:]
+        # Clôture précédente (inconnue pour la toute première bougie)
+        prev_close = close[:-1] if len(close) > period else np.concatenate(([np.nan], close[:-1]))
 
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        # Réduction ufunc sur les trois écarts ; fmax (et non maximum) ignore
+        # le NaN de la première bougie, comme le max(axis=1) de pandas
+        true_range = np.fmax.reduce(
+            [high - low, np.abs(high - prev_close), np.abs(low - prev_close)]
+        )
+        atr = true_range.mean()
 
-        return float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else 0
+        return float(atr) if not np.isnan(atr) else 0
 
-    def _detect_swing_points(self, df: pd.DataFrame) -> List[SwingPoint]:
+    def _detect_swing_points(self, bars: _OHLCArrays) -> _SwingArrays:
         """
         Détecte les swing points (pivots hauts et bas).
 
         Un swing high est confirmé quand il y a N bougies plus basses de chaque côté.
         Un swing low est confirmé quand il y a N bougies plus hautes de chaque côté.
         """
-        swing_points = []
         strength = self.swing_strength
+        window = 2 * strength + 1
+        n = len(bars)
 
-        highs = df['high'].values
-        lows = df['low'].values
-        dates = df.index.tolist()
-
-        # Détecter les swing highs
-        for i in range(strength, len(df) - strength):
-            is_swing_high = True
-            for j in range(1, strength + 1):
-                if highs[i] <= highs[i - j] or highs[i] <= highs[i + j]:
-                    is_swing_high = False
-                    break
-
-            if is_swing_high:
-                swing_points.append(SwingPoint(
-                    date=dates[i],
-                    price=float(highs[i]),
-                    swing_type=SwingType.HIGHER_HIGH,  # Sera ajusté après
-                    strength=strength,
-                ))
-
-        # Détecter les swing lows
-        for i in range(strength, len(df) - strength):
-            is_swing_low = True
-            for j in range(1, strength + 1):
-                if lows[i] >= lows[i - j] or lows[i] >= lows[i + j]:
-                    is_swing_low = False
-                    break
-
-            if is_swing_low:
-                swing_points.append(SwingPoint(
-                    date=dates[i],
-                    price=float(lows[i]),
-                    swing_type=SwingType.LOWER_LOW,  # Sera ajusté après
-                    strength=strength,
-                ))
-
-        # Trier par date
-        swing_points.sort(key=lambda x: x.date)
+        if n < window:
+            high_idx = low_idx = np.empty(0, dtype=np.intp)
+        else:
+            # Max / min des N bougies commençant à chaque position, calculés une
+            # seule fois : ils servent de côté gauche (k = i - N) comme de côté
+            # droit (k = i + 1) des bougies testées
+            side_max = sliding_window_view(bars.high, strength).max(axis=1)
+            side_min = sliding_window_view(bars.low, strength).min(axis=1)
+            center_h = bars.high[strength:n - strength]
+            center_l = bars.low[strength:n - strength]
+
+            # Swing high : strictement au-dessus des N bougies de chaque côté
+            high_idx = np.flatnonzero(
+                (center_h > side_max[:n - window + 1])
+                & (center_h > side_max[strength + 1:])
+            ) + strength
+            # Swing low : strictement en-dessous des N bougies de chaque côté
+            low_idx = np.flatnonzero(
+                (center_l < side_min[:n - window + 1])
+                & (center_l < side_min[strength + 1:])
+            ) + strength
+
+        positions = np.concatenate((high_idx, low_idx))
+        prices = np.concatenate((bars.high[high_idx], bars.low[low_idx]))
+        # Marqués HH / LL, ajustés par _classify_swings
+        types = np.concatenate((
+            np.full(len(high_idx), _HH, dtype=np.int8),
+            np.full(len(low_idx), _LL, dtype=np.int8),
+        ))
+
+        # Trier par date (tri stable : high avant low sur une même date)
+        order = np.argsort(bars.dates.asi8[positions], kind='stable')
+
+        swings = _SwingArrays(
+            positions=positions[order],
+            prices=prices[order],
+            types=types[order],
+            dates=bars.dates,
+            strength=strength,
+        )
 
         # Classifier les swings (HH/HL/LH/LL)
-        swing_points = self._classify_swings(swing_points)
-
-        return swing_points
+        return self._classify_swings(swings)
 
-    def _classify_swings(self, swings: List[SwingPoint]) -> List[SwingPoint]:
+    def _classify_swings(self, swings: _SwingArrays) -> _SwingArrays:
         """
         Classifie les swings en HH/HL/LH/LL.
 
@@ -254,53 +482,32 @@ class MarketStructureAnalyzer:
             return swings
 
         # Séparer highs et lows
-        highs = [s for s in swings if s.swing_type in [SwingType.HIGHER_HIGH, SwingType.LOWER_HIGH, SwingType.EQUAL_HIGH]]
-        lows = [s for s in swings if s.swing_type in [SwingType.LOWER_LOW, SwingType.HIGHER_LOW, SwingType.EQUAL_LOW]]
+        is_high = swings.is_high
 
         # Si on n'a que des swings non classifiés, les séparer par prix
-        if not highs and not lows:
+        if not is_high.any() and is_high.all():
             # Tous les swings sont temporairement marqués, on doit les re-classifier
-            sorted_swings = sorted(swings, key=lambda x: x.date)
-
-            # Identifier alternativement high/low
-            last_high = None
-            last_low = None
-
-            for i, swing in enumerate(sorted_swings):
-                # Déterminer si c'est un high ou low basé sur le contexte
-                if i == 0:
-                    # Premier swing - garder tel quel
+            prices = swings.prices
+            types = swings.types.copy()
+
+            # Un swing plus haut que le précédent est probablement un high,
+            # sinon un low ; chacun est comparé au dernier swing de sa catégorie
+            is_up = prices[1:] > prices[:-1]
+            for category in (True, False):
+                idx = np.flatnonzero(is_up == category) + 1
+                if len(idx) < 2:
                     continue
+                # -1 / 0 / +1 -> colonne de la table (plus bas / égal / plus haut)
+                sign = np.sign(prices[idx[1:]] - prices[idx[:-1]]).astype(np.intp)
+                types[idx[1:]] = _SWING_CODE_LUT[int(category), sign + 1]
 
-                prev_swing = sorted_swings[i - 1]
-
-                # Si le swing actuel est plus haut que le précédent
-                if swing.price > prev_swing.price:
-                    # C'est probablement un high
-                    if last_high is not None:
-                        if swing.price > last_high.price:
-                            swing.swing_type = SwingType.HIGHER_HIGH
-                        elif swing.price < last_high.price:
-                            swing.swing_type = SwingType.LOWER_HIGH
-                        else:
-                            swing.swing_type = SwingType.EQUAL_HIGH
-                    last_high = swing
-                else:
-                    # C'est probablement un low
-                    if last_low is not None:
-                        if swing.price > last_low.price:
-                            swing.swing_type = SwingType.HIGHER_LOW
-                        elif swing.price < last_low.price:
-                            swing.swing_type = SwingType.LOWER_LOW
-                        else:
-                            swing.swing_type = SwingType.EQUAL_LOW
-                    last_low = swing
+            return replace(swings, types=types)
 
         return swings
 
     def _identify_structure(
         self,
-        swings: List[SwingPoint]
+        swings: _SwingArrays
     ) -> Tuple[StructureBias, Optional[SwingPoint], Optional[SwingPoint]]:
         """
         Identifie le biais de structure basé sur les swing points.
@@ -312,23 +519,25 @@ class MarketStructureAnalyzer:
             return StructureBias.NEUTRAL, None, None
 
         # Prendre les 10 derniers swings
-        recent_swings = swings[-10:]
+        recent_types = swings.types[-10:]
+        offset = len(swings) - len(recent_types)
 
         # Séparer highs et lows
-        highs = [s for s in recent_swings if "H" in s.swing_type.value and "L" not in s.swing_type.value[-1:]]
-        lows = [s for s in recent_swings if "L" in s.swing_type.value[-1:]]
+        high_pos = np.flatnonzero(recent_types < _HL)
+        low_pos = np.flatnonzero(recent_types >= _HL)
 
-        if not highs or not lows:
+        if not len(high_pos) or not len(low_pos):
             return StructureBias.NEUTRAL, None, None
 
-        last_high = highs[-1] if highs else None
-        last_low = lows[-1] if lows else None
+        last_high = swings.points[offset + high_pos[-1]]
+        last_low = swings.points[offset + low_pos[-1]]
 
         # Compter les HH/HL vs LH/LL
-        hh_count = sum(1 for s in recent_swings if s.swing_type == SwingType.HIGHER_HIGH)
-        hl_count = sum(1 for s in recent_swings if s.swing_type == SwingType.HIGHER_LOW)
-        lh_count = sum(1 for s in recent_swings if s.swing_type == SwingType.LOWER_HIGH)
-        ll_count = sum(1 for s in recent_swings if s.swing_type == SwingType.LOWER_LOW)
+        type_counts = np.bincount(recent_types, minlength=len(_SWING_TYPES))
+        hh_count = int(type_counts[_HH])
+        hl_count = int(type_counts[_HL])
+        lh_count = int(type_counts[_LH])
+        ll_count = int(type_counts[_LL])
 
         bullish_score = hh_count + hl_count
         bearish_score = lh_count + ll_count
@@ -346,7 +555,7 @@ class MarketStructureAnalyzer:
 
     def _detect_bos(
         self,
-        swings: List[SwingPoint],
+        swings: _SwingArrays,
         current_price: float
     ) -> Tuple[Optional[float], Optional[str]]:
         """
@@ -359,80 +568,86 @@ class MarketStructureAnalyzer:
             return None, None
 
         # Trouver le dernier swing high et low significatifs
-        recent_highs = [s for s in swings[-10:] if "H" in s.swing_type.value and "L" not in s.swing_type.value[-1:]]
-        recent_lows = [s for s in swings[-10:] if "L" in s.swing_type.value[-1:]]
+        recent_prices = swings.prices[-10:]
+        recent_is_high = swings.types[-10:] < _HL
+        recent_highs = recent_prices[recent_is_high]
+        recent_lows = recent_prices[~recent_is_high]
 
-        if recent_highs and current_price > recent_highs[-1].price:
-            return recent_highs[-1].price, "bullish"
-        elif recent_lows and current_price < recent_lows[-1].price:
-            return recent_lows[-1].price, "bearish"
+        if len(recent_highs) and current_price > recent_highs[-1]:
+            return float(recent_highs[-1]), "bullish"
+        elif len(recent_lows) and current_price < recent_lows[-1]:
+            return float(recent_lows[-1]), "bearish"
 
         return None, None
 
     def _detect_choch(
         self,
-        swings: List[SwingPoint],
-        current_price: float
+        swings: _SwingArrays,
+        current_price: float,
+        structure: StructureBias,
     ) -> Tuple[bool, Optional[float]]:
         """
         Détecte un Change of Character (CHoCH).
 
         CHoCH = Cassure de structure dans la direction opposée à la tendance.
         C'est le premier signe d'un potentiel retournement.
+
+        Args:
+            swings: Swing points classifiés
+            current_price: Dernier prix
+            structure: Structure dominante (calculée une fois par analyze())
         """
         if len(swings) < 4:
             return False, None
 
-        # Identifier la structure dominante
-        structure, _, _ = self._identify_structure(swings)
+        recent_prices = swings.prices[-6:]
+        recent_types = swings.types[-6:]
 
         if structure == StructureBias.BULLISH:
             # En tendance haussière, CHoCH = cassure du dernier HL
-            recent_lows = [s for s in swings[-6:] if s.swing_type == SwingType.HIGHER_LOW]
-            if recent_lows and current_price < recent_lows[-1].price:
-                return True, recent_lows[-1].price
+            recent_lows = recent_prices[recent_types == _HL]
+            if len(recent_lows) and current_price < recent_lows[-1]:
+                return True, float(recent_lows[-1])
 
         elif structure == StructureBias.BEARISH:
             # En tendance baissière, CHoCH = cassure du dernier LH
-            recent_highs = [s for s in swings[-6:] if s.swing_type == SwingType.LOWER_HIGH]
-            if recent_highs and current_price > recent_highs[-1].price:
-                return True, recent_highs[-1].price
+            recent_highs = recent_prices[recent_types == _LH]
+            if len(recent_highs) and current_price > recent_highs[-1]:
+                return True, float(recent_highs[-1])
 
         return False, None
 
     def _identify_regime(
         self,
-        df: pd.DataFrame,
-        swings: List[SwingPoint],
-        atr: float
+        bars: _OHLCArrays,
+        swings: _SwingArrays,
+        atr: float,
+        structure: StructureBias,
     ) -> Tuple[MarketRegime, float]:
         """
         Identifie le régime de marché actuel.
 
         Utilise :
-        - Structure (swing points)
+        - Structure (swing points, calculée une fois par analyze())
         - Volatilité (ATR)
         - Direction des moyennes mobiles
         """
-        if len(df) < 50:
+        if len(bars) < 50:
             return MarketRegime.TRANSITIONAL, 50.0
 
-        # Calculer les indicateurs de tendance
-        close = df['close']
-        sma_20 = close.rolling(20).mean()
-        sma_50 = close.rolling(50).mean()
-
-        current_price = close.iloc[-1]
-        current_sma20 = sma_20.iloc[-1]
-        current_sma50 = sma_50.iloc[-1]
+        # Calculer les indicateurs de tendance : seules quelques valeurs des
+        # moyennes mobiles sont utilisées, calculées directement sur les tranches
+        close = bars.close
+        current_price = close[-1]
+        current_sma20 = close[-20:].mean()
+        current_sma50 = close[-50:].mean()
+        # SMA 20 d'il y a 9 bougies (= sma_20.iloc[-10])
+        previous_sma20 = close[-29:-9].mean()
 
         # Volatilité relative
-        avg_atr = df['high'].sub(df['low']).rolling(50).mean().iloc[-1]
+        avg_atr = (bars.high[-50:] - bars.low[-50:]).mean()
         volatility_ratio = atr / avg_atr if avg_atr > 0 else 1
 
-        # Identifier la structure
-        structure, _, _ = self._identify_structure(swings)
-
         confidence = 50.0
 
         # Régime de volatilité extrême
@@ -454,7 +669,7 @@ class MarketStructureAnalyzer:
             return MarketRegime.TRENDING_DOWN, confidence
 
         # Range (moyennes plates, structure neutre)
-        sma_20_slope = (sma_20.iloc[-1] - sma_20.iloc[-10]) / sma_20.iloc[-10] if sma_20.iloc[-10] != 0 else 0
+        sma_20_slope = (current_sma20 - previous_sma20) / previous_sma20 if previous_sma20 != 0 else 0
         if abs(sma_20_slope) < 0.02 and structure == StructureBias.NEUTRAL:
             confidence = 70.0
             return MarketRegime.RANGING, confidence
@@ -466,65 +681,66 @@ class MarketStructureAnalyzer:
 
         return MarketRegime.TRANSITIONAL, 50.0
 
-    def _detect_fair_value_gaps(self, df: pd.DataFrame) -> List[FairValueGap]:
+    def _detect_fair_value_gaps(self, bars: _OHLCArrays) -> List[FairValueGap]:
         """
         Détecte les Fair Value Gaps (imbalances).
 
         FVG = Zone où le prix a bougé trop vite, laissant un gap
         entre le high de la bougie 1 et le low de la bougie 3.
         """
-        fvgs = []
-        current_price = df['close'].iloc[-1]
-
-        for i in range(2, len(df)):
-            # FVG Haussier : Low[i] > High[i-2]
-            if df['low'].iloc[i] > df['high'].iloc[i-2]:
-                gap_top = df['low'].iloc[i]
-                gap_bottom = df['high'].iloc[i-2]
-
-                # Vérifier si le gap a été comblé
-                filled = current_price <= gap_top
-                fill_pct = 0
-                if filled:
-                    fill_pct = min(100, ((gap_top - current_price) / (gap_top - gap_bottom)) * 100)
-
-                fvgs.append(FairValueGap(
-                    start_date=df.index[i-2],
-                    end_date=df.index[i],
-                    top=gap_top,
-                    bottom=gap_bottom,
-                    is_bullish=True,
-                    filled=filled,
-                    fill_percentage=fill_pct,
-                ))
-
-            # FVG Baissier : High[i] < Low[i-2]
-            if df['high'].iloc[i] < df['low'].iloc[i-2]:
-                gap_top = df['low'].iloc[i-2]
-                gap_bottom = df['high'].iloc[i]
-
-                # Vérifier si le gap a été comblé
-                filled = current_price >= gap_bottom
-                fill_pct = 0
-                if filled:
-                    fill_pct = min(100, ((current_price - gap_bottom) / (gap_top - gap_bottom)) * 100)
-
-                fvgs.append(FairValueGap(
-                    start_date=df.index[i-2],
-                    end_date=df.index[i],
-                    top=gap_top,
-                    bottom=gap_bottom,
-                    is_bullish=False,
-                    filled=filled,
-                    fill_percentage=fill_pct,
-                ))
+        high = bars.high
+        low = bars.low
+        current_price = float(bars.close[-1])
+
+        # FVG Haussier : Low[i] > High[i-2] / FVG Baissier : High[i] < Low[i-2]
+        # (positions exprimées par rapport à la bougie 1, i-2)
+        bull_idx = np.flatnonzero(low[2:] > high[:-2])
+        bear_idx = np.flatnonzero(high[2:] < low[:-2])
+
+        # Ordre chronologique (haussier avant baissier sur une même bougie),
+        # puis seuls les 20 derniers FVGs sont construits
+        starts = np.concatenate((bull_idx, bear_idx))
+        bearish = np.concatenate((np.zeros(len(bull_idx), dtype=bool), np.ones(len(bear_idx), dtype=bool)))
+        recent = np.lexsort((bearish, starts))[-20:]
+
+        # Colonnes des FVGs retenus, puis construction des entités en une passe
+        sel_start = starts[recent]
+        sel_bearish = bearish[recent]
+        gap_top = np.where(sel_bearish, low[sel_start], low[sel_start + 2])
+        gap_bottom = np.where(sel_bearish, high[sel_start + 2], high[sel_start])
+        # Vérifier si le gap a été comblé
+        filled = np.where(sel_bearish, current_price >= gap_bottom, current_price <= gap_top)
+        fill_ratio = np.where(
+            sel_bearish, current_price - gap_bottom, gap_top - current_price
+        ) / (gap_top - gap_bottom)
+
+        dates = bars.dates
+        fvgs = [
+            FairValueGap(
+                start_date=start_date,
+                end_date=end_date,
+                top=top,
+                bottom=bottom,
+                is_bullish=not is_bearish,
+                filled=is_filled,
+                fill_percentage=min(100, ratio * 100) if is_filled else 0,
+            )
+            for start_date, end_date, top, bottom, is_bearish, is_filled, ratio in zip(
+                dates[sel_start],
+                dates[sel_start + 2],
+                gap_top.tolist(),
+                gap_bottom.tolist(),
+                sel_bearish.tolist(),
+                filled.tolist(),
+                fill_ratio.tolist(),
+            )
+        ]
 
-        # Garder les 20 derniers FVGs
-        return fvgs[-20:]
+        return fvgs
 
     def _identify_liquidity_zones(
         self,
-        swings: List[SwingPoint],
+        swings: _SwingArrays,
         current_price: float
     ) -> List[LiquidityZone]:
         """
@@ -534,33 +750,38 @@ class MarketStructureAnalyzer:
         - Au-dessus des swing highs (buy-side liquidity)
         - En-dessous des swing lows (sell-side liquidity)
         """
-        zones = []
-
-        # Grouper les swings proches (equal highs/lows)
-        highs = [s for s in swings if "H" in s.swing_type.value and "L" not in s.swing_type.value[-1:]]
-        lows = [s for s in swings if "L" in s.swing_type.value[-1:]]
-
-        # Buy-side liquidity (au-dessus des highs)
-        for swing in highs:
-            zones.append(LiquidityZone(
-                price_level=swing.price,
-                zone_type=LiquidityType.BUY_SIDE,
-                strength=swing.strength,
-                last_test=swing.date,
-                created_at=swing.date,
-                is_swept=current_price > swing.price,
-            ))
+        highs: List[SwingPoint] = []
+        lows: List[SwingPoint] = []
+        buy_side: List[LiquidityZone] = []
+        sell_side: List[LiquidityZone] = []
+
+        # Une seule passe : tri highs/lows et création des zones
+        for swing, is_high in zip(swings.points, swings.is_high.tolist()):
+            if is_high:
+                # Buy-side liquidity (au-dessus des highs)
+                highs.append(swing)
+                buy_side.append(LiquidityZone(
+                    price_level=swing.price,
+                    zone_type=LiquidityType.BUY_SIDE,
+                    strength=swing.strength,
+                    last_test=swing.date,
+                    created_at=swing.date,
+                    is_swept=current_price > swing.price,
+                ))
+            else:
+                # Sell-side liquidity (en-dessous des lows)
+                lows.append(swing)
+                sell_side.append(LiquidityZone(
+                    price_level=swing.price,
+                    zone_type=LiquidityType.SELL_SIDE,
+                    strength=swing.strength,
+                    last_test=swing.date,
+                    created_at=swing.date,
+                    is_swept=current_price < swing.price,
+                ))
 
-        # Sell-side liquidity (en-dessous des lows)
-        for swing in lows:
-            zones.append(LiquidityZone(
-                price_level=swing.price,
-                zone_type=LiquidityType.SELL_SIDE,
-                strength=swing.strength,
-                last_test=swing.date,
-                created_at=swing.date,
-                is_swept=current_price < swing.price,
-            ))
+        # Buy-side puis sell-side, comme dans la réponse de l'API
+        zones = buy_side + sell_side
 
         # Détecter les equal highs/lows (liquidité concentrée)
         self._detect_equal_levels(highs, zones, LiquidityType.EQUAL_HIGHS)
@@ -574,88 +795,136 @@ class MarketStructureAnalyzer:
         zones: List[LiquidityZone],
         zone_type: LiquidityType
     ):
-        """Détecte les niveaux égaux (double top/bottom)."""
+        """
+        Détecte les niveaux égaux (double top/bottom).
+
+        Les prix sont triés une fois : pour chaque swing, seuls les voisins
+        dans la bande de tolérance (trouvée par searchsorted) sont comparés,
+        au lieu de toutes les paires (O(N log N) au lieu de O(N²)).
+        """
         tolerance = 0.005  # 0.5% de tolérance
 
-        for i, s1 in enumerate(swings):
-            for s2 in swings[i+1:]:
-                diff = abs(s1.price - s2.price) / s1.price
-                if diff <= tolerance:
-                    # Double niveau trouvé
-                    avg_price = (s1.price + s2.price) / 2
-                    zones.append(LiquidityZone(
-                        price_level=avg_price,
-                        zone_type=zone_type,
-                        strength=s1.strength + s2.strength,
-                        last_test=max(s1.date, s2.date),
-                        created_at=min(s1.date, s2.date),
-                    ))
-
-    def _detect_order_blocks(self, df: pd.DataFrame) -> List[OrderBlock]:
+        if len(swings) < 2:
+            return
+
+        prices = np.fromiter((s.price for s in swings), dtype=np.float64, count=len(swings))
+        order = np.argsort(prices, kind='stable')
+        sorted_prices = prices[order]
+
+        # Pour a <= b, |a - b| / s1 <= tolérance implique b <= a / (1 - tolérance)
+        upper = sorted_prices / (1 - tolerance) * (1 + 1e-12)
+        ends = np.searchsorted(sorted_prices, upper, side='right')
+
+        pairs = []
+        for k in np.flatnonzero(ends > np.arange(1, len(swings) + 1)):
+            for m in range(k + 1, ends[k]):
+                i, j = sorted((int(order[k]), int(order[m])))
+                # Test exact, relatif au premier swing de la paire
+                if abs(swings[i].price - swings[j].price) / swings[i].price <= tolerance:
+                    pairs.append((i, j))
+
+        # Même ordre d'émission que le parcours des paires (i, j) avec i < j
+        pairs.sort()
+        for i, j in pairs:
+            s1, s2 = swings[i], swings[j]
+            # Double niveau trouvé
+            zones.append(LiquidityZone(
+                price_level=(s1.price + s2.price) / 2,
+                zone_type=zone_type,
+                strength=s1.strength + s2.strength,
+                last_test=max(s1.date, s2.date),
+                created_at=min(s1.date, s2.date),
+            ))
+
+    def _detect_order_blocks(self, bars: _OHLCArrays, atr: float) -> List[OrderBlock]:
         """
         Détecte les Order Blocks.
 
         Order Block = Dernière bougie opposée avant un mouvement impulsif.
+
+        Args:
+            bars: Colonnes OHLC
+            atr: ATR déjà calculé par analyze()
         """
-        order_blocks = []
-        current_price = df['close'].iloc[-1]
+        open_ = bars.open
+        high = bars.high
+        low = bars.low
+        close = bars.close
+        current_price = float(close[-1])
 
         # Seuil pour mouvement impulsif (2x ATR)
-        atr = self._calculate_atr(df)
         impulse_threshold = atr * 2
 
-        for i in range(2, len(df) - 1):
-            # Mouvement impulsif haussier
-            move_up = df['close'].iloc[i+1] - df['close'].iloc[i-1]
-            if move_up > impulse_threshold:
-                # Chercher la dernière bougie baissière avant le mouvement
-                for j in range(i, max(0, i-5), -1):
-                    if df['close'].iloc[j] < df['open'].iloc[j]:  # Bougie baissière
-                        ob = OrderBlock(
-                            date=df.index[j],
-                            high=df['high'].iloc[j],
-                            low=df['low'].iloc[j],
-                            is_bullish=True,
-                            is_mitigated=current_price < df['low'].iloc[j],
-                        )
-                        order_blocks.append(ob)
-                        break
-
-            # Mouvement impulsif baissier
-            move_down = df['close'].iloc[i-1] - df['close'].iloc[i+1]
-            if move_down > impulse_threshold:
-                # Chercher la dernière bougie haussière avant le mouvement
-                for j in range(i, max(0, i-5), -1):
-                    if df['close'].iloc[j] > df['open'].iloc[j]:  # Bougie haussière
-                        ob = OrderBlock(
-                            date=df.index[j],
-                            high=df['high'].iloc[j],
-                            low=df['low'].iloc[j],
-                            is_bullish=False,
-                            is_mitigated=current_price > df['high'].iloc[j],
-                        )
-                        order_blocks.append(ob)
-                        break
-
-        # Garder les 10 derniers
-        return order_blocks[-10:]
+        # Bougies testées : i de 2 à n-2, mouvement mesuré de i-1 à i+1
+        positions = np.arange(len(close))
+        i = positions[2:-1]
+        move = close[3:] - close[1:-2]
+
+        # Dernière bougie baissière / haussière à ou avant chaque position (prefix-scan)
+        last_bear = np.maximum.accumulate(np.where(close < open_, positions, -1))
+        last_bull = np.maximum.accumulate(np.where(close > open_, positions, -1))
+
+        # L'order block doit se trouver dans les 5 bougies précédant le mouvement (j >= 1)
+        lookback_start = np.maximum(1, i - 4)
+        bull_i = i[(move > impulse_threshold) & (last_bear[i] >= lookback_start)]
+        bear_i = i[(-move > impulse_threshold) & (last_bull[i] >= lookback_start)]
+
+        # Ordre chronologique (haussier avant baissier sur une même bougie),
+        # puis seuls les 10 derniers order blocks sont construits
+        origins = np.concatenate((bull_i, bear_i))
+        bearish = np.concatenate((np.zeros(len(bull_i), dtype=bool), np.ones(len(bear_i), dtype=bool)))
+        recent = np.lexsort((bearish, origins))[-10:]
+
+        # Bougie de l'order block : dernière bougie haussière avant une impulsion
+        # baissière, dernière bougie baissière avant une impulsion haussière
+        sel_origin = origins[recent]
+        sel_bearish = bearish[recent]
+        j = np.where(sel_bearish, last_bull[sel_origin], last_bear[sel_origin])
+        ob_high = high[j]
+        ob_low = low[j]
+        is_mitigated = np.where(sel_bearish, current_price > ob_high, current_price < ob_low)
+
+        order_blocks = [
+            OrderBlock(
+                date=date,
+                high=block_high,
+                low=block_low,
+                is_bullish=not is_bearish,
+                is_mitigated=mitigated,
+            )
+            for date, block_high, block_low, is_bearish, mitigated in zip(
+                bars.dates[j],
+                ob_high.tolist(),
+                ob_low.tolist(),
+                sel_bearish.tolist(),
+                is_mitigated.tolist(),
+            )
+        ]
+
+        return order_blocks
 
     def _find_nearest_level(
         self,
-        levels: List[float],
+        levels: Union[List[float], np.ndarray],
         current_price: float,
         above: bool = True
     ) -> Optional[float]:
-        """Trouve le niveau le plus proche au-dessus ou en-dessous du prix."""
-        if not levels:
+        """
+        Trouve le niveau le plus proche au-dessus ou en-dessous du prix.
+
+        Les niveaux sont triés puis le prix est positionné par searchsorted.
+        """
+        if len(levels) == 0:
             return None
 
+        sorted_levels = np.sort(np.asarray(levels, dtype=np.float64))
+
         if above:
-            above_levels = [l for l in levels if l > current_price]
-            return min(above_levels) if above_levels else None
+            idx = np.searchsorted(sorted_levels, current_price, side='right')
+            return float(sorted_levels[idx]) if idx < len(sorted_levels) else None
         else:
-            below_levels = [l for l in levels if l < current_price]
-            return max(below_levels) if below_levels else None
+            idx = np.searchsorted(sorted_levels, current_price, side='left') - 1
+            return float(sorted_levels[idx]) if idx >= 0 else None
 
 
 # =============================================================================
@@ -14,10 +14,18 @@ UTILISATION:
     news = await service.get_news_for_ticker("AAPL")
 """
 
+import asyncio
 import logging
-from datetime import date, timedelta
-from typing import Optional, List, Dict, Any
+import re
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from itertools import islice, repeat
+from typing import Optional, Iterable, List, Dict, Any, Set, Tuple
 
+import numpy as np
+
+from src.config.constants import API_TIMEOUT_SECONDS, MAX_CONCURRENT_REQUESTS
 from src.infrastructure.providers.finnhub_provider import (
     FinnhubProvider,
     get_finnhub_provider,
@@ -31,6 +39,27 @@ from src.infrastructure.database.repositories.news_repository import (
 
 logger = logging.getLogger(__name__)
 
+# Nombre max de tickers gardés en mémoire (cache devant SQLite)
+MAX_HOT_CACHE_SIZE = 256
+
+# Mots clés de sentiment
+_POSITIVE_WORDS = ("surge", "gain", "rise", "jump", "beat", "strong", "bullish", "upgrade")
+_NEGATIVE_WORDS = ("drop", "fall", "miss", "weak", "bearish", "downgrade", "plunge", "crash")
+
+# Compilés en une alternance par polarité : un groupe par mot, recherche de
+# sous-chaîne (comme "rise" dans "rises") sans tenir compte de la casse
+_POSITIVE_PATTERN = re.compile("|".join(f"({w})" for w in _POSITIVE_WORDS), re.IGNORECASE)
+_NEGATIVE_PATTERN = re.compile("|".join(f"({w})" for w in _NEGATIVE_WORDS), re.IGNORECASE)
+
+
+# Sentiment indexé par le signe (positifs - négatifs) : 0, 1, -1
+_SENTIMENT_BY_SIGN = (Sentiment.NEUTRAL, Sentiment.POSITIVE, Sentiment.NEGATIVE)
+
+
+def _count_keywords(pattern: re.Pattern, *texts: Optional[str]) -> int:
+    """Nombre de mots clés distincts (groupes du pattern) présents dans les textes."""
+    return len({m.lastindex for text in texts if text for m in pattern.finditer(text)})
+
 
 class NewsService:
     """
@@ -57,43 +86,66 @@ class NewsService:
         """
         self._finnhub = finnhub or get_finnhub_provider()
         self._news_repo = news_repo or NewsRepository()
+        # Ticker -> (expiration monotonic, liste complète ?, articles)
+        self._hot_cache: OrderedDict[str, Tuple[float, bool, List[NewsArticle]]] = OrderedDict()
+        # Ticker -> rafraîchissement Finnhub en cours (partagé entre appelants)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # Sauvegardes en cache lancées en arrière-plan (références fortes contre le GC)
+        self._pending_saves: Set[asyncio.Task] = set()
+
+    def _convert_articles(
+        self,
+        news_list: List[FinnhubNews],
+        tickers: Iterable[str],
+    ) -> List[NewsArticle]:
+        """
+        Convertit un lot de news Finnhub en articles pour le cache.
+
+        Les mots clés sont comptés par article, puis sentiment et score
+        sont calculés pour tout le lot en une fois (NumPy).
 
-    def _convert_to_article(self, news: FinnhubNews, ticker: str) -> NewsArticle:
-        """Convertit une news Finnhub en article pour le cache."""
+        Args:
+            news_list: News Finnhub
+            tickers: Ticker associé à chaque news
+        """
         # Déterminer le sentiment basé sur des mots clés simples
-        headline_lower = news.headline.lower()
-        summary_lower = news.summary.lower()
-        text = headline_lower + " " + summary_lower
-
-        positive_words = ["surge", "gain", "rise", "jump", "beat", "strong", "bullish", "upgrade"]
-        negative_words = ["drop", "fall", "miss", "weak", "bearish", "downgrade", "plunge", "crash"]
-
-        pos_count = sum(1 for w in positive_words if w in text)
-        neg_count = sum(1 for w in negative_words if w in text)
-
-        if pos_count > neg_count:
-            sentiment = Sentiment.POSITIVE
-            sentiment_score = 0.3 + (pos_count * 0.1)
-        elif neg_count > pos_count:
-            sentiment = Sentiment.NEGATIVE
-            sentiment_score = -0.3 - (neg_count * 0.1)
-        else:
-            sentiment = Sentiment.NEUTRAL
-            sentiment_score = 0.0
-
-        return NewsArticle(
-            id=news.id,
-            ticker=ticker.upper(),
-            headline=news.headline,
-            summary=news.summary,
-            source=news.source,
-            url=news.url,
-            image_url=news.image_url,
-            sentiment=sentiment,
-            sentiment_score=max(-1, min(1, sentiment_score)),
-            published_at=news.published_at,
+        # (titre et résumé lus directement, sans copies en minuscules)
+        count = len(news_list)
+        pos_counts = np.fromiter(
+            (_count_keywords(_POSITIVE_PATTERN, n.headline, n.summary) for n in news_list),
+            dtype=np.int64,
+            count=count,
+        )
+        neg_counts = np.fromiter(
+            (_count_keywords(_NEGATIVE_PATTERN, n.headline, n.summary) for n in news_list),
+            dtype=np.int64,
+            count=count,
         )
 
+        # Signe : 1 = positif, -1 = négatif, 0 = neutre
+        signs = np.sign(pos_counts - neg_counts)
+        # Score = signe x (0.3 + 0.1 par mot de la polarité dominante), plafonné à 1 :
+        # l'amplitude étant >= 0.3, une seule borne suffit (pas de branche par article)
+        scores = signs * np.minimum(0.3 + np.maximum(pos_counts, neg_counts) * 0.1, 1.0)
+
+        return [
+            NewsArticle(
+                id=news.id,
+                ticker=ticker.upper(),
+                headline=news.headline,
+                summary=news.summary,
+                source=news.source,
+                url=news.url,
+                image_url=news.image_url,
+                sentiment=_SENTIMENT_BY_SIGN[sign],
+                sentiment_score=score,
+                published_at=news.published_at,
+            )
+            for news, ticker, sign, score in zip(
+                news_list, tickers, signs.tolist(), scores.tolist()
+            )
+        ]
+
     async def get_news_for_ticker(
         self,
         ticker: str,
@@ -117,6 +169,14 @@ class NewsService:
 
         # Vérifier le cache
         if not force_refresh:
+            # Cache mémoire : aucune requête SQLite
+            entry = self._hot_cache.get(ticker)
+            if entry is not None and entry[0] > time.monotonic():
+                _, complete, articles = entry
+                if complete or len(articles) >= limit:
+                    self._hot_cache.move_to_end(ticker)
+                    return articles[:limit]
+
             is_fresh = await self._news_repo.is_cache_fresh(
                 ticker, self.CACHE_DURATION_HOURS
             )
@@ -126,6 +186,7 @@ class NewsService:
                 )
                 if articles:
                     logger.debug(f"Cache hit for {ticker}: {len(articles)} articles")
+                    self._remember(ticker, articles, complete=len(articles) < limit)
                     return articles
 
         # Récupérer depuis Finnhub
@@ -133,21 +194,87 @@ class NewsService:
             logger.warning("Finnhub not configured, returning cached data")
             return await self._news_repo.get_by_ticker(ticker, limit)
 
+        # Un seul appel Finnhub par ticker : les appels concurrents attendent
+        # le rafraîchissement déjà en cours (shield : l'annulation d'un appelant
+        # n'interrompt pas celui des autres)
+        refresh = self._refreshing.get(ticker)
+        if refresh is None:
+            refresh = asyncio.create_task(self._refresh_from_finnhub(ticker))
+            self._refreshing[ticker] = refresh
+            refresh.add_done_callback(lambda _: self._refreshing.pop(ticker, None))
+
+        articles = await asyncio.shield(refresh)
+        if articles:
+            return articles[:limit]
+
+        # Fallback sur le cache
+        return await self._news_repo.get_by_ticker(ticker, limit)
+
+    async def _refresh_from_finnhub(self, ticker: str) -> Optional[List[NewsArticle]]:
+        """
+        Récupère les news d'un ticker depuis Finnhub et les met en cache.
+
+        Args:
+            ticker: Symbole (majuscules)
+
+        Returns:
+            Tous les articles récupérés, ou None si aucun / erreur
+        """
         try:
             news_list = await self._finnhub.get_company_news(ticker)
 
             if news_list:
-                # Convertir et sauvegarder en cache
-                articles = [self._convert_to_article(n, ticker) for n in news_list]
-                await self._news_repo.save_many(articles)
+                # Convertir, puis sauvegarder en cache sans faire attendre l'appelant
+                articles = self._convert_articles(news_list, repeat(ticker))
+                task = asyncio.create_task(self._save_articles(ticker, articles))
+                self._pending_saves.add(task)
+                task.add_done_callback(self._pending_saves.discard)
                 logger.info(f"Fetched {len(articles)} news for {ticker} from Finnhub")
-                return articles[:limit]
+                self._remember(ticker, articles, complete=True)
+                return articles
 
         except Exception as e:
             logger.error(f"Error fetching news from Finnhub for {ticker}: {e}")
 
-        # Fallback sur le cache
-        return await self._news_repo.get_by_ticker(ticker, limit)
+        return None
+
+    async def _save_articles(self, ticker: str, articles: List[NewsArticle]) -> None:
+        """Sauvegarde en cache SQLite (tâche d'arrière-plan, erreurs journalisées)."""
+        try:
+            await self._news_repo.save_many(articles)
+        except Exception as e:
+            logger.error(f"Error saving news cache for {ticker}: {e}")
+
+    async def flush(self) -> None:
+        """Attend la fin des sauvegardes en cache en cours (arrêt de l'application)."""
+        if self._pending_saves:
+            await asyncio.gather(*self._pending_saves, return_exceptions=True)
+
+    def _remember(self, ticker: str, articles: List[NewsArticle], complete: bool) -> None:
+        """
+        Garde les articles en mémoire jusqu'à la fin de leur fraîcheur.
+
+        L'expiration suit le fetched_at le plus récent, comme is_cache_fresh :
+        un article chargé depuis SQLite n'est pas gardé plus longtemps.
+
+        Args:
+            ticker: Symbole (majuscules)
+            articles: Articles frais
+            complete: True si la liste contient tous les articles disponibles
+        """
+        try:
+            newest = max(datetime.fromisoformat(a.fetched_at) for a in articles)
+        except (TypeError, ValueError):
+            return
+
+        ttl = self.CACHE_DURATION_HOURS * 3600 - (datetime.now() - newest).total_seconds()
+        if ttl <= 0:
+            return
+
+        self._hot_cache[ticker] = (time.monotonic() + ttl, complete, articles)
+        self._hot_cache.move_to_end(ticker)
+        if len(self._hot_cache) > MAX_HOT_CACHE_SIZE:
+            self._hot_cache.popitem(last=False)
 
     async def get_market_news(
         self,
@@ -171,13 +298,12 @@ class NewsService:
         try:
             news_list = await self._finnhub.get_market_news(category)
 
-            articles = []
-            for news in news_list[:limit]:
-                # Pour les news générales, utiliser le premier ticker lié
-                ticker = news.related_tickers[0] if news.related_tickers else "MARKET"
-                articles.append(self._convert_to_article(news, ticker))
-
-            return articles
+            batch = list(islice(news_list, limit))
+            # Pour les news générales, utiliser le premier ticker lié
+            return self._convert_articles(
+                batch,
+                (news.related_tickers[0] if news.related_tickers else "MARKET" for news in batch),
+            )
 
         except Exception as e:
             logger.error(f"Error fetching market news: {e}")
@@ -239,6 +365,9 @@ class NewsService:
         """
         Récupère un résumé des news pour plusieurs tickers.
 
+        Les tickers sont récupérés en parallèle (concurrence bornée) ; un
+        ticker trop lent ou en erreur n'apparaît qu'avec une liste vide.
+
         Args:
             tickers: Liste de symboles
             limit_per_ticker: Nombre d'articles par ticker
@@ -246,13 +375,27 @@ class NewsService:
         Returns:
             Dictionnaire ticker -> articles
         """
-        result = {}
-
-        for ticker in tickers:
-            articles = await self.get_news_for_ticker(ticker, limit=limit_per_ticker)
-            result[ticker.upper()] = [a.to_dict() for a in articles]
-
-        return result
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_one(ticker: str) -> Tuple[str, List[Dict[str, Any]]]:
+            async with semaphore:
+                try:
+                    articles = await asyncio.wait_for(
+                        self.get_news_for_ticker(ticker, limit=limit_per_ticker),
+                        timeout=API_TIMEOUT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"Timeout fetching news for {ticker}")
+                    articles = []
+                except Exception as e:
+                    logger.warning(f"Error fetching news for {ticker}: {e}")
+                    articles = []
+            return ticker, [a.to_dict() for a in articles]
+
+        # Majuscules calculées une fois par ticker (clé et appel)
+        results = await asyncio.gather(*(fetch_one(ticker.upper()) for ticker in tickers))
+
+        return dict(results)
 
     async def cleanup_old_cache(self, max_age_hours: int = 72) -> int:
         """
@@ -264,6 +407,7 @@ class NewsService:
         Returns:
             Nombre d'articles supprimés
         """
+        self._hot_cache.clear()
         return await self._news_repo.cleanup_old(max_age_hours)
 
     async def search_news(
@@ -281,14 +425,25 @@ class NewsService:
         Returns:
             Articles correspondants
         """
-        # Pour l'instant, recherche simple dans le cache récent
-        recent = await self._news_repo.get_recent(limit=100, hours=48)
-
-        query_lower = query.lower()
-        matches = [
-            a for a in recent
-            if query_lower in a.headline.lower() or
-               (a.summary and query_lower in a.summary.lower())
-        ]
+        # Recherche plein texte dans le cache récent (index SQLite)
+        return await self._news_repo.search(query, limit=limit, hours=48)
 
-        return matches[:limit]
+
+# Singleton
+_news_service: Optional[NewsService] = None
+
+
+def get_news_service() -> NewsService:
+    """
+    Retourne l'instance singleton du service de news.
+
+    Partagée par les routes : cache mémoire, rafraîchissements en cours
+    et sauvegardes en arrière-plan sont communs à toutes les requêtes.
+
+    Returns:
+        NewsService initialisé
+    """
+    global _news_service
+    if _news_service is None:
+        _news_service = NewsService()
+    return _news_service
@@ -13,9 +13,12 @@ FLOW:
 
 import secrets
 import hashlib
+import heapq
+import hmac
+import threading
 import time
 import logging
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
@@ -31,13 +34,22 @@ class OTPAction(str, Enum):
     SWITCH_ENVIRONMENT = "switch_environment"
 
 
+# Libellés des actions dans le message Telegram
+_ACTION_LABELS: Dict[OTPAction, str] = {
+    OTPAction.UPDATE_SAXO: "🔐 Modification credentials Saxo Bank",
+    OTPAction.UPDATE_TELEGRAM: "📱 Modification configuration Telegram",
+    OTPAction.DELETE_CREDENTIALS: "🗑️ Suppression de credentials",
+    OTPAction.SWITCH_ENVIRONMENT: "🔄 Changement d'environnement Saxo",
+}
+
+
 @dataclass
 class OTPRequest:
     """Représente une demande OTP en attente."""
-    code_hash: str  # Hash SHA256 du code (jamais stocké en clair)
+    code_hash: str  # HMAC-SHA256 du code (jamais stocké en clair)
     action: OTPAction
-    created_at: float
-    expires_at: float
+    created_at: float  # Horloge monotone (time.monotonic)
+    expires_at: float  # Horloge monotone (time.monotonic)
     attempts: int = 0
     max_attempts: int = 3
     metadata: Optional[dict] = None
@@ -51,10 +63,12 @@ class OTPService:
     authentifier les opérations sensibles de configuration.
 
     Sécurité:
-    - Les codes sont hashés (jamais stockés en clair)
+    - Les codes sont hashés avec une clé propre au processus (jamais stockés en clair)
+    - Comparaison des hashes en temps constant
     - Expiration après 5 minutes
     - Maximum 3 tentatives par code
     - Rate limiting intégré
+    - Lecture-modification-écriture des OTPs sous verrou (thread-safe)
     """
 
     # Durée de validité d'un OTP (5 minutes)
@@ -67,7 +81,16 @@ class OTPService:
         """Initialise le service OTP."""
         # Stockage en mémoire des OTPs actifs (par action)
         self._active_otps: Dict[OTPAction, OTPRequest] = {}
-        self._last_request_time: float = 0
+        # Tas (expires_at, action) : le nettoyage ne dépile que les OTPs expirés.
+        # Les entrées d'OTPs remplacés ou consommés sont ignorées au dépilage.
+        self._expiry_heap: List[Tuple[float, OTPAction]] = []
+        # Horloge monotone : insensible aux ajustements de l'heure système (NTP)
+        self._last_request_time: float = float("-inf")
+        # Clé HMAC aléatoire : les OTPs ne vivent qu'en mémoire, dans ce processus
+        self._pepper = secrets.token_bytes(32)
+        # Sections critiques courtes et sans await : un verrou de thread suffit,
+        # que les méthodes soient appelées depuis la boucle ou le threadpool
+        self._lock = threading.Lock()
 
     def generate_code(self) -> str:
         """
@@ -81,7 +104,9 @@ class OTPService:
 
     def _hash_code(self, code: str) -> str:
         """
-        Hash le code OTP avec SHA256.
+        Hash le code OTP avec HMAC-SHA256.
+
+        La clé secrète empêche de précalculer les hashes des 10^6 codes possibles.
 
         Args:
             code: Code OTP en clair
@@ -89,7 +114,7 @@ class OTPService:
         Returns:
             Hash hexadécimal du code
         """
-        return hashlib.sha256(code.encode()).hexdigest()
+        return hmac.new(self._pepper, code.encode(), hashlib.sha256).hexdigest()
 
     def request_otp(
         self,
@@ -109,43 +134,41 @@ class OTPService:
         Raises:
             ValueError: Si rate limit atteint
         """
-        now = time.time()
-
-        # Rate limiting
-        if now - self._last_request_time < self.MIN_REQUEST_INTERVAL:
-            remaining = int(self.MIN_REQUEST_INTERVAL - (now - self._last_request_time))
-            raise ValueError(
-                f"Veuillez attendre {remaining} secondes avant de demander un nouveau code"
-            )
-
         # Générer le code
         code = self.generate_code()
         code_hash = self._hash_code(code)
 
-        # Créer la requête OTP
-        expires_at = now + self.OTP_VALIDITY_SECONDS
-        otp_request = OTPRequest(
-            code_hash=code_hash,
-            action=action,
-            created_at=now,
-            expires_at=expires_at,
-            metadata=metadata
-        )
+        with self._lock:
+            now = time.monotonic()
+
+            # Rate limiting
+            if now - self._last_request_time < self.MIN_REQUEST_INTERVAL:
+                remaining = int(self.MIN_REQUEST_INTERVAL - (now - self._last_request_time))
+                raise ValueError(
+                    f"Veuillez attendre {remaining} secondes avant de demander un nouveau code"
+                )
+
+            # Créer la requête OTP
+            expires_at = now + self.OTP_VALIDITY_SECONDS
+            otp_request = OTPRequest(
+                code_hash=code_hash,
+                action=action,
+                created_at=now,
+                expires_at=expires_at,
+                metadata=metadata
+            )
 
-        # Stocker (remplace l'ancien OTP pour cette action)
-        self._active_otps[action] = otp_request
-        self._last_request_time = now
+            # Stocker (remplace l'ancien OTP pour cette action)
+            self._active_otps[action] = otp_request
+            heapq.heappush(self._expiry_heap, (expires_at, action))
+            self._last_request_time = now
 
         # Construire le message Telegram
-        action_labels = {
-            OTPAction.UPDATE_SAXO: "🔐 Modification credentials Saxo Bank",
-            OTPAction.UPDATE_TELEGRAM: "📱 Modification configuration Telegram",
-            OTPAction.DELETE_CREDENTIALS: "🗑️ Suppression de credentials",
-            OTPAction.SWITCH_ENVIRONMENT: "🔄 Changement d'environnement Saxo",
-        }
-
-        action_label = action_labels.get(action, str(action))
-        expire_time = datetime.fromtimestamp(expires_at).strftime("%H:%M:%S")
+        action_label = _ACTION_LABELS.get(action, str(action))
+        # Heure murale uniquement pour l'affichage
+        expire_time = datetime.fromtimestamp(
+            time.time() + self.OTP_VALIDITY_SECONDS
+        ).strftime("%H:%M:%S")
 
         message = (
             f"🔒 <b>CODE DE VÉRIFICATION</b>\n\n"
@@ -171,35 +194,38 @@ class OTPService:
         Returns:
             Tuple (succès, message)
         """
-        # Vérifier si un OTP existe pour cette action
-        otp_request = self._active_otps.get(action)
+        code_hash = self._hash_code(code)
 
-        if not otp_request:
-            return False, "Aucun code en attente. Veuillez demander un nouveau code."
+        with self._lock:
+            # Vérifier si un OTP existe pour cette action
+            otp_request = self._active_otps.get(action)
 
-        # Vérifier l'expiration
-        if time.time() > otp_request.expires_at:
-            del self._active_otps[action]
-            return False, "Le code a expiré. Veuillez demander un nouveau code."
+            if not otp_request:
+                return False, "Aucun code en attente. Veuillez demander un nouveau code."
 
-        # Vérifier le nombre de tentatives
-        if otp_request.attempts >= otp_request.max_attempts:
-            del self._active_otps[action]
-            return False, "Trop de tentatives. Veuillez demander un nouveau code."
+            # Vérifier l'expiration
+            if time.monotonic() > otp_request.expires_at:
+                del self._active_otps[action]
+                return False, "Le code a expiré. Veuillez demander un nouveau code."
 
-        # Incrémenter le compteur de tentatives
-        otp_request.attempts += 1
+            # Vérifier le nombre de tentatives
+            if otp_request.attempts >= otp_request.max_attempts:
+                del self._active_otps[action]
+                return False, "Trop de tentatives. Veuillez demander un nouveau code."
 
-        # Vérifier le code (comparaison de hashes)
-        if self._hash_code(code) != otp_request.code_hash:
-            remaining = otp_request.max_attempts - otp_request.attempts
-            return False, f"Code incorrect. {remaining} tentative(s) restante(s)."
+            # Incrémenter le compteur de tentatives
+            otp_request.attempts += 1
 
-        # Succès - supprimer l'OTP utilisé
-        del self._active_otps[action]
-        logger.info(f"OTP vérifié avec succès pour action: {action}")
+            # Vérifier le code (comparaison de hashes en temps constant)
+            if not hmac.compare_digest(code_hash, otp_request.code_hash):
+                remaining = otp_request.max_attempts - otp_request.attempts
+                return False, f"Code incorrect. {remaining} tentative(s) restante(s)."
+
+            # Succès - supprimer l'OTP utilisé (une seule fois, même en concurrence)
+            del self._active_otps[action]
+            logger.info(f"OTP vérifié avec succès pour action: {action}")
 
-        return True, "Code vérifié avec succès!"
+            return True, "Code vérifié avec succès!"
 
     def get_otp_metadata(self, action: OTPAction) -> Optional[dict]:
         """
@@ -226,11 +252,12 @@ class OTPService:
         Returns:
             True si un OTP a été annulé
         """
-        if action in self._active_otps:
-            del self._active_otps[action]
+        with self._lock:
+            cancelled = self._active_otps.pop(action, None) is not None
+
+        if cancelled:
             logger.info(f"OTP annulé pour action: {action}")
-            return True
-        return False
+        return cancelled
 
     def cleanup_expired(self) -> int:
         """
@@ -239,19 +266,23 @@ class OTPService:
         Returns:
             Nombre d'OTPs supprimés
         """
-        now = time.time()
-        expired = [
-            action for action, otp in self._active_otps.items()
-            if now > otp.expires_at
-        ]
-
-        for action in expired:
-            del self._active_otps[action]
+        heap = self._expiry_heap
+        expired = 0
+
+        with self._lock:
+            now = time.monotonic()
+            while heap and heap[0][0] < now:
+                expires_at, action = heapq.heappop(heap)
+                otp = self._active_otps.get(action)
+                # Entrée obsolète si l'OTP a été remplacé, consommé ou annulé
+                if otp is not None and otp.expires_at == expires_at:
+                    del self._active_otps[action]
+                    expired += 1
 
         if expired:
-            logger.debug(f"Nettoyage de {len(expired)} OTPs expirés")
+            logger.debug(f"Nettoyage de {expired} OTPs expirés")
 
-        return len(expired)
+        return expired
 
 
 # Singleton
@@ -12,27 +12,97 @@ UTILISATION:
 
     service = PortfolioAnalysisService()
     enhanced_positions = await service.analyze_portfolio(positions, total_value)
+
+    # Ou position par position, des qu'elle est prete (SSE)
+    async for enhanced in service.iter_portfolio(positions, total_value):
+        ...
 """
 
 import asyncio
 import logging
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+from src.application.interfaces.stock_data_provider import HistoricalDataPoint
+from src.config.constants import MAX_CONCURRENT_REQUESTS
 from src.application.services.technical_calculator import TechnicalCalculator
-from src.application.services.news_service import NewsService
+from src.application.services.news_service import NewsService, get_news_service
 from src.application.services.market_structure_analyzer import MarketStructureAnalyzer
 from src.infrastructure.providers.yahoo_finance_provider import (
     YahooFinanceProvider,
     get_yahoo_provider,
 )
+from src.domain.entities.technical_analysis import TechnicalIndicators
+from src.infrastructure.database.repositories.price_history_repository import (
+    CachedHistory,
+    PriceHistoryRepository,
+    today_utc,
+)
 from src.domain.value_objects.ticker import Ticker
 
 logger = logging.getLogger(__name__)
 
+# Profondeur des historiques analyses (jours)
+HISTORY_DAYS = 365
+
+# Age max d'un historique du cache persistant (secondes): la derniere bougie
+# evolue pendant la seance, meme duree que le cache memoire du provider
+HISTORY_CACHE_TTL_SECONDS = 300
+
+# Stop loss / take profit suggeres (% depuis le prix d'entree, R/R 3:1)
+STOP_LOSS_PCT = 8.0
+TAKE_PROFIT_PCT = 24.0
+_STOP_LOSS_FACTOR = 1 - STOP_LOSS_PCT / 100
+_TAKE_PROFIT_FACTOR = 1 + TAKE_PROFIT_PCT / 100
+
+# Zones RSI: < 20 | < 30 | [30, 70] | > 70 | > 80
+_RSI_LOWER_BOUNDS = (20, 30)
+_RSI_UPPER_BOUNDS = (70, 80)
+_RSI_SIGNALS = ("oversold", "oversold", "neutral", "overbought", "overbought")
+_RSI_SCORES = (30, 15, 0, -15, -30)
+_RSI_REASONS = ("RSI tres survendu", "RSI survendu", "RSI neutre", "RSI surchauffe", "RSI tres surchauffe")
+
+# Tendance MACD par signe de l'histogramme (indice -1 = negatif)
+_MACD_TRENDS = ("neutral", "bullish", "bearish")
+
+
+def _rsi_zones(rsi: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Zone RSI (0 a 4) de chaque valeur, sans branche Python.
+
+    Bornes basses inclusives (20 et 30 sont dans la zone superieure),
+    bornes hautes exclusives (70 et 80 dans la zone inferieure);
+    une valeur NaN est neutre.
+    """
+    rsi = np.where(np.isnan(rsi), 50.0, rsi)
+    return np.digitize(rsi, _RSI_LOWER_BOUNDS) + np.digitize(rsi, _RSI_UPPER_BOUNDS, right=True)
+
+
+def _macd_signs(histogram: Union[float, np.ndarray]) -> np.ndarray:
+    """Signe de chaque histogramme MACD (NaN = 0)."""
+    return np.sign(np.nan_to_num(histogram)).astype(np.int64)
+
+
+@lru_cache(maxsize=2048)
+def _make_ticker(symbol: str) -> Ticker:
+    """
+    Ticker valide pour un symbole brut, avec memoisation.
+
+    Ticker est immuable: une meme instance peut etre partagee. Les symboles
+    invalides levent TickerInvalidError et ne sont pas mis en cache.
+    Seuls le prechargement et le chargement de l'historique en ont besoin:
+    les analyses technique et de recommandation travaillent sur le symbole
+    brut de la position.
+    """
+    return Ticker(symbol)
+
 
-@dataclass
+@dataclass(slots=True)
 class PositionTechnicalAnalysis:
     """Analyse technique pour une position."""
     symbol: str
@@ -50,10 +120,24 @@ class PositionTechnicalAnalysis:
     bollinger_position: str = ""  # "above_upper", "below_lower", "middle"
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "symbol": self.symbol,
+            "rsi": self.rsi,
+            "rsi_signal": self.rsi_signal,
+            "macd_line": self.macd_line,
+            "macd_signal": self.macd_signal,
+            "macd_histogram": self.macd_histogram,
+            "macd_trend": self.macd_trend,
+            "trend": self.trend,
+            "support_levels": list(self.support_levels),
+            "resistance_levels": list(self.resistance_levels),
+            "atr": self.atr,
+            "atr_percent": self.atr_percent,
+            "bollinger_position": self.bollinger_position,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionSentiment:
     """Sentiment et news pour une position."""
     symbol: str
@@ -63,10 +147,16 @@ class PositionSentiment:
     recent_headlines: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "symbol": self.symbol,
+            "sentiment_score": self.sentiment_score,
+            "sentiment_label": self.sentiment_label,
+            "news_count": self.news_count,
+            "recent_headlines": list(self.recent_headlines),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionRiskMetrics:
     """Metriques de risque pour une position."""
     symbol: str
@@ -82,10 +172,22 @@ class PositionRiskMetrics:
     max_loss_amount: float  # Perte si SL touche
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "symbol": self.symbol,
+            "portfolio_weight": self.portfolio_weight,
+            "concentration_risk": self.concentration_risk,
+            "entry_price": self.entry_price,
+            "current_price": self.current_price,
+            "suggested_stop_loss": self.suggested_stop_loss,
+            "suggested_take_profit": self.suggested_take_profit,
+            "stop_loss_distance_pct": self.stop_loss_distance_pct,
+            "take_profit_distance_pct": self.take_profit_distance_pct,
+            "risk_reward_ratio": self.risk_reward_ratio,
+            "max_loss_amount": self.max_loss_amount,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionRecommendation:
     """Recommandation MCP Trader Pro."""
     symbol: str
@@ -96,10 +198,17 @@ class PositionRecommendation:
     target_price: Optional[float] = None
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            "symbol": self.symbol,
+            "action": self.action,
+            "confidence": self.confidence,
+            "reasoning": list(self.reasoning),
+            "invalidation_level": self.invalidation_level,
+            "target_price": self.target_price,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedPosition:
     """Position enrichie avec toutes les analyses."""
     # Donnees de base
@@ -124,16 +233,39 @@ class EnhancedPosition:
     # Metadata
     analyzed_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
+    @classmethod
+    def from_position(cls, position: Dict[str, Any], **analyses: Any) -> "EnhancedPosition":
+        """
+        Construit la position enrichie depuis une position brute.
+
+        Les montants sont arrondis ici, une seule fois: to_dict et
+        to_json_bytes les serialisent tels quels.
+        """
+        return cls(
+            symbol=position.get("symbol", "UNKNOWN"),
+            description=position.get("description", ""),
+            quantity=position.get("quantity", 0),
+            current_price=round(position.get("current_price", 0), 2),
+            average_price=round(position.get("average_price", 0), 2),
+            market_value=round(position.get("market_value", 0), 2),
+            pnl=round(position.get("pnl", 0), 2),
+            pnl_percent=round(position.get("pnl_percent", 0), 2),
+            currency=position.get("currency", "EUR"),
+            asset_type=position.get("asset_type", "Stock"),
+            uic=position.get("uic"),
+            **analyses,
+        )
+
     def to_dict(self) -> Dict:
         return {
             "symbol": self.symbol,
             "description": self.description,
             "quantity": self.quantity,
-            "current_price": round(self.current_price, 2),
-            "average_price": round(self.average_price, 2),
-            "market_value": round(self.market_value, 2),
-            "pnl": round(self.pnl, 2),
-            "pnl_percent": round(self.pnl_percent, 2),
+            "current_price": self.current_price,
+            "average_price": self.average_price,
+            "market_value": self.market_value,
+            "pnl": self.pnl,
+            "pnl_percent": self.pnl_percent,
             "currency": self.currency,
             "asset_type": self.asset_type,
             "uic": self.uic,
@@ -144,6 +276,15 @@ class EnhancedPosition:
             "analyzed_at": self.analyzed_at,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialise directement en JSON (bytes) via orjson.
+
+        orjson encode les dataclasses a slots nativement, sans passer par
+        les dicts intermediaires de to_dict().
+        """
+        return orjson.dumps(self, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 class PortfolioAnalysisService:
     """
@@ -159,6 +300,7 @@ class PortfolioAnalysisService:
         technical_calculator: Optional[TechnicalCalculator] = None,
         news_service: Optional[NewsService] = None,
         structure_analyzer: Optional[MarketStructureAnalyzer] = None,
+        history_repo: Optional[PriceHistoryRepository] = None,
     ):
         """
         Initialise le service.
@@ -168,11 +310,20 @@ class PortfolioAnalysisService:
             technical_calculator: Calculateur d'indicateurs techniques.
             news_service: Service de news et sentiment.
             structure_analyzer: Analyseur de structure de marche.
+            history_repo: Cache persistant des historiques recents.
         """
         self._yahoo = yahoo_provider or get_yahoo_provider()
         self._tech_calc = technical_calculator or TechnicalCalculator()
-        self._news_service = news_service or NewsService()
+        # Service de news partage: cache memoire des articles et appel Finnhub
+        # unique par ticker communs a toutes les analyses (et aux routes news)
+        self._news_service = news_service or get_news_service()
         self._structure = structure_analyzer or MarketStructureAnalyzer()
+        self._history_repo = history_repo or PriceHistoryRepository()
+        # Appels externes bornes (rate limits Yahoo / Finnhub)
+        self._yahoo_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._news_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Ticker -> chargement d'historique en cours (partage entre positions)
+        self._loading: Dict[str, asyncio.Task] = {}
 
     async def analyze_portfolio(
         self,
@@ -187,35 +338,180 @@ class PortfolioAnalysisService:
             portfolio_total_value: Valeur totale du portefeuille
 
         Returns:
-            Liste des positions enrichies
+            Liste des positions enrichies, dans l'ordre des positions
         """
         if not positions:
             return []
 
+        tasks = await self._prepare_analyses(positions, portfolio_total_value)
+        return list(await asyncio.gather(*tasks))
+
+    async def iter_portfolio(
+        self,
+        positions: List[Dict[str, Any]],
+        portfolio_total_value: float,
+    ) -> AsyncIterator[EnhancedPosition]:
+        """
+        Analyse le portefeuille et produit chaque position des qu'elle est prete.
+
+        Meme analyse que analyze_portfolio, mais les positions sont livrees
+        dans l'ordre de fin (streaming SSE): la premiere arrive apres
+        l'analyse la plus rapide, pas apres la plus lente.
+
+        Args:
+            positions: Liste des positions brutes
+            portfolio_total_value: Valeur totale du portefeuille
+
+        Yields:
+            Positions enrichies, dans l'ordre de fin d'analyse
+        """
+        if not positions:
+            return
+
+        tasks = await self._prepare_analyses(positions, portfolio_total_value)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consommateur parti (client SSE deconnecte): analyses restantes annulees
+            for task in tasks:
+                task.cancel()
+
+    async def _prepare_analyses(
+        self,
+        positions: List[Dict[str, Any]],
+        portfolio_total_value: float,
+    ) -> List[asyncio.Task]:
+        """
+        Precharge les donnees communes et lance l'analyse de chaque position.
+
+        Returns:
+            Une tache par position (jamais en erreur: position minimale si echec)
+        """
+        # Historiques de tout le portefeuille en un seul appel Yahoo,
+        # puis indicateurs de toutes les positions en un seul calcul matriciel
+        histories = await self._prefetch_histories(positions)
+        try:
+            indicators_by_symbol = await self._tech_calc.calculate_batch(histories)
+        except Exception as e:
+            logger.warning(f"Calcul groupe des indicateurs impossible: {e}")
+            indicators_by_symbol = {}
+
         # Analyser toutes les positions en parallele
-        tasks = [
-            self.analyze_position(pos, portfolio_total_value)
+        return [
+            asyncio.create_task(
+                self._analyze_position_safely(
+                    pos,
+                    portfolio_total_value,
+                    historical=histories.get(pos.get("symbol", "UNKNOWN")),
+                    indicators=indicators_by_symbol.get(pos.get("symbol", "UNKNOWN")),
+                )
+            )
             for pos in positions
         ]
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def _analyze_position_safely(
+        self,
+        position: Dict[str, Any],
+        portfolio_total_value: float,
+        historical: Optional[List[HistoricalDataPoint]] = None,
+        indicators: Optional[TechnicalIndicators] = None,
+    ) -> EnhancedPosition:
+        """analyze_position avec repli sur une position minimale en cas d'erreur."""
+        try:
+            return await self.analyze_position(
+                position,
+                portfolio_total_value,
+                historical=historical,
+                indicators=indicators,
+            )
+        except Exception as e:
+            logger.error(f"Erreur analyse position {position.get('symbol')}: {e}")
+            # Creer une position minimale
+            return self._create_minimal_position(position)
 
-        # Filtrer les erreurs
-        enhanced_positions = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Erreur analyse position {positions[i].get('symbol')}: {result}")
-                # Creer une position minimale
-                enhanced_positions.append(self._create_minimal_position(positions[i]))
-            else:
-                enhanced_positions.append(result)
+    async def _prefetch_histories(
+        self,
+        positions: List[Dict[str, Any]],
+    ) -> Dict[str, List[HistoricalDataPoint]]:
+        """
+        Precharge les historiques (1 an) de toutes les positions en un lot.
 
-        return enhanced_positions
+        Les symboles invalides ou absents du lot sont ignores: leur position
+        retombe sur un appel Yahoo individuel dans analyze_position.
+
+        Returns:
+            Dict {symbole de la position: historique}
+        """
+        tickers: Dict[str, Ticker] = {}
+        for pos in positions:
+            symbol = pos.get("symbol", "UNKNOWN")
+            try:
+                tickers[symbol] = _make_ticker(symbol)
+            except Exception:
+                continue
+
+        if not tickers:
+            return {}
+
+        # Historiques recents deja en cache persistant, le reste en un lot Yahoo
+        bulk = await self._read_cached_histories(list(tickers.values()))
+        missing = [t for t in tickers.values() if t.value not in bulk]
+        if missing:
+            try:
+                fetched = await self._yahoo.get_historical_data_bulk(
+                    missing, days=HISTORY_DAYS
+                )
+            except Exception as e:
+                logger.warning(f"Prechargement des historiques impossible: {e}")
+                fetched = {}
+            await self._store_histories(fetched)
+            bulk.update(fetched)
+
+        return {
+            symbol: bulk[ticker.value]
+            for symbol, ticker in tickers.items()
+            if ticker.value in bulk
+        }
+
+    async def _read_cached_histories(
+        self,
+        tickers: List[Ticker],
+    ) -> Dict[str, List[HistoricalDataPoint]]:
+        """Historiques recents en cache persistant (vide si la base est indisponible)."""
+        try:
+            return await self._history_repo.get_many(
+                [t.value for t in tickers],
+                HISTORY_DAYS,
+                today_utc(),
+                max_age_seconds=HISTORY_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.debug(f"Cache des historiques indisponible: {e}")
+            return {}
+
+    async def _store_histories(
+        self,
+        histories: Dict[str, List[HistoricalDataPoint]],
+    ) -> None:
+        """Enregistre des historiques dans le cache persistant (erreurs ignorees)."""
+        if not histories:
+            return
+        day = today_utc()
+        try:
+            await self._history_repo.save_many([
+                CachedHistory(ticker=ticker, days=HISTORY_DAYS, trading_day=day, points=points)
+                for ticker, points in histories.items()
+            ])
+        except Exception as e:
+            logger.debug(f"Sauvegarde des historiques impossible: {e}")
 
     async def analyze_position(
         self,
         position: Dict[str, Any],
         portfolio_total_value: float,
+        historical: Optional[List[HistoricalDataPoint]] = None,
+        indicators: Optional[TechnicalIndicators] = None,
     ) -> EnhancedPosition:
         """
         Analyse complete d'une seule position.
@@ -223,91 +519,135 @@ class PortfolioAnalysisService:
         Args:
             position: Donnees de la position
             portfolio_total_value: Valeur totale du portefeuille
+            historical: Historique deja charge (sinon recupere sur Yahoo)
+            indicators: Indicateurs deja calcules sur cet historique
 
         Returns:
             Position enrichie avec toutes les analyses
         """
         symbol = position.get("symbol", "UNKNOWN")
 
-        # Lancer les analyses en parallele
-        tech_task = self._analyze_technical(symbol)
-        sentiment_task = self._analyze_sentiment(symbol)
-        risk_task = self._analyze_risk(position, portfolio_total_value)
-        recommendation_task = self._get_recommendation(symbol, position)
-
+        # Historique et indicateurs charges une seule fois, en parallele
+        # des analyses independantes (news, risque)
         results = await asyncio.gather(
-            tech_task,
-            sentiment_task,
-            risk_task,
-            recommendation_task,
+            self._load_market_data(symbol, historical, indicators),
+            self._analyze_sentiment(symbol),
+            self._analyze_risk(position, portfolio_total_value),
             return_exceptions=True,
         )
 
-        technical = results[0] if not isinstance(results[0], Exception) else None
+        market_data = results[0]
         sentiment = results[1] if not isinstance(results[1], Exception) else None
         risk = results[2] if not isinstance(results[2], Exception) else None
-        recommendation = results[3] if not isinstance(results[3], Exception) else None
 
-        if isinstance(results[0], Exception):
-            logger.warning(f"Erreur technique {symbol}: {results[0]}")
         if isinstance(results[1], Exception):
             logger.warning(f"Erreur sentiment {symbol}: {results[1]}")
         if isinstance(results[2], Exception):
             logger.warning(f"Erreur risque {symbol}: {results[2]}")
-        if isinstance(results[3], Exception):
-            logger.warning(f"Erreur recommandation {symbol}: {results[3]}")
 
-        return EnhancedPosition(
-            symbol=symbol,
-            description=position.get("description", ""),
-            quantity=position.get("quantity", 0),
-            current_price=position.get("current_price", 0),
-            average_price=position.get("average_price", 0),
-            market_value=position.get("market_value", 0),
-            pnl=position.get("pnl", 0),
-            pnl_percent=position.get("pnl_percent", 0),
-            currency=position.get("currency", "EUR"),
-            asset_type=position.get("asset_type", "Stock"),
-            uic=position.get("uic"),
+        # Analyse technique et recommandation sur les memes donnees
+        technical = None
+        if isinstance(market_data, Exception):
+            logger.warning(f"Erreur donnees de marche {symbol}: {market_data}")
+            recommendation = PositionRecommendation(
+                symbol=symbol,
+                action="HOLD",
+                confidence=0,
+                reasoning=[f"Erreur d'analyse: {str(market_data)}"],
+            )
+        else:
+            historical, indicators = market_data
+            try:
+                technical = await self._analyze_technical(symbol, historical, indicators)
+            except Exception as e:
+                logger.warning(f"Erreur technique {symbol}: {e}")
+            recommendation = self._get_recommendation(symbol, position, historical, indicators)
+
+        return EnhancedPosition.from_position(
+            position,
             technical=technical,
             sentiment=sentiment,
             risk=risk,
             recommendation=recommendation,
         )
 
-    async def _analyze_technical(self, symbol: str) -> PositionTechnicalAnalysis:
-        """Analyse technique d'une position."""
-        ticker = Ticker(symbol)
+    async def _load_market_data(
+        self,
+        symbol: str,
+        historical: Optional[List[HistoricalDataPoint]] = None,
+        indicators: Optional[TechnicalIndicators] = None,
+    ) -> Tuple[List[HistoricalDataPoint], Optional[TechnicalIndicators]]:
+        """
+        Recupere l'historique (1 an) et calcule les indicateurs d'une position.
+
+        Partage entre l'analyse technique et la recommandation: un seul appel
+        Yahoo et un seul calcul d'indicateurs par position.
 
-        # Recuperer les donnees historiques (1 an)
-        historical = await self._yahoo.get_historical_data(ticker, days=365)
+        Args:
+            symbol: Symbole de la position
+            historical: Historique deja precharge (evite l'appel Yahoo)
+            indicators: Indicateurs du calcul groupe (evite le recalcul)
+
+        Returns:
+            Tuple (historique, indicateurs ou None si donnees insuffisantes)
+        """
+        if historical is None:
+            historical = await self._get_history(_make_ticker(symbol))
 
         if len(historical) < 50:
-            raise ValueError(f"Donnees insuffisantes pour {symbol}: {len(historical)} points")
+            return historical, None
 
-        # Calculer les indicateurs
-        indicators = await self._tech_calc.calculate_all(symbol, historical)
+        if indicators is None:
+            indicators = await self._tech_calc.calculate_all(symbol, historical)
+        return historical, indicators
+
+    async def _get_history(self, ticker: Ticker) -> List[HistoricalDataPoint]:
+        """
+        Historique d'un ticker (cache persistant, sinon Yahoo).
+
+        Un seul chargement par ticker a la fois: les positions concurrentes
+        sur le meme ticker attendent celui deja en cours (shield: l'annulation
+        d'un appelant n'interrompt pas celui des autres).
+        """
+        key = ticker.value
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = asyncio.create_task(self._load_history(ticker))
+            self._loading[key] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(key, None))
+
+        return await asyncio.shield(loading)
+
+    async def _load_history(self, ticker: Ticker) -> List[HistoricalDataPoint]:
+        """Chargement effectif d'un historique, appel Yahoo sous semaphore."""
+        cached = await self._read_cached_histories([ticker])
+        historical = cached.get(ticker.value)
+        if historical is None:
+            async with self._yahoo_semaphore:
+                historical = await self._yahoo.get_historical_data(ticker, days=HISTORY_DAYS)
+            await self._store_histories({ticker.value: historical})
+        return historical
+
+    async def _analyze_technical(
+        self,
+        symbol: str,
+        historical: List[HistoricalDataPoint],
+        indicators: Optional[TechnicalIndicators],
+    ) -> PositionTechnicalAnalysis:
+        """Analyse technique d'une position (donnees deja chargees)."""
+        if len(historical) < 50:
+            raise ValueError(f"Donnees insuffisantes pour {symbol}: {len(historical)} points")
 
         if not indicators:
             raise ValueError(f"Impossible de calculer les indicateurs pour {symbol}")
 
         # Determiner les signaux
         rsi = indicators.rsi.value
-        if rsi > 70:
-            rsi_signal = "overbought"
-        elif rsi < 30:
-            rsi_signal = "oversold"
-        else:
-            rsi_signal = "neutral"
+        rsi_signal = _RSI_SIGNALS[_rsi_zones(rsi)]
 
         # MACD trend
         macd_hist = indicators.macd.histogram
-        if macd_hist > 0:
-            macd_trend = "bullish"
-        elif macd_hist < 0:
-            macd_trend = "bearish"
-        else:
-            macd_trend = "neutral"
+        macd_trend = _MACD_TRENDS[_macd_signs(macd_hist)]
 
         # Trend general
         ma = indicators.moving_averages
@@ -331,10 +671,9 @@ class PortfolioAnalysisService:
         support_levels = []
         resistance_levels = []
         try:
-            structure = await self._structure.analyze(symbol, historical)
-            if structure:
-                support_levels = [z.lower for z in (structure.demand_zones or [])][:3]
-                resistance_levels = [z.upper for z in (structure.supply_zones or [])][:3]
+            support_levels, resistance_levels = await self._structure.find_key_levels(
+                symbol, historical, max_levels=3
+            )
         except Exception as e:
             logger.debug(f"Structure non disponible pour {symbol}: {e}")
 
@@ -357,7 +696,8 @@ class PortfolioAnalysisService:
     async def _analyze_sentiment(self, symbol: str) -> PositionSentiment:
         """Analyse sentiment via news Finnhub."""
         try:
-            news_articles = await self._news_service.get_news_for_ticker(symbol, limit=10)
+            async with self._news_semaphore:
+                news_articles = await self._news_service.get_news_for_ticker(symbol, limit=10)
 
             if not news_articles:
                 return PositionSentiment(
@@ -368,9 +708,12 @@ class PortfolioAnalysisService:
                     recent_headlines=[],
                 )
 
-            # Calculer le sentiment moyen
-            scores = [a.sentiment_score for a in news_articles if hasattr(a, 'sentiment_score')]
-            avg_score = sum(scores) / len(scores) if scores else 0.0
+            # Calculer le sentiment moyen (articles sans score ignores)
+            scores = np.fromiter(
+                (score for a in news_articles if (score := a.sentiment_score) is not None),
+                dtype=np.float64,
+            )
+            avg_score = float(scores.mean()) if scores.size else 0.0
 
             if avg_score > 0.2:
                 label = "bullish"
@@ -379,7 +722,7 @@ class PortfolioAnalysisService:
             else:
                 label = "neutral"
 
-            headlines = [a.headline for a in news_articles[:5] if hasattr(a, 'headline')]
+            headlines = [a.headline for a in news_articles[:5]]
 
             return PositionSentiment(
                 symbol=symbol,
@@ -422,21 +765,19 @@ class PortfolioAnalysisService:
         else:
             concentration = "low"
 
-        # Stop loss suggere (8% sous le prix d'entree)
-        suggested_sl = entry_price * 0.92 if entry_price > 0 else current_price * 0.92
-        sl_distance_pct = 8.0
+        # Prix de reference: prix d'entree, sinon prix courant
+        ref = entry_price if entry_price > 0 else current_price
 
-        # Take profit suggere (24% au-dessus = 3:1 R/R)
-        suggested_tp = entry_price * 1.24 if entry_price > 0 else current_price * 1.24
-        tp_distance_pct = 24.0
+        # SL / TP suggeres depuis la reference
+        suggested_sl = ref * _STOP_LOSS_FACTOR
+        suggested_tp = ref * _TAKE_PROFIT_FACTOR
 
-        # Ratio risque/reward
-        risk = abs(entry_price - suggested_sl) if entry_price > 0 else abs(current_price - suggested_sl)
-        reward = abs(suggested_tp - entry_price) if entry_price > 0 else abs(suggested_tp - current_price)
-        rr_ratio = reward / risk if risk > 0 else 0
+        # Ratio risque/reward (risk > 0 des que ref > 0)
+        risk = ref - suggested_sl
+        rr_ratio = (suggested_tp - ref) / risk if risk > 0 else 0
 
-        # Perte maximale si SL touche
-        max_loss = abs(quantity) * (entry_price - suggested_sl) if quantity != 0 and entry_price > 0 else 0
+        # Perte maximale si SL touche (seulement avec un prix d'entree connu)
+        max_loss = abs(quantity) * risk if entry_price > 0 else 0
 
         return PositionRiskMetrics(
             symbol=symbol,
@@ -446,24 +787,21 @@ class PortfolioAnalysisService:
             current_price=round(current_price, 2),
             suggested_stop_loss=round(suggested_sl, 2),
             suggested_take_profit=round(suggested_tp, 2),
-            stop_loss_distance_pct=round(sl_distance_pct, 2),
-            take_profit_distance_pct=round(tp_distance_pct, 2),
+            stop_loss_distance_pct=STOP_LOSS_PCT,
+            take_profit_distance_pct=TAKE_PROFIT_PCT,
             risk_reward_ratio=round(rr_ratio, 2),
-            max_loss_amount=round(abs(max_loss), 2),
+            max_loss_amount=round(max_loss, 2),
         )
 
-    async def _get_recommendation(
+    def _get_recommendation(
         self,
         symbol: str,
         position: Dict[str, Any],
+        historical: List[HistoricalDataPoint],
+        indicators: Optional[TechnicalIndicators],
     ) -> PositionRecommendation:
-        """Genere une recommandation basee sur les analyses."""
-        ticker = Ticker(symbol)
-
+        """Genere une recommandation basee sur les analyses (donnees deja chargees)."""
         try:
-            # Recuperer les donnees
-            historical = await self._yahoo.get_historical_data(ticker, days=365)
-
             if len(historical) < 50:
                 return PositionRecommendation(
                     symbol=symbol,
@@ -472,9 +810,6 @@ class PortfolioAnalysisService:
                     reasoning=["Donnees insuffisantes pour analyse"],
                 )
 
-            # Calculer les indicateurs
-            indicators = await self._tech_calc.calculate_all(symbol, historical)
-
             if not indicators:
                 return PositionRecommendation(
                     symbol=symbol,
@@ -489,20 +824,9 @@ class PortfolioAnalysisService:
 
             # RSI
             rsi = indicators.rsi.value
-            if rsi > 80:
-                score -= 30
-                reasoning.append(f"RSI tres surchauffe ({rsi:.0f})")
-            elif rsi > 70:
-                score -= 15
-                reasoning.append(f"RSI surchauffe ({rsi:.0f})")
-            elif rsi < 20:
-                score += 30
-                reasoning.append(f"RSI tres survendu ({rsi:.0f})")
-            elif rsi < 30:
-                score += 15
-                reasoning.append(f"RSI survendu ({rsi:.0f})")
-            else:
-                reasoning.append(f"RSI neutre ({rsi:.0f})")
+            zone = int(_rsi_zones(rsi))
+            score += _RSI_SCORES[zone]
+            reasoning.append(f"{_RSI_REASONS[zone]} ({rsi:.0f})")
 
             # MACD
             macd = indicators.macd
@@ -581,19 +905,7 @@ class PortfolioAnalysisService:
 
     def _create_minimal_position(self, position: Dict[str, Any]) -> EnhancedPosition:
         """Cree une position minimale en cas d'erreur."""
-        return EnhancedPosition(
-            symbol=position.get("symbol", "UNKNOWN"),
-            description=position.get("description", ""),
-            quantity=position.get("quantity", 0),
-            current_price=position.get("current_price", 0),
-            average_price=position.get("average_price", 0),
-            market_value=position.get("market_value", 0),
-            pnl=position.get("pnl", 0),
-            pnl_percent=position.get("pnl_percent", 0),
-            currency=position.get("currency", "EUR"),
-            asset_type=position.get("asset_type", "Stock"),
-            uic=position.get("uic"),
-        )
+        return EnhancedPosition.from_position(position)
 
 
 # =============================================================================
@@ -15,16 +15,28 @@ INDICATEURS CALCULÉS:
 UTILISATION:
     calculator = TechnicalCalculator()
     indicators = await calculator.calculate_all(ticker, historical_data)
+    by_ticker = await calculator.calculate_batch({"AAPL": data_aapl, "MSFT": data_msft})
+
+EXÉCUTION:
+    Les calculs tournent hors de la boucle d'événements: dans un thread par
+    défaut, ou dans un pool de processus partagé si INDICATOR_WORKERS > 0
+    (les séries sont alors transmises en tableaux NumPy, sans DataFrame).
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
 
-from src.application.interfaces.stock_data_provider import HistoricalDataPoint
+from src.application.interfaces.stock_data_provider import (
+    HistoricalDataPoint,
+    HistoricalSeries,
+)
 from src.domain.entities.technical_analysis import (
     RSIIndicator,
     MACDIndicator,
@@ -33,9 +45,37 @@ from src.domain.entities.technical_analysis import (
     VolumeAnalysis,
     TechnicalIndicators,
 )
+from src.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Pool de processus partagé (créé à la demande si INDICATOR_WORKERS > 0)
+_indicator_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_indicator_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Retourne le pool de processus des indicateurs.
+
+    Returns:
+        ProcessPoolExecutor partagé, ou None si INDICATOR_WORKERS vaut 0
+    """
+    global _indicator_pool
+    if _indicator_pool is None:
+        workers = get_settings().INDICATOR_WORKERS
+        if workers > 0:
+            _indicator_pool = ProcessPoolExecutor(max_workers=workers)
+            logger.info(f"Pool de calcul des indicateurs: {workers} processus")
+    return _indicator_pool
+
+
+def shutdown_indicator_pool() -> None:
+    """Arrête le pool de processus des indicateurs s'il existe."""
+    global _indicator_pool
+    if _indicator_pool is not None:
+        _indicator_pool.shutdown(cancel_futures=True)
+        _indicator_pool = None
+
 
 class TechnicalCalculator:
     """
@@ -45,9 +85,32 @@ class TechnicalCalculator:
     utilisés par les traders professionnels.
     """
 
-    def __init__(self):
-        """Initialise le calculateur."""
-        pass
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+    ):
+        """
+        Initialise le calculateur.
+
+        Args:
+            executor: Pool de processus pour les calculs (défaut: pool partagé
+                si INDICATOR_WORKERS > 0, sinon un thread)
+            workers: Nombre de workers de executor, un lot par worker
+                (défaut: nombre de coeurs; INDICATOR_WORKERS pour le pool partagé)
+        """
+        self._executor = executor
+        self._workers = workers
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Pool de processus à utiliser, None pour un thread."""
+        return self._executor or get_indicator_pool()
+
+    def _get_workers(self) -> int:
+        """Nombre de workers du pool utilisé (nombre de lots d'un calcul groupé)."""
+        if self._executor is None:
+            return get_settings().INDICATOR_WORKERS
+        return self._workers or os.cpu_count() or 1
 
     async def calculate_all(
         self,
@@ -68,15 +131,38 @@ class TechnicalCalculator:
             logger.warning(f"Données insuffisantes pour {ticker}: {len(data)} points")
             return None
 
+        # Calculs pandas/numpy synchrones: exécutés hors de la boucle d'événements
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(self._calculate_all_sync, ticker, data)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, _calculate_all_worker, ticker, HistoricalSeries.from_points(data)
+        )
+
+    def _calculate_all_sync(
+        self,
+        ticker: str,
+        data: Union[List[HistoricalDataPoint], HistoricalSeries],
+    ) -> Optional[TechnicalIndicators]:
+        """Calcul synchrone de tous les indicateurs (CPU-bound)."""
         try:
             # Convertir en DataFrame pandas
             df = self._to_dataframe(data)
 
+            # EMA 12/26 calculées une seule fois (MACD et moyennes mobiles)
+            close = df['close']
+            ema_12 = close.ewm(span=12, adjust=False).mean()
+            ema_26 = close.ewm(span=26, adjust=False).mean()
+
             # Calculer chaque indicateur
             rsi = self._calculate_rsi(df)
-            macd = self._calculate_macd(df)
+            macd = self._calculate_macd(df, ema_fast=ema_12, ema_slow=ema_26)
             bollinger = self._calculate_bollinger(df)
-            moving_averages = self._calculate_moving_averages(df)
+            moving_averages = self._calculate_moving_averages(
+                df, ema_12=float(ema_12.iloc[-1]), ema_26=float(ema_26.iloc[-1])
+            )
             volume = self._calculate_volume(df)
             atr, atr_percent = self._calculate_atr(df)
 
@@ -96,20 +182,228 @@ class TechnicalCalculator:
             logger.error(f"Erreur calcul indicateurs pour {ticker}: {e}")
             return None
 
-    def _to_dataframe(self, data: List[HistoricalDataPoint]) -> pd.DataFrame:
-        """Convertit les données historiques en DataFrame pandas."""
-        df = pd.DataFrame([
+    async def calculate_batch(
+        self,
+        data: Dict[str, List[HistoricalDataPoint]],
+    ) -> Dict[str, TechnicalIndicators]:
+        """
+        Calcule les indicateurs de plusieurs actifs en un seul passage.
+
+        Les séries de tous les actifs sont empilées dans des matrices (T, N)
+        alignées sur la dernière barre : chaque indicateur est calculé pour
+        toutes les colonnes à la fois, au lieu de N appels à calculate_all.
+
+        Args:
+            data: Données historiques par symbole
+
+        Returns:
+            Dict {symbole: TechnicalIndicators}, sans les actifs aux données
+            insuffisantes (< 50 points) ou dont le calcul a échoué
+        """
+        eligible = {ticker: points for ticker, points in data.items() if len(points) >= 50}
+        if not eligible:
+            return {}
+
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(self._calculate_batch_sync, eligible)
+
+        # Un lot matriciel par processus, séries transmises en tableaux NumPy
+        series = {ticker: HistoricalSeries.from_points(points) for ticker, points in eligible.items()}
+        tickers = list(series)
+        chunk_size = -(-len(tickers) // self._get_workers())
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor,
+                _calculate_batch_worker,
+                {ticker: series[ticker] for ticker in tickers[i:i + chunk_size]},
+            )
+            for i in range(0, len(tickers), chunk_size)
+        ))
+
+        results = {}
+        for chunk in chunks:
+            results.update(chunk)
+        return results
+
+    def _calculate_batch_sync(
+        self,
+        data: Dict[str, Union[List[HistoricalDataPoint], HistoricalSeries]],
+    ) -> Dict[str, TechnicalIndicators]:
+        """Calcul matriciel synchrone (CPU-bound), repli actif par actif en cas d'erreur."""
+        try:
+            frames = [self._to_dataframe(points) for points in data.values()]
+            return self._calculate_matrix(
+                list(data),
+                close=self._stack_column(frames, 'close'),
+                high=self._stack_column(frames, 'high'),
+                low=self._stack_column(frames, 'low'),
+                volume=self._stack_column(frames, 'volume'),
+            )
+        except Exception as e:
+            logger.error(f"Erreur calcul groupé des indicateurs: {e}")
+
+        results = {}
+        for ticker, points in data.items():
+            indicators = self._calculate_all_sync(ticker, points)
+            if indicators is not None:
+                results[ticker] = indicators
+        return results
+
+    @staticmethod
+    def _stack_column(frames: List[pd.DataFrame], column: str) -> np.ndarray:
+        """Empile une colonne de chaque DataFrame en matrice (T, N), NaN en tête."""
+        length = max(len(frame) for frame in frames)
+        matrix = np.full((length, len(frames)), np.nan)
+        for j, frame in enumerate(frames):
+            values = frame[column].to_numpy(dtype=np.float64)
+            matrix[length - len(values):, j] = values
+        return matrix
+
+    @staticmethod
+    def _ewm(matrix: np.ndarray, span: int) -> np.ndarray:
+        """EMA colonne par colonne (les NaN de tête sont ignorés)."""
+        return pd.DataFrame(matrix).ewm(span=span, adjust=False).mean().to_numpy()
+
+    def _calculate_matrix(
+        self,
+        tickers: List[str],
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        volume: np.ndarray,
+    ) -> Dict[str, TechnicalIndicators]:
+        """
+        Indicateurs de N actifs à partir de matrices (T, N) alignées à droite.
+
+        Mêmes formules que les méthodes _calculate_* appliquées série par série.
+        """
+        count = len(tickers)
+        padding = np.isnan(close)
+        prev_close = np.vstack((np.full((1, count), np.nan), close[:-1]))
+        delta = close - prev_close
+
+        # RSI : gains et pertes lissés en un seul ewm (2N colonnes)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        gain[padding] = np.nan
+        loss[padding] = np.nan
+        avg = self._ewm(np.hstack((gain, loss)), 14)[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + avg[:count] / avg[count:]))
+        rsi = np.where(np.isnan(rsi), 50.0, rsi)
+
+        # MACD et EMA 12/26
+        ema_12 = self._ewm(close, 12)
+        ema_26 = self._ewm(close, 26)
+        macd_line = ema_12 - ema_26
+        signal_line = self._ewm(macd_line, 9)[-1]
+        macd_last = macd_line[-1]
+
+        # Bollinger (20, 2) et moyennes mobiles sur les dernières fenêtres
+        window = close[-20:]
+        middle = window.mean(axis=0)
+        std = window.std(axis=0, ddof=1)
+        sma_50 = close[-50:].mean(axis=0)
+        sma_200 = np.nanmean(close[-200:], axis=0)
+        current = close[-1]
+
+        # Volume et OBV (volume signé nul sur la 1re barre et le remplissage)
+        avg_volume_20 = volume[-20:].mean(axis=0)
+        avg_volume_50 = volume[-50:].mean(axis=0)
+        signed_volume = np.nan_to_num(np.sign(delta) * volume, nan=0.0)
+        obv = np.cumsum(signed_volume, axis=0)
+        obv_sma = obv[-20:].mean(axis=0)
+
+        # ATR (fmax ignore le NaN de la 1re barre, le remplissage reste NaN)
+        true_range = np.fmax(
+            high - low,
+            np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)),
+        )
+        atr = self._ewm(true_range, 14)[-1]
+
+        calculated_at = datetime.now()
+        results = {}
+        for j, ticker in enumerate(tickers):
+            price = float(current[j])
+            upper_band = float(middle[j]) + 2.0 * float(std[j])
+            lower_band = float(middle[j]) - 2.0 * float(std[j])
+            band_width = upper_band - lower_band
+
+            current_volume = int(volume[-1, j])
+            prev_volume = volume[-2, j]
+            volume_change = (
+                (current_volume - prev_volume) / prev_volume * 100 if prev_volume > 0 else 0
+            )
+            if obv[-1, j] > obv_sma[j]:
+                obv_trend = "rising"
+            elif obv[-1, j] < obv_sma[j]:
+                obv_trend = "falling"
+            else:
+                obv_trend = "flat"
+
+            current_atr = float(atr[j])
+
+            results[ticker] = TechnicalIndicators(
+                ticker=ticker,
+                rsi=RSIIndicator(value=float(rsi[j]), period=14),
+                macd=MACDIndicator(
+                    macd_line=float(macd_last[j]),
+                    signal_line=float(signal_line[j]),
+                    histogram=float(macd_last[j] - signal_line[j]),
+                    fast_period=12,
+                    slow_period=26,
+                    signal_period=9,
+                ),
+                bollinger=BollingerBands(
+                    upper_band=upper_band,
+                    middle_band=float(middle[j]),
+                    lower_band=lower_band,
+                    current_price=price,
+                    bandwidth=band_width / middle[j] if middle[j] != 0 else 0,
+                    percent_b=(price - lower_band) / band_width if band_width != 0 else 0.5,
+                    period=20,
+                    std_dev=2.0,
+                ),
+                moving_averages=MovingAverages(
+                    sma_20=float(middle[j]),
+                    sma_50=float(sma_50[j]),
+                    sma_200=float(sma_200[j]),
+                    ema_12=float(ema_12[-1, j]),
+                    ema_26=float(ema_26[-1, j]),
+                    current_price=price,
+                ),
+                volume=VolumeAnalysis(
+                    current_volume=current_volume,
+                    avg_volume_20=float(avg_volume_20[j]),
+                    avg_volume_50=float(avg_volume_50[j]),
+                    volume_change_percent=float(volume_change),
+                    on_balance_volume_trend=obv_trend,
+                ),
+                atr=current_atr,
+                atr_percent=(current_atr / price * 100) if price > 0 else 0,
+                calculated_at=calculated_at,
+            )
+
+        return results
+
+    def _to_dataframe(
+        self,
+        data: Union[List[HistoricalDataPoint], HistoricalSeries],
+    ) -> pd.DataFrame:
+        """Convertit les données historiques en DataFrame pandas (colonnes SoA)."""
+        series = data if isinstance(data, HistoricalSeries) else HistoricalSeries.from_points(data)
+        df = pd.DataFrame(
             {
-                'date': point.date,
-                'open': point.open,
-                'high': point.high,
-                'low': point.low,
-                'close': point.close,
-                'volume': point.volume,
-            }
-            for point in data
-        ])
-        df.set_index('date', inplace=True)
+                'open': series.open,
+                'high': series.high,
+                'low': series.low,
+                'close': series.close,
+                'volume': series.volume,
+            },
+            index=pd.Index(series.dates, name='date'),
+        )
         df.sort_index(inplace=True)
         return df
 
@@ -120,19 +414,22 @@ class TechnicalCalculator:
         RSI = 100 - (100 / (1 + RS))
         RS = Average Gain / Average Loss
         """
-        delta = df['close'].diff()
+        delta = np.diff(df['close'].to_numpy(dtype=np.float64), prepend=np.nan)
 
-        gain = delta.where(delta > 0, 0)
-        loss = (-delta).where(delta < 0, 0)
+        # Gains et pertes en deux colonnes: un seul passage ewm pour les deux
+        moves = pd.DataFrame({
+            'gain': np.where(delta > 0, delta, 0.0),
+            'loss': np.where(delta < 0, -delta, 0.0),
+        })
 
         # Utilise EMA pour plus de réactivité (méthode Wilder)
-        avg_gain = gain.ewm(span=period, adjust=False).mean()
-        avg_loss = loss.ewm(span=period, adjust=False).mean()
+        avg = moves.ewm(span=period, adjust=False).mean().to_numpy()[-1]
+        avg_gain, avg_loss = avg[0], avg[1]
 
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+            current_rsi = 100 - (100 / (1 + rs))
 
-        current_rsi = rsi.iloc[-1]
         if pd.isna(current_rsi):
             current_rsi = 50.0  # Valeur neutre par défaut
 
@@ -144,6 +441,8 @@ class TechnicalCalculator:
         fast: int = 12,
         slow: int = 26,
         signal: int = 9,
+        ema_fast: Optional[pd.Series] = None,
+        ema_slow: Optional[pd.Series] = None,
     ) -> MACDIndicator:
         """
         Calcule le MACD (Moving Average Convergence Divergence).
@@ -151,9 +450,13 @@ class TechnicalCalculator:
         MACD Line = EMA(fast) - EMA(slow)
         Signal Line = EMA(MACD Line, signal)
         Histogram = MACD Line - Signal Line
+
+        Les EMA déjà calculées par l'appelant peuvent être fournies.
         """
-        ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
+        if ema_fast is None:
+            ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
+        if ema_slow is None:
+            ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
 
         macd_line = ema_fast - ema_slow
         signal_line = macd_line.ewm(span=signal, adjust=False).mean()
@@ -181,16 +484,14 @@ class TechnicalCalculator:
         Upper Band = Middle + (std_dev * StdDev)
         Lower Band = Middle - (std_dev * StdDev)
         """
-        middle = df['close'].rolling(window=period).mean()
-        std = df['close'].rolling(window=period).std()
-
-        upper = middle + (std_dev * std)
-        lower = middle - (std_dev * std)
+        # Seule la derniere fenetre est utilisee: pas de rolling complet
+        window = df['close'].to_numpy(dtype=np.float64)[-period:]
+        middle_band = float(window.mean())
+        std = float(window.std(ddof=1))
 
-        current_price = float(df['close'].iloc[-1])
-        upper_band = float(upper.iloc[-1])
-        middle_band = float(middle.iloc[-1])
-        lower_band = float(lower.iloc[-1])
+        current_price = float(window[-1])
+        upper_band = middle_band + (std_dev * std)
+        lower_band = middle_band - (std_dev * std)
 
         # Bandwidth = (Upper - Lower) / Middle
         bandwidth = (upper_band - lower_band) / middle_band if middle_band != 0 else 0
@@ -210,21 +511,30 @@ class TechnicalCalculator:
             std_dev=std_dev,
         )
 
-    def _calculate_moving_averages(self, df: pd.DataFrame) -> MovingAverages:
+    def _calculate_moving_averages(
+        self,
+        df: pd.DataFrame,
+        ema_12: Optional[float] = None,
+        ema_26: Optional[float] = None,
+    ) -> MovingAverages:
         """
         Calcule les moyennes mobiles simples et exponentielles.
+
+        Les dernières valeurs d'EMA déjà calculées peuvent être fournies.
         """
-        sma_20 = df['close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = df['close'].rolling(window=50).mean().iloc[-1]
+        close = df['close'].to_numpy(dtype=np.float64)
+
+        # Moyennes sur les dernieres fenetres uniquement (O(fenetre))
+        sma_20 = close[-20:].mean()
+        sma_50 = close[-50:].mean()
 
         # SMA 200 - utiliser ce qu'on a si moins de 200 jours
-        if len(df) >= 200:
-            sma_200 = df['close'].rolling(window=200).mean().iloc[-1]
-        else:
-            sma_200 = df['close'].rolling(window=len(df)).mean().iloc[-1]
+        sma_200 = close[-200:].mean()
 
-        ema_12 = df['close'].ewm(span=12, adjust=False).mean().iloc[-1]
-        ema_26 = df['close'].ewm(span=26, adjust=False).mean().iloc[-1]
+        if ema_12 is None:
+            ema_12 = df['close'].ewm(span=12, adjust=False).mean().iloc[-1]
+        if ema_26 is None:
+            ema_26 = df['close'].ewm(span=26, adjust=False).mean().iloc[-1]
         current_price = df['close'].iloc[-1]
 
         return MovingAverages(
@@ -241,20 +551,22 @@ class TechnicalCalculator:
         Analyse le volume et calcule l'OBV trend.
         """
         current_volume = int(df['volume'].iloc[-1])
-        avg_volume_20 = float(df['volume'].rolling(window=20).mean().iloc[-1])
-        avg_volume_50 = float(df['volume'].rolling(window=50).mean().iloc[-1])
+        volumes = df['volume'].to_numpy(dtype=np.float64)
+        avg_volume_20 = float(volumes[-20:].mean())
+        avg_volume_50 = float(volumes[-50:].mean())
 
         # Changement de volume en %
         prev_volume = df['volume'].iloc[-2] if len(df) > 1 else current_volume
         volume_change = ((current_volume - prev_volume) / prev_volume * 100) if prev_volume > 0 else 0
 
         # On-Balance Volume (OBV) trend
-        obv = self._calculate_obv(df)
-        obv_sma = obv.rolling(window=20).mean()
+        obv = self._calculate_obv(df).to_numpy()
+        current_obv = obv[-1]
+        obv_sma = obv[-20:].mean()
 
-        if obv.iloc[-1] > obv_sma.iloc[-1]:
+        if current_obv > obv_sma:
             obv_trend = "rising"
-        elif obv.iloc[-1] < obv_sma.iloc[-1]:
+        elif current_obv < obv_sma:
             obv_trend = "falling"
         else:
             obv_trend = "flat"
@@ -273,16 +585,15 @@ class TechnicalCalculator:
 
         OBV augmente quand le prix monte, diminue quand il baisse.
         """
-        obv = [0]
-        for i in range(1, len(df)):
-            if df['close'].iloc[i] > df['close'].iloc[i-1]:
-                obv.append(obv[-1] + df['volume'].iloc[i])
-            elif df['close'].iloc[i] < df['close'].iloc[i-1]:
-                obv.append(obv[-1] - df['volume'].iloc[i])
-            else:
-                obv.append(obv[-1])
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+
+        # Volume signé par la direction du prix (+1 / -1 / 0), cumulé
+        signed_volume = np.empty_like(volume)
+        signed_volume[0] = 0.0
+        signed_volume[1:] = np.sign(np.diff(close)) * volume[1:]
 
-        return pd.Series(obv, index=df.index)
+        return pd.Series(np.cumsum(signed_volume), index=df.index)
 
     def _calculate_atr(
         self,
@@ -298,25 +609,48 @@ class TechnicalCalculator:
         Returns:
             Tuple (ATR absolu, ATR en % du prix)
         """
-        high = df['high']
-        low = df['low']
-        close = df['close']
-
-        # True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.ewm(span=period, adjust=False).mean()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+
+        # True Range sur tableaux NumPy (fmax ignore le NaN de la 1re barre)
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(
+            high - low,
+            np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)),
+        )
+        atr = pd.Series(true_range).ewm(span=period, adjust=False).mean()
 
         current_atr = float(atr.iloc[-1])
-        current_price = float(close.iloc[-1])
+        current_price = float(close[-1])
         atr_percent = (current_atr / current_price * 100) if current_price > 0 else 0
 
         return current_atr, atr_percent
 
 
+# =============================================================================
+# WORKERS (pool de processus)
+# =============================================================================
+
+# Calculateur propre à chaque processus du pool
+_worker_calculator = TechnicalCalculator()
+
+
+def _calculate_all_worker(
+    ticker: str,
+    series: HistoricalSeries,
+) -> Optional[TechnicalIndicators]:
+    """Point d'entrée du pool pour un actif."""
+    return _worker_calculator._calculate_all_sync(ticker, series)
+
+
+def _calculate_batch_worker(
+    data: Dict[str, HistoricalSeries],
+) -> Dict[str, TechnicalIndicators]:
+    """Point d'entrée du pool pour un lot d'actifs."""
+    return _worker_calculator._calculate_batch_sync(data)
+
+
 # =============================================================================
 # FACTORY FUNCTION
 # =============================================================================
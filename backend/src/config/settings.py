@@ -156,6 +156,15 @@ class Settings(BaseSettings):
         description="Clé API Finnhub (gratuit: 60 req/min)"
     )
 
+    # ==========================================================================
+    # CALCUL DES INDICATEURS
+    # ==========================================================================
+    INDICATOR_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        description="Processus dédiés au calcul des indicateurs (0 = thread)"
+    )
+
     # ==========================================================================
     # VALIDATION
     # ==========================================================================
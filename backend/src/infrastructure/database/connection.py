@@ -15,6 +15,7 @@ UTILISATION:
         await conn.execute("SELECT * FROM alerts")
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -33,6 +34,12 @@ class DatabaseConnection:
 
     Pattern Singleton pour garantir une seule instance.
     Thread-safe grâce à aiosqlite.
+
+    La connexion étant partagée, les écritures (execute, execute_many) et
+    les transactions sont sérialisées par un verrou: un commit ou un
+    rollback d'une requête ne peut pas valider ou annuler la transaction
+    d'une autre. Dans une transaction, passer par la connexion fournie
+    (et non par execute) pour ne pas attendre son propre verrou.
     """
 
     def __init__(self, db_path: Optional[str] = None):
@@ -45,6 +52,8 @@ class DatabaseConnection:
         self._db_path = Path(db_path or settings.DATABASE_PATH)
         self._connection: Optional[aiosqlite.Connection] = None
         self._initialized = False
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._write_lock_loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Créer le répertoire parent si nécessaire
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -84,6 +93,14 @@ class DatabaseConnection:
 
         return self._connection
 
+    def _get_write_lock(self) -> asyncio.Lock:
+        """Verrou des écritures, propre à la boucle d'événements courante."""
+        loop = asyncio.get_running_loop()
+        if self._write_lock is None or self._write_lock_loop is not loop:
+            self._write_lock = asyncio.Lock()
+            self._write_lock_loop = loop
+        return self._write_lock
+
     async def disconnect(self) -> None:
         """Ferme la connexion à la base de données."""
         if self._connection is not None:
@@ -123,13 +140,14 @@ class DatabaseConnection:
             Connection aiosqlite avec transaction
         """
         conn = await self.connect()
-        try:
-            yield conn
-            await conn.commit()
-        except Exception as e:
-            await conn.rollback()
-            logger.error(f"Transaction rollback: {e}")
-            raise
+        async with self._get_write_lock():
+            try:
+                yield conn
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                logger.error(f"Transaction rollback: {e}")
+                raise
 
     async def execute(
         self,
@@ -147,8 +165,9 @@ class DatabaseConnection:
             Cursor avec les résultats
         """
         conn = await self.connect()
-        cursor = await conn.execute(query, parameters)
-        await conn.commit()
+        async with self._get_write_lock():
+            cursor = await conn.execute(query, parameters)
+            await conn.commit()
         return cursor
 
     async def execute_many(
@@ -164,8 +183,9 @@ class DatabaseConnection:
             parameters: Liste de tuples de paramètres
         """
         conn = await self.connect()
-        await conn.executemany(query, parameters)
-        await conn.commit()
+        async with self._get_write_lock():
+            await conn.executemany(query, parameters)
+            await conn.commit()
 
     async def fetch_one(
         self,
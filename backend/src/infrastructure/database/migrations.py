@@ -9,6 +9,8 @@ SCHÉMA:
 - trades: Journal des trades avec P&L
 - journal_entries: Analyses pré/post trade
 - news_cache: Cache des actualités Finnhub
+- news_fts: Index plein texte des actualités (FTS5)
+- price_history_cache: Historiques Yahoo du jour (cache persistant)
 - backtest_results: Résultats des backtests
 
 VERSIONING:
@@ -221,15 +223,68 @@ BEGIN
 END;
 """
 
+# Migration 2 : index plein texte (FTS5, trigrammes = recherche de sous-chaîne)
+# sur les titres et résumés du cache des news, synchronisé par triggers
+NEWS_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    headline,
+    summary,
+    content='news_cache',
+    content_rowid='rowid',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS news_fts_insert
+    AFTER INSERT ON news_cache
+BEGIN
+    INSERT INTO news_fts(rowid, headline, summary)
+    VALUES (new.rowid, new.headline, new.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_fts_delete
+    AFTER DELETE ON news_cache
+BEGIN
+    INSERT INTO news_fts(news_fts, rowid, headline, summary)
+    VALUES ('delete', old.rowid, old.headline, old.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS news_fts_update
+    AFTER UPDATE OF headline, summary ON news_cache
+BEGIN
+    INSERT INTO news_fts(news_fts, rowid, headline, summary)
+    VALUES ('delete', old.rowid, old.headline, old.summary);
+    INSERT INTO news_fts(rowid, headline, summary)
+    VALUES (new.rowid, new.headline, new.summary);
+END;
+
+-- Indexer les articles déjà en cache
+INSERT INTO news_fts(news_fts) VALUES ('rebuild');
+"""
+
+# Migration 3 : cache persistant des historiques Yahoo (une ligne par ticker
+# et profondeur, valable pour le jour de bourse où elle a été récupérée)
+PRICE_HISTORY_SQL = """
+CREATE TABLE IF NOT EXISTS price_history_cache (
+    ticker TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    trading_day TEXT NOT NULL,
+    data BLOB NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (ticker, days)
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_history_day ON price_history_cache(trading_day);
+"""
+
 
 async def run_migrations(db: "DatabaseConnection") -> None:
     """
     Exécute les migrations de base de données.
 
     Cette fonction:
-    1. Vérifie si la migration a déjà été appliquée
-    2. Crée le schéma si nécessaire
-    3. Enregistre la migration dans _migrations
+    1. Lit la dernière version appliquée
+    2. Applique les migrations manquantes, dans l'ordre
+    3. Enregistre chaque migration dans _migrations
 
     Args:
         db: Instance DatabaseConnection
@@ -248,22 +303,42 @@ async def run_migrations(db: "DatabaseConnection") -> None:
             )
             row = await cursor.fetchone()
             current_version = row["version"] if row and row["version"] else 0
+        else:
+            current_version = 0
+
+        if current_version >= 3:
+            logger.info(f"Base de données déjà à jour (version {current_version})")
+            return
+
+        if current_version < 1:
+            # Exécuter le schéma
+            logger.info("Création du schéma de base de données...")
+            await conn.executescript(SCHEMA_SQL)
+
+            # Enregistrer la migration
+            await conn.execute(
+                "INSERT OR IGNORE INTO _migrations (version, description) VALUES (?, ?)",
+                (1, "Initial schema: alerts, trades, journal, news, backtest")
+            )
 
-            if current_version >= 1:
-                logger.info(f"Base de données déjà à jour (version {current_version})")
-                return
+            logger.info("Migration 1 appliquée: schéma initial créé")
+
+        if current_version < 2:
+            await conn.executescript(NEWS_FTS_SQL)
+            await conn.execute(
+                "INSERT OR IGNORE INTO _migrations (version, description) VALUES (?, ?)",
+                (2, "News full-text search index (FTS5)")
+            )
 
-        # Exécuter le schéma
-        logger.info("Création du schéma de base de données...")
-        await conn.executescript(SCHEMA_SQL)
+            logger.info("Migration 2 appliquée: index plein texte des news")
 
-        # Enregistrer la migration
+        await conn.executescript(PRICE_HISTORY_SQL)
         await conn.execute(
             "INSERT OR IGNORE INTO _migrations (version, description) VALUES (?, ?)",
-            (1, "Initial schema: alerts, trades, journal, news, backtest")
+            (3, "Persistent Yahoo price history cache")
         )
 
-        logger.info("Migration 1 appliquée: schéma initial créé")
+        logger.info("Migration 3 appliquée: cache des historiques")
 
 
 async def reset_database(db: "DatabaseConnection") -> None:
@@ -282,7 +357,9 @@ async def reset_database(db: "DatabaseConnection") -> None:
             "journal_entries",
             "trades",
             "alerts",
+            "news_fts",
             "news_cache",
+            "price_history_cache",
             "backtest_results",
             "_migrations"
         ]
@@ -9,6 +9,9 @@ from src.infrastructure.database.repositories.trade_repository import TradeRepos
 from src.infrastructure.database.repositories.journal_repository import JournalRepository
 from src.infrastructure.database.repositories.news_repository import NewsRepository
 from src.infrastructure.database.repositories.backtest_repository import BacktestRepository
+from src.infrastructure.database.repositories.price_history_repository import (
+    PriceHistoryRepository,
+)
 
 __all__ = [
     "AlertRepository",
@@ -16,4 +19,5 @@ __all__ = [
     "JournalRepository",
     "NewsRepository",
     "BacktestRepository",
+    "PriceHistoryRepository",
 ]
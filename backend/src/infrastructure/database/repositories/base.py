@@ -9,6 +9,8 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Generic, TypeVar, Optional, List, Any, Dict
 
+import aiosqlite
+
 from src.infrastructure.database.connection import get_database, DatabaseConnection
 
 T = TypeVar("T")
@@ -44,6 +46,28 @@ class BaseRepository(ABC, Generic[T]):
         """Nom de la table associée à ce repository."""
         pass
 
+    async def _execute(
+        self,
+        query: str,
+        parameters: tuple = (),
+        conn: Optional[aiosqlite.Connection] = None,
+    ) -> aiosqlite.Cursor:
+        """
+        Exécute une écriture, seule ou dans une transaction existante.
+
+        Args:
+            query: Requête SQL
+            parameters: Paramètres de la requête
+            conn: Connexion d'une transaction en cours (db.transaction()).
+                Si fournie, pas de commit: il est fait à la sortie de la transaction.
+
+        Returns:
+            Cursor de la requête
+        """
+        if conn is not None:
+            return await conn.execute(query, parameters)
+        return await self.db.execute(query, parameters)
+
     @staticmethod
     def generate_id() -> str:
         """Génère un ID unique."""
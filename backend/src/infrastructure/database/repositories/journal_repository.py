@@ -15,6 +15,8 @@ from datetime import datetime
 from typing import Optional, List, Any, Dict
 from enum import Enum
 
+import aiosqlite
+
 from src.infrastructure.database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -44,7 +46,7 @@ class ProcessCompliance(str, Enum):
     IGNORED = "ignored"
 
 
-@dataclass
+@dataclass(slots=True)
 class JournalEntry:
     """
     Entrée de journal pour un trade.
@@ -194,6 +196,7 @@ class JournalRepository(BaseRepository[JournalEntry]):
         market_bias: Optional[str] = None,
         timeframe: Optional[str] = None,
         confluence_factors: Optional[List[str]] = None,
+        conn: Optional[aiosqlite.Connection] = None,
     ) -> JournalEntry:
         """
         Crée une nouvelle entrée de journal (pré-trade).
@@ -206,6 +209,7 @@ class JournalRepository(BaseRepository[JournalEntry]):
             market_bias: Biais de marché
             timeframe: Timeframe
             confluence_factors: Facteurs de confluence
+            conn: Connexion d'une transaction en cours (commit différé)
 
         Returns:
             JournalEntry créée
@@ -225,9 +229,10 @@ class JournalRepository(BaseRepository[JournalEntry]):
         columns = ", ".join(data.keys())
         placeholders = ", ".join(["?" for _ in data])
 
-        await self.db.execute(
+        await self._execute(
             f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})",
-            tuple(data.values())
+            tuple(data.values()),
+            conn,
         )
 
         logger.info(f"Entrée de journal créée pour trade {trade_id}")
@@ -375,28 +380,44 @@ class JournalRepository(BaseRepository[JournalEntry]):
         )
         return [row["lessons_learned"] for row in rows]
 
-    async def get_common_mistakes(self) -> Dict[str, int]:
+    async def get_common_mistakes(self, limit: Optional[int] = None) -> Dict[str, int]:
         """
         Analyse les erreurs les plus fréquentes.
 
+        Le dépliage des listes JSON, le comptage et le tri sont faits en SQL
+        (json_each); seules les `limit` premières erreurs sont transférées.
+
+        Args:
+            limit: Nombre max d'erreurs retournées (None = toutes)
+
         Returns:
-            Dictionnaire erreur -> nombre d'occurrences
+            Dictionnaire erreur -> nombre d'occurrences, trié par fréquence
         """
-        rows = await self.db.fetch_all(
-            f"SELECT mistakes FROM {self.table_name} WHERE mistakes IS NOT NULL"
-        )
+        query = f"""
+            SELECT m.value as mistake, COUNT(*) as count
+            FROM {self.table_name}, json_each({self.table_name}.mistakes) AS m
+            WHERE mistakes IS NOT NULL AND json_valid(mistakes)
+            GROUP BY m.value
+            ORDER BY count DESC, mistake
+            LIMIT ?
+        """
+        # LIMIT -1 = pas de limite en SQLite
+        rows = await self.db.fetch_all(query, (limit if limit is not None else -1,))
 
-        mistake_counts: Dict[str, int] = {}
-        for row in rows:
-            try:
-                mistakes = json.loads(row["mistakes"])
-                for mistake in mistakes:
-                    mistake_counts[mistake] = mistake_counts.get(mistake, 0) + 1
-            except json.JSONDecodeError:
-                continue
+        return {row["mistake"]: row["count"] for row in rows}
+
+    async def get_data_version(self) -> int:
+        """
+        Version des données SQLite (PRAGMA data_version).
+
+        Change dès qu'une autre connexion valide une écriture dans la base.
+        Les écritures faites par cette connexion ne la modifient pas.
 
-        # Trier par fréquence
-        return dict(sorted(mistake_counts.items(), key=lambda x: x[1], reverse=True))
+        Returns:
+            Compteur de version
+        """
+        row = await self.db.fetch_one("PRAGMA data_version")
+        return row[0] if row else 0
 
     async def get_stats_by_setup(self) -> List[Dict[str, Any]]:
         """
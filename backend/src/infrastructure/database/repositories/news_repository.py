@@ -55,6 +55,10 @@ class NewsArticle:
     sentiment_score: Optional[float] = None
     published_at: Optional[str] = None
     fetched_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Champs API mémoïsés par to_dict (l'article n'est plus modifié une fois créé)
+    _api_fields: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def is_positive(self) -> bool:
@@ -79,20 +83,26 @@ class NewsArticle:
             return 0
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit en dictionnaire pour API."""
-        return {
-            "id": self.id,
-            "ticker": self.ticker,
-            "headline": self.headline,
-            "summary": self.summary,
-            "source": self.source,
-            "url": self.url,
-            "image_url": self.image_url,
-            "sentiment": self.sentiment.value if self.sentiment else None,
-            "sentiment_score": self.sentiment_score,
-            "published_at": self.published_at,
-            "age_hours": round(self.age_hours, 1),
-        }
+        """
+        Convertit en dictionnaire pour API.
+
+        Les champs fixes sont construits une seule fois ; seul age_hours,
+        qui dépend de l'heure courante, est recalculé à chaque appel.
+        """
+        if self._api_fields is None:
+            self._api_fields = {
+                "id": self.id,
+                "ticker": self.ticker,
+                "headline": self.headline,
+                "summary": self.summary,
+                "source": self.source,
+                "url": self.url,
+                "image_url": self.image_url,
+                "sentiment": self.sentiment.value if self.sentiment else None,
+                "sentiment_score": self.sentiment_score,
+                "published_at": self.published_at,
+            }
+        return {**self._api_fields, "age_hours": round(self.age_hours, 1)}
 
 
 class NewsRepository(BaseRepository[NewsArticle]):
@@ -152,34 +162,44 @@ class NewsRepository(BaseRepository[NewsArticle]):
             Article sauvegardé
         """
         data = self._entity_to_dict(article)
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(["?" for _ in data])
-        updates = ", ".join([f"{k} = excluded.{k}" for k in data.keys() if k != "id"])
-
-        await self.db.execute(
-            f"""
-            INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})
-            ON CONFLICT(id) DO UPDATE SET {updates}
-            """,
-            tuple(data.values())
-        )
+        await self.db.execute(self._upsert_query(list(data)), tuple(data.values()))
 
         return article
 
+    def _upsert_query(self, columns: List[str]) -> str:
+        """Construit la requête d'insert ou update (upsert sur l'id)."""
+        placeholders = ", ".join(["?" for _ in columns])
+        updates = ", ".join([f"{k} = excluded.{k}" for k in columns if k != "id"])
+
+        return f"""
+            INSERT INTO {self.table_name} ({", ".join(columns)}) VALUES ({placeholders})
+            ON CONFLICT(id) DO UPDATE SET {updates}
+            """
+
     async def save_many(self, articles: List[NewsArticle]) -> int:
         """
         Sauvegarde plusieurs articles.
 
+        Un seul executemany et un seul commit pour le lot ; les doublons
+        (même id) sont fusionnés avant l'écriture, le dernier l'emporte.
+
         Args:
             articles: Liste d'articles
 
         Returns:
             Nombre d'articles sauvegardés
         """
-        count = 0
-        for article in articles:
-            await self.save(article)
-            count += 1
+        unique = {article.id: article for article in articles}
+        if not unique:
+            return 0
+
+        rows = [self._entity_to_dict(article) for article in unique.values()]
+        await self.db.execute_many(
+            self._upsert_query(list(rows[0])),
+            [tuple(row.values()) for row in rows],
+        )
+
+        count = len(rows)
 
         logger.info(f"{count} articles sauvegardés en cache")
         return count
@@ -254,6 +274,51 @@ class NewsRepository(BaseRepository[NewsArticle]):
 
         return [self._row_to_entity(row) for row in rows]
 
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        hours: int = 48
+    ) -> List[NewsArticle]:
+        """
+        Recherche un terme dans les titres et résumés des articles récents.
+
+        La recherche (sous-chaîne, insensible à la casse) passe par l'index
+        plein texte news_fts ; les termes de moins de 3 caractères, trop
+        courts pour les trigrammes, sont filtrés par LIKE sur la même table.
+
+        Args:
+            query: Terme recherché
+            limit: Nombre maximum d'articles
+            hours: Nombre d'heures à regarder en arrière
+
+        Returns:
+            Articles correspondants, les plus récents d'abord
+        """
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+
+        if len(query) >= 3:
+            # Phrase FTS5 : guillemets doublés, pas d'opérateurs interprétés
+            match = "news_fts MATCH ?"
+            params: tuple = ('"' + query.replace('"', '""') + '"',)
+        else:
+            match = "(f.headline LIKE ? ESCAPE '\\' OR f.summary LIKE ? ESCAPE '\\')"
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params = (f"%{escaped}%", f"%{escaped}%")
+
+        rows = await self.db.fetch_all(
+            f"""
+            SELECT n.* FROM news_fts f
+            JOIN {self.table_name} n ON n.rowid = f.rowid
+            WHERE {match} AND n.published_at > ?
+            ORDER BY n.published_at DESC
+            LIMIT ?
+            """,
+            params + (cutoff, limit)
+        )
+
+        return [self._row_to_entity(row) for row in rows]
+
     async def get_by_sentiment(
         self,
         sentiment: Sentiment,
@@ -313,6 +378,9 @@ class NewsRepository(BaseRepository[NewsArticle]):
         """
         Supprime les articles anciens.
 
+        Une seule requête DELETE, servie par l'index idx_news_fetched :
+        seules les lignes expirées sont parcourues.
+
         Args:
             max_age_hours: Âge maximum avant suppression
 
@@ -342,9 +410,27 @@ class NewsRepository(BaseRepository[NewsArticle]):
         Returns:
             Résumé du sentiment
         """
-        articles = await self.get_by_ticker(ticker, limit=50, max_age_hours=24)
+        # Agrégation en SQL sur les 50 articles récents (pas d'entités chargées)
+        cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
+        row = await self.db.fetch_one(
+            f"""
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN sentiment = ? THEN 1 ELSE 0 END) as positive,
+                SUM(CASE WHEN sentiment = ? THEN 1 ELSE 0 END) as negative,
+                AVG(sentiment_score) as avg_score
+            FROM (
+                SELECT sentiment, sentiment_score FROM {self.table_name}
+                WHERE ticker = ? AND fetched_at > ?
+                ORDER BY published_at DESC
+                LIMIT 50
+            )
+            """,
+            (Sentiment.POSITIVE.value, Sentiment.NEGATIVE.value, ticker.upper(), cutoff)
+        )
 
-        if not articles:
+        total = row["total"] if row else 0
+        if not total:
             return {
                 "ticker": ticker,
                 "total_articles": 0,
@@ -354,13 +440,12 @@ class NewsRepository(BaseRepository[NewsArticle]):
             }
 
         breakdown = {
-            "positive": sum(1 for a in articles if a.is_positive),
-            "negative": sum(1 for a in articles if a.is_negative),
-            "neutral": sum(1 for a in articles if a.sentiment == Sentiment.NEUTRAL or a.sentiment is None),
+            "positive": row["positive"],
+            "negative": row["negative"],
+            "neutral": total - row["positive"] - row["negative"],
         }
 
-        scores = [a.sentiment_score for a in articles if a.sentiment_score is not None]
-        avg_score = sum(scores) / len(scores) if scores else 0.0
+        avg_score = row["avg_score"] if row["avg_score"] is not None else 0.0
 
         # Déterminer le sentiment global
         if breakdown["positive"] > breakdown["negative"] * 1.5:
@@ -372,7 +457,7 @@ class NewsRepository(BaseRepository[NewsArticle]):
 
         return {
             "ticker": ticker,
-            "total_articles": len(articles),
+            "total_articles": total,
             "sentiment": overall,
             "score": round(avg_score, 3),
             "breakdown": breakdown,
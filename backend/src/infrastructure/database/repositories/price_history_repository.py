@@ -0,0 +1,174 @@
+"""
+Repository pour le cache persistant des historiques de prix.
+
+Une ligne par (ticker, profondeur) est conservée avec le jour et l'heure
+de sa récupération. Elle n'est servie que ce même jour (UTC) et, si un âge
+maximal est demandé, tant qu'elle est plus récente que cet âge : pendant
+la séance, la dernière bougie évolue encore. Chaque sauvegarde remplace
+la ligne précédente : la table ne grossit pas au fil des jours.
+
+Les points sont stockés en colonnes (JSON orjson) dans un BLOB unique :
+une lecture = une ligne, sans reconstruire 250 lignes SQL par ticker.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from src.application.interfaces.stock_data_provider import (
+    HistoricalDataPoint,
+    HistoricalSeries,
+)
+from src.infrastructure.database.repositories.base import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+def today_utc() -> str:
+    """Jour courant (UTC) au format YYYY-MM-DD, clé de validité du cache."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+@dataclass
+class CachedHistory:
+    """
+    Historique en cache pour un ticker.
+
+    Attributs:
+        ticker: Symbole du ticker
+        days: Profondeur demandée (en jours)
+        trading_day: Jour de récupération (YYYY-MM-DD, UTC)
+        points: Points historiques
+    """
+
+    ticker: str
+    days: int
+    trading_day: str
+    points: List[HistoricalDataPoint] = field(default_factory=list)
+
+
+class PriceHistoryRepository(BaseRepository[CachedHistory]):
+    """Repository pour le cache persistant des historiques Yahoo."""
+
+    @property
+    def table_name(self) -> str:
+        return "price_history_cache"
+
+    def _row_to_entity(self, row: Any) -> CachedHistory:
+        """Convertit une ligne SQLite en CachedHistory."""
+        columns = orjson.loads(row["data"])
+        points = [
+            HistoricalDataPoint(
+                date=datetime.fromisoformat(date),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+            )
+            for date, open_, high, low, close, volume in zip(
+                columns["date"],
+                columns["open"],
+                columns["high"],
+                columns["low"],
+                columns["close"],
+                columns["volume"],
+            )
+        ]
+        return CachedHistory(
+            ticker=row["ticker"],
+            days=row["days"],
+            trading_day=row["trading_day"],
+            points=points,
+        )
+
+    def _entity_to_dict(self, entity: CachedHistory) -> Dict[str, Any]:
+        """Convertit un CachedHistory en dictionnaire (points en colonnes)."""
+        series = HistoricalSeries.from_points(entity.points)
+        data = orjson.dumps(
+            {
+                "date": [d.isoformat() for d in series.dates],
+                "open": series.open,
+                "high": series.high,
+                "low": series.low,
+                "close": series.close,
+                "volume": series.volume,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+        return {
+            "ticker": entity.ticker.upper(),
+            "days": entity.days,
+            "trading_day": entity.trading_day,
+            "data": data,
+        }
+
+    async def get_many(
+        self,
+        tickers: List[str],
+        days: int,
+        trading_day: str,
+        max_age_seconds: Optional[int] = None,
+    ) -> Dict[str, List[HistoricalDataPoint]]:
+        """
+        Récupère les historiques du jour pour plusieurs tickers.
+
+        Args:
+            tickers: Symboles des tickers
+            days: Profondeur demandée
+            trading_day: Jour de validité (YYYY-MM-DD)
+            max_age_seconds: Âge maximal depuis la récupération (None = tout le jour)
+
+        Returns:
+            Dict {ticker: points}, sans les tickers absents ou périmés
+        """
+        if not tickers:
+            return {}
+
+        placeholders = ", ".join(["?" for _ in tickers])
+        query = f"""
+            SELECT * FROM {self.table_name}
+            WHERE ticker IN ({placeholders}) AND days = ? AND trading_day = ?
+        """
+        params = tuple(t.upper() for t in tickers) + (days, trading_day)
+
+        if max_age_seconds is not None:
+            # fetched_at est en UTC (CURRENT_TIMESTAMP), comme datetime('now')
+            query += " AND fetched_at >= datetime('now', ?)"
+            params += (f"-{int(max_age_seconds)} seconds",)
+
+        rows = await self.db.fetch_all(query, params)
+
+        return {row["ticker"]: self._row_to_entity(row).points for row in rows}
+
+    async def save_many(self, histories: List[CachedHistory]) -> int:
+        """
+        Sauvegarde plusieurs historiques (remplace la version précédente).
+
+        Args:
+            histories: Historiques à sauvegarder
+
+        Returns:
+            Nombre d'historiques sauvegardés
+        """
+        rows = [self._entity_to_dict(h) for h in histories if h.points]
+        if not rows:
+            return 0
+
+        await self.db.execute_many(
+            f"""
+            INSERT INTO {self.table_name} (ticker, days, trading_day, data)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(ticker, days) DO UPDATE SET
+                trading_day = excluded.trading_day,
+                data = excluded.data,
+                fetched_at = CURRENT_TIMESTAMP
+            """,
+            [tuple(row.values()) for row in rows],
+        )
+
+        logger.debug(f"{len(rows)} historiques sauvegardés en cache")
+        return len(rows)
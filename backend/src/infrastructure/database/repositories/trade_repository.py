@@ -12,9 +12,11 @@ import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Tuple
 from enum import Enum
 
+import aiosqlite
+
 from src.infrastructure.database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -34,7 +36,7 @@ class TradeStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """
     Entité Trade pour le journal de trading.
@@ -113,6 +115,13 @@ class Trade:
             return None
         return reward / risk
 
+    @property
+    def pnl_percent(self) -> float:
+        """P&L net en % du capital engagé (0 si prix d'entrée ou P&L inconnu)."""
+        if not self.entry_price or self.entry_price <= 0 or self.net_pnl is None:
+            return 0.0
+        return self.net_pnl / (self.entry_price * (self.position_size or 1)) * 100
+
     def calculate_pnl(self, exit_price: float, fees: float = 0.0) -> Dict[str, float]:
         """
         Calcule le P&L pour un prix de sortie donné.
@@ -205,6 +214,7 @@ class TradeRepository(BaseRepository[Trade]):
         take_profit: Optional[float] = None,
         position_size: Optional[int] = None,
         status: TradeStatus = TradeStatus.PLANNED,
+        conn: Optional[aiosqlite.Connection] = None,
     ) -> Trade:
         """
         Crée un nouveau trade.
@@ -217,6 +227,7 @@ class TradeRepository(BaseRepository[Trade]):
             take_profit: Take profit
             position_size: Taille de position
             status: Statut initial
+            conn: Connexion d'une transaction en cours (commit différé)
 
         Returns:
             Trade créé
@@ -237,9 +248,10 @@ class TradeRepository(BaseRepository[Trade]):
         columns = ", ".join(data.keys())
         placeholders = ", ".join(["?" for _ in data])
 
-        await self.db.execute(
+        await self._execute(
             f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})",
-            tuple(data.values())
+            tuple(data.values()),
+            conn,
         )
 
         logger.info(f"Trade créé: {trade.ticker} {trade.direction.value}")
@@ -269,6 +281,28 @@ class TradeRepository(BaseRepository[Trade]):
 
         return trade
 
+    async def update_fields(self, trade_id: str, fields: Dict[str, Any]) -> Optional[Trade]:
+        """
+        Met à jour uniquement les colonnes fournies (UPDATE partiel, sans SELECT préalable).
+
+        Args:
+            trade_id: ID du trade
+            fields: Colonnes à modifier -> nouvelles valeurs
+
+        Returns:
+            Trade mis à jour ou None
+        """
+        if fields:
+            data = {**fields, "updated_at": self.now_iso()}
+            set_clause = ", ".join([f"{k} = ?" for k in data.keys()])
+
+            await self.db.execute(
+                f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?",
+                tuple(data.values()) + (trade_id,)
+            )
+
+        return await self.get_by_id(trade_id)
+
     async def activate(self, trade_id: str, entry_price: float) -> Optional[Trade]:
         """
         Active un trade planifié.
@@ -392,6 +426,63 @@ class TradeRepository(BaseRepository[Trade]):
         )
         return [self._row_to_entity(row) for row in rows]
 
+    async def get_dashboard_active(self, limit: int = 5) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Trades actifs pour le dashboard: total et derniers trades, en une requête.
+
+        Seules les colonnes affichées sont lues (pas d'hydratation en Trade).
+        COUNT(*) OVER () est évalué avant le LIMIT: chaque ligne porte le total.
+
+        Args:
+            limit: Nombre maximum de trades renvoyés
+
+        Returns:
+            (nombre total de trades actifs, lignes id/ticker/direction/entry_price)
+        """
+        rows = await self.db.fetch_all(
+            f"""
+            SELECT id, ticker, direction, entry_price, COUNT(*) OVER () AS total_count
+            FROM {self.table_name}
+            WHERE status = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (TradeStatus.ACTIVE.value, limit)
+        )
+        if not rows:
+            return 0, []
+        return rows[0]["total_count"], [
+            {
+                "id": row["id"],
+                "ticker": row["ticker"],
+                "direction": row["direction"],
+                "entry_price": row["entry_price"],
+            }
+            for row in rows
+        ]
+
+    async def get_dashboard_closed(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Derniers trades clôturés pour le dashboard (colonnes affichées uniquement).
+
+        Args:
+            limit: Nombre maximum de trades renvoyés
+
+        Returns:
+            Lignes id/ticker/direction/net_pnl/r_multiple, du plus récent au plus ancien
+        """
+        rows = await self.db.fetch_all(
+            f"""
+            SELECT id, ticker, direction, net_pnl, r_multiple
+            FROM {self.table_name}
+            WHERE status = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (TradeStatus.CLOSED.value, limit)
+        )
+        return [dict(row) for row in rows]
+
     async def get_by_ticker(self, ticker: str) -> List[Trade]:
         """
         Récupère les trades pour un ticker.
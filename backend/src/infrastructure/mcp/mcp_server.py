@@ -1600,12 +1600,17 @@ async def run_server():
 
     server = create_mcp_server()
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        # Terminer les sauvegardes du cache de news en arrière-plan
+        from src.application.services.news_service import get_news_service
+        await get_news_service().flush()
 
 
 def main():
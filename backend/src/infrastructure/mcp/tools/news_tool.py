@@ -10,7 +10,7 @@ Ces outils permettent à Claude Desktop de:
 import json
 import logging
 
-from src.application.services.news_service import NewsService
+from src.application.services.news_service import get_news_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ async def get_news_tool(ticker: str, limit: int = 10) -> str:
         JSON avec les actualités
     """
     try:
-        service = NewsService()
+        service = get_news_service()
         articles = await service.get_news_for_ticker(
             ticker=ticker.upper(),
             limit=limit,
@@ -72,7 +72,7 @@ async def get_sentiment_tool(ticker: str) -> str:
         JSON avec l'analyse de sentiment
     """
     try:
-        service = NewsService()
+        service = get_news_service()
         sentiment = await service.get_sentiment(ticker.upper())
 
         # Ajouter une interprétation
@@ -117,7 +117,7 @@ async def get_market_news_tool(category: str = "general", limit: int = 15) -> st
         JSON avec les actualités
     """
     try:
-        service = NewsService()
+        service = get_news_service()
         articles = await service.get_market_news(category=category, limit=limit)
 
         # Grouper par sentiment
@@ -178,7 +178,7 @@ async def get_news_summary_tool(tickers: str, limit_per_ticker: int = 3) -> str:
         if len(ticker_list) > 10:
             ticker_list = ticker_list[:10]
 
-        service = NewsService()
+        service = get_news_service()
         summary = await service.get_news_summary(
             tickers=ticker_list,
             limit_per_ticker=limit_per_ticker,
@@ -3,6 +3,7 @@ Infrastructure de notifications pour Stock Analyzer.
 
 Fournit:
 - Service Telegram pour les alertes de prix
+- File d'envoi asynchrone avec limitation de débit
 - Interface abstraite pour d'autres canaux (email, SMS, etc.)
 """
 
@@ -10,8 +11,14 @@ from src.infrastructure.notifications.telegram_service import (
     TelegramService,
     get_telegram_service,
 )
+from src.infrastructure.notifications.notification_queue import (
+    NotificationQueue,
+    get_notification_queue,
+)
 
 __all__ = [
     "TelegramService",
     "get_telegram_service",
+    "NotificationQueue",
+    "get_notification_queue",
 ]
@@ -0,0 +1,194 @@
+"""
+File d'envoi asynchrone des notifications Telegram.
+
+Les services métier déposent leurs notifications dans une file en mémoire
+et rendent la main immédiatement. Un worker unique vide la file en
+respectant la limite de débit de l'API Telegram (~30 msg/s).
+
+Fonctionnalités:
+- Envoi hors du chemin de la requête HTTP
+- Limitation de débit par token bucket
+- Pause de la file pendant le délai imposé par un 429 Telegram
+- Envois concurrents (un RTT Telegram lent ne bloque pas la file)
+- Dédoublonnage des notifications en attente (même clé = un seul message)
+
+UTILISATION:
+    from src.infrastructure.notifications.notification_queue import get_notification_queue
+
+    queue = get_notification_queue()
+    queue.enqueue((trade.id, "opened"), "send_trade_opened", ticker="AAPL", ...)
+"""
+
+import asyncio
+import logging
+from typing import Any, Hashable, Optional, Set
+
+from src.infrastructure.notifications.telegram_service import (
+    TelegramService,
+    get_telegram_service,
+)
+
+logger = logging.getLogger(__name__)
+
+# Débit max envoyé à Telegram (limite globale de l'API: 30 msg/s)
+MAX_MESSAGES_PER_SECOND = 25
+
+# Attente max des notifications en attente à l'arrêt de l'application
+DRAIN_TIMEOUT_SECONDS = 10
+
+
+class NotificationQueue:
+    """
+    File de notifications Telegram avec worker en arrière-plan.
+
+    Le worker est démarré à la première notification, dans la boucle
+    d'événements courante.
+    """
+
+    def __init__(
+        self,
+        telegram: Optional[TelegramService] = None,
+        rate: float = MAX_MESSAGES_PER_SECOND,
+    ):
+        """
+        Initialise la file.
+
+        Args:
+            telegram: Service Telegram. Par défaut le singleton, résolu
+                au premier envoi.
+            rate: Nombre max de messages envoyés par seconde.
+        """
+        self._telegram_service = telegram
+        self._rate = rate
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Set[Hashable] = set()
+        # Références fortes sur les envois en cours (évite leur collecte par le GC)
+        self._in_flight: Set[asyncio.Task] = set()
+
+    @property
+    def _telegram(self) -> TelegramService:
+        """Service Telegram, résolu à la première utilisation."""
+        if self._telegram_service is None:
+            self._telegram_service = get_telegram_service()
+        return self._telegram_service
+
+    def enqueue(self, key: Hashable, method: str, **kwargs: Any) -> bool:
+        """
+        Ajoute une notification à la file.
+
+        Args:
+            key: Clé de dédoublonnage (ex: (trade_id, "opened"))
+            method: Nom de la méthode TelegramService à appeler
+            **kwargs: Arguments de la méthode
+
+        Returns:
+            True si ajoutée, False si une notification identique est déjà en attente
+        """
+        self._ensure_worker()
+        if key in self._pending:
+            logger.debug(f"Notification déjà en attente: {key}")
+            return False
+
+        self._pending.add(key)
+        self._queue.put_nowait((key, method, kwargs))
+        return True
+
+    @property
+    def is_started(self) -> bool:
+        """Vérifie si une notification a déjà été déposée (worker démarré)."""
+        return self._queue is not None
+
+    async def join(self) -> None:
+        """Attend que toutes les notifications en attente soient envoyées."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        """Démarre le worker (ou le recrée si la boucle a changé)."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._pending.clear()
+            self._worker = None
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Boucle du worker: dépile et envoie avec limitation de débit."""
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        tokens = self._rate
+        last = loop.time()
+
+        while True:
+            key, method, kwargs = await queue.get()
+            try:
+                # Rate limit Telegram (429): rien n'est envoyé avant la fin du délai,
+                # puis reprise sans rafale
+                if self._telegram.retry_delay() > 0:
+                    await self._telegram.wait_rate_limit()
+                    tokens = 0
+                    last = loop.time()
+
+                # Token bucket: recharge proportionnelle au temps écoulé
+                now = loop.time()
+                tokens = min(self._rate, tokens + (now - last) * self._rate)
+                last = now
+                if tokens < 1:
+                    await asyncio.sleep((1 - tokens) / self._rate)
+                    tokens = 1
+                    last = loop.time()
+                tokens -= 1
+
+                # Envoi détaché: le worker passe au message suivant sans attendre
+                task = loop.create_task(getattr(self._telegram, method)(**kwargs))
+            except Exception as e:
+                logger.error(f"Erreur envoi notification {method}: {e}")
+                self._pending.discard(key)
+                queue.task_done()
+                continue
+            except BaseException:
+                self._pending.discard(key)
+                queue.task_done()
+                raise
+
+            self._in_flight.add(task)
+            task.add_done_callback(
+                lambda t, key=key, method=method: self._on_sent(t, key, method, queue)
+            )
+
+    def _on_sent(
+        self,
+        task: asyncio.Task,
+        key: Hashable,
+        method: str,
+        queue: asyncio.Queue,
+    ) -> None:
+        """Callback de fin d'envoi: journalise l'erreur éventuelle et libère la clé."""
+        self._in_flight.discard(task)
+        self._pending.discard(key)
+        queue.task_done()
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Erreur envoi notification {method}: {task.exception()}")
+
+
+# Singleton
+_notification_queue: Optional[NotificationQueue] = None
+
+
+def get_notification_queue() -> NotificationQueue:
+    """
+    Retourne l'instance singleton de la file de notifications.
+
+    Returns:
+        NotificationQueue partagée
+    """
+    global _notification_queue
+    if _notification_queue is None:
+        _notification_queue = NotificationQueue()
+    return _notification_queue
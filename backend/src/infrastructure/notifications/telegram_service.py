@@ -15,7 +15,9 @@ UTILISATION:
     await telegram.send_message("Hello World!")
 """
 
+import asyncio
 import logging
+import time
 from typing import Optional
 import httpx
 
@@ -23,6 +25,9 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Tentatives max d'un envoi refusé pour rate limit (429)
+MAX_SEND_ATTEMPTS = 3
+
 
 class TelegramService:
     """
@@ -52,6 +57,10 @@ class TelegramService:
         self._chat_id = chat_id or settings.TELEGRAM_CHAT_ID
         self._timeout = timeout
         self._client: Optional[httpx.AsyncClient] = None
+        # Fin du délai imposé par le dernier 429 (time.monotonic), partagé par tous les envois
+        self._blocked_until = 0.0
+        self._retry_lock: Optional[asyncio.Lock] = None
+        self._retry_lock_loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
     def is_configured(self) -> bool:
@@ -69,6 +78,23 @@ class TelegramService:
             self._client = httpx.AsyncClient(timeout=self._timeout)
         return self._client
 
+    def retry_delay(self) -> float:
+        """Secondes restantes avant la fin du délai imposé par Telegram (0 si aucun)."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def _get_retry_lock(self) -> asyncio.Lock:
+        """Verrou des envois après un 429, propre à la boucle d'événements courante."""
+        loop = asyncio.get_running_loop()
+        if self._retry_lock is None or self._retry_lock_loop is not loop:
+            self._retry_lock = asyncio.Lock()
+            self._retry_lock_loop = loop
+        return self._retry_lock
+
+    async def wait_rate_limit(self) -> None:
+        """Attend la fin du délai imposé par un 429 (commun à tous les envois)."""
+        while (delay := self.retry_delay()) > 0:
+            await asyncio.sleep(delay)
+
     async def close(self) -> None:
         """Ferme le client HTTP."""
         if self._client is not None:
@@ -102,18 +128,34 @@ class TelegramService:
 
         target_chat = chat_id or self._chat_id
 
+        payload = {
+            "chat_id": target_chat,
+            "text": text,
+            "parse_mode": parse_mode,
+            "disable_notification": disable_notification,
+            "disable_web_page_preview": disable_web_page_preview,
+        }
+
         try:
             client = await self._get_client()
-            response = await client.post(
-                f"{self.api_url}/sendMessage",
-                json={
-                    "chat_id": target_chat,
-                    "text": text,
-                    "parse_mode": parse_mode,
-                    "disable_notification": disable_notification,
-                    "disable_web_page_preview": disable_web_page_preview,
-                }
-            )
+
+            # Rate limit Telegram: le délai demandé bloque tous les envois,
+            # pas seulement celui qui a reçu le 429
+            for attempt in range(MAX_SEND_ATTEMPTS):
+                if attempt == 0 and self.retry_delay() == 0:
+                    response = await client.post(f"{self.api_url}/sendMessage", json=payload)
+                else:
+                    # Après un 429: envois un par un, pour ne pas repartir en rafale
+                    async with self._get_retry_lock():
+                        await self.wait_rate_limit()
+                        response = await client.post(f"{self.api_url}/sendMessage", json=payload)
+
+                if response.status_code != 429:
+                    break
+
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                logger.warning(f"Telegram rate limit, nouvel essai dans {retry_after}s")
 
             if response.status_code == 200:
                 data = response.json()
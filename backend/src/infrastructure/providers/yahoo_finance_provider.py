@@ -15,9 +15,12 @@ UTILISATION:
     quote = await provider.get_current_quote(Ticker("AAPL"))
 """
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import yfinance as yf
@@ -40,16 +43,19 @@ from src.domain.value_objects.ticker import Ticker
 
 logger = logging.getLogger(__name__)
 
+# Nombre max d'historiques conserves en memoire (LRU avec TTL)
+MAX_HISTORICAL_CACHE_SIZE = 256
+
 
 class YahooFinanceProvider(StockDataProvider):
     """
     Implémentation du provider de données utilisant Yahoo Finance.
 
     Utilise la bibliothèque yfinance pour récupérer les données boursières.
-    Thread-safe et sans état interne (stateless).
+    Les historiques sont gardés en mémoire pendant _cache_ttl secondes.
 
     Attributes:
-        _cache_ttl: Durée de vie du cache en secondes (futur usage)
+        _cache_ttl: Durée de vie du cache en secondes (0 = désactivé)
     """
 
     # Mapping Saxo exchange codes -> Yahoo Finance suffixes
@@ -81,9 +87,12 @@ class YahooFinanceProvider(StockDataProvider):
         Initialise le provider Yahoo Finance.
 
         Args:
-            cache_ttl: TTL du cache en secondes (préparé pour futur cache Redis)
+            cache_ttl: TTL du cache des historiques en secondes (0 = désactivé)
         """
         self._cache_ttl = cache_ttl
+        self._historical_cache: OrderedDict[
+            Tuple[str, int, str], Tuple[float, Tuple[HistoricalDataPoint, ...]]
+        ] = OrderedDict()
 
     def _convert_saxo_to_yahoo_ticker(self, ticker_value: str) -> str:
         """
@@ -130,6 +139,9 @@ class YahooFinanceProvider(StockDataProvider):
         """
         Récupère les données historiques depuis Yahoo Finance.
 
+        Les résultats sont mis en cache par (ticker, days, interval) pendant
+        _cache_ttl secondes. Chaque appel reçoit sa propre liste.
+
         Args:
             ticker: Ticker de l'instrument
             days: Nombre de jours d'historique
@@ -141,6 +153,133 @@ class YahooFinanceProvider(StockDataProvider):
             TickerNotFoundError: Si le ticker n'existe pas
             DataFetchError: Si une erreur survient lors de la récupération
         """
+        key = (ticker.value, days, interval)
+        points = self._get_cached_history(key)
+        if points is not None:
+            return list(points)
+
+        data_points = await self._fetch_historical_data(ticker, days)
+        self._cache_history(key, data_points)
+
+        return data_points
+
+    async def get_historical_data_bulk(
+        self,
+        tickers: List[Ticker],
+        days: int = 365,
+        interval: str = "1d",
+    ) -> Dict[str, List[HistoricalDataPoint]]:
+        """
+        Récupère les historiques de plusieurs tickers en un seul appel Yahoo.
+
+        Les tickers déjà en cache ne sont pas redemandés ; les autres sont
+        téléchargés ensemble (yf.download) puis mis en cache individuellement.
+        Les tickers introuvables sont simplement absents du résultat : l'appelant
+        peut se rabattre sur get_historical_data (fallback et erreurs détaillées).
+
+        Args:
+            tickers: Tickers des instruments
+            days: Nombre de jours d'historique
+
+        Returns:
+            Dict {ticker.value: points historiques}
+        """
+        results: Dict[str, List[HistoricalDataPoint]] = {}
+        missing: List[Ticker] = []
+
+        for ticker in dict.fromkeys(tickers):
+            points = self._get_cached_history((ticker.value, days, interval))
+            if points is not None:
+                results[ticker.value] = list(points)
+            else:
+                missing.append(ticker)
+
+        if not missing:
+            return results
+
+        yahoo_symbols = {t.value: self._convert_saxo_to_yahoo_ticker(t.value) for t in missing}
+        try:
+            # Téléchargement bloquant (HTTP + pandas) exécuté hors de la boucle
+            frames = await asyncio.to_thread(
+                self._download_many, sorted(set(yahoo_symbols.values())), days
+            )
+        except Exception as e:
+            logger.warning(f"Bulk Yahoo download failed ({len(missing)} tickers): {e}")
+            return results
+
+        for ticker in missing:
+            data_points = frames.get(yahoo_symbols[ticker.value])
+            if data_points:
+                self._cache_history((ticker.value, days, interval), data_points)
+                results[ticker.value] = list(data_points)
+
+        logger.debug(f"Bulk fetch: {len(results)}/{len(tickers)} historiques")
+        return results
+
+    def _download_many(
+        self,
+        yahoo_symbols: List[str],
+        days: int,
+    ) -> Dict[str, List[HistoricalDataPoint]]:
+        """Téléchargement groupé Yahoo Finance, découpé par symbole (sans cache)."""
+        end_date = datetime.today()
+        start_date = end_date - timedelta(days=days)
+
+        hist = yf.download(
+            tickers=" ".join(yahoo_symbols),
+            start=start_date,
+            end=end_date,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=False,
+            progress=False,
+        )
+        if hist is None or hist.empty:
+            return {}
+
+        available = set(hist.columns.get_level_values(0))
+        frames: Dict[str, List[HistoricalDataPoint]] = {}
+        for symbol in yahoo_symbols:
+            if symbol not in available:
+                continue
+            # Les dates des autres marchés apparaissent en NaN pour ce symbole
+            sub = hist[symbol].dropna(subset=["Close"])
+            if not sub.empty:
+                frames[symbol] = self._to_data_points(sub)
+        return frames
+
+    def _get_cached_history(
+        self,
+        key: Tuple[str, int, str],
+    ) -> Optional[Tuple[HistoricalDataPoint, ...]]:
+        """Lit un historique du cache LRU (None si absent ou expiré)."""
+        cached = self._historical_cache.get(key)
+        if cached is None:
+            return None
+        expires_at, points = cached
+        if expires_at > time.monotonic():
+            self._historical_cache.move_to_end(key)
+            return points
+        del self._historical_cache[key]
+        return None
+
+    def _cache_history(
+        self,
+        key: Tuple[str, int, str],
+        data_points: List[HistoricalDataPoint],
+    ) -> None:
+        """Ajoute un historique au cache LRU (si le cache est activé)."""
+        if self._cache_ttl > 0:
+            self._historical_cache[key] = (time.monotonic() + self._cache_ttl, tuple(data_points))
+            if len(self._historical_cache) > MAX_HISTORICAL_CACHE_SIZE:
+                self._historical_cache.popitem(last=False)
+
+    async def _fetch_historical_data(
+        self,
+        ticker: Ticker,
+        days: int,
+    ) -> List[HistoricalDataPoint]:
+        """Appel Yahoo Finance effectif (sans cache)."""
         try:
             # Convertir le ticker Saxo vers Yahoo Finance si nécessaire
             yahoo_ticker = self._convert_saxo_to_yahoo_ticker(ticker.value)
@@ -166,17 +305,7 @@ class YahooFinanceProvider(StockDataProvider):
                 raise TickerNotFoundError(ticker.value)
 
             # Conversion au format attendu
-            data_points: List[HistoricalDataPoint] = []
-            for date, row in hist.iterrows():
-                point = HistoricalDataPoint(
-                    date=date.to_pydatetime(),
-                    open=float(row['Open']),
-                    high=float(row['High']),
-                    low=float(row['Low']),
-                    close=float(row['Close']),
-                    volume=int(row['Volume']),
-                )
-                data_points.append(point)
+            data_points = self._to_data_points(hist)
 
             logger.debug(f"Retrieved {len(data_points)} data points for {ticker.value}")
             return data_points
@@ -189,6 +318,21 @@ class YahooFinanceProvider(StockDataProvider):
                 f"Erreur lors de la récupération des données pour {ticker.value}: {str(e)}"
             )
 
+    def _to_data_points(self, hist) -> List[HistoricalDataPoint]:
+        """Convertit un DataFrame OHLCV yfinance en points historiques."""
+        data_points: List[HistoricalDataPoint] = []
+        for date, row in hist.iterrows():
+            point = HistoricalDataPoint(
+                date=date.to_pydatetime(),
+                open=float(row['Open']),
+                high=float(row['High']),
+                low=float(row['Low']),
+                close=float(row['Close']),
+                volume=int(row['Volume']),
+            )
+            data_points.append(point)
+        return data_points
+
     async def get_current_quote(self, ticker: Ticker) -> StockQuote:
         """
         Récupère le cours actuel d'un instrument.
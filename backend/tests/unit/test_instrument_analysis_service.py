@@ -8,10 +8,13 @@ Ces tests verifient:
 - La generation de recommandations
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime, timedelta
 
+from src.application.services import instrument_analysis_service as instrument_module
 from src.application.services.instrument_analysis_service import (
     InstrumentAnalysisService,
     InstrumentInfo,
@@ -59,6 +62,7 @@ def mock_structure_analyzer():
     """Mock de l'analyseur de structure."""
     analyzer = MagicMock()
     analyzer.analyze = AsyncMock()
+    analyzer.find_key_levels = AsyncMock(return_value=([], []))
     return analyzer
 
 
@@ -250,6 +254,39 @@ class TestTradingLevelsCalculation:
         # SL devrait etre proche du support
         assert levels.suggested_stop_loss >= 185.50 * 0.90  # Max 10% de perte
 
+    def test_trading_levels_supports_above_price(self, analysis_service):
+        """Test SL base sur l'ATR quand aucun support n'est sous le prix."""
+        technical = TechnicalAnalysis(
+            rsi=55.0,
+            rsi_signal="neutral",
+            macd_line=1.5,
+            macd_signal=1.2,
+            macd_histogram=0.3,
+            macd_trend="bullish",
+            trend="uptrend",
+            trend_strength="moderate",
+            sma_20=180.0,
+            sma_50=175.0,
+            sma_200=160.0,
+            ema_12=182.0,
+            ema_26=178.0,
+            price_vs_sma50="above",
+            price_vs_sma200="above",
+            bollinger_upper=195.0,
+            bollinger_middle=180.0,
+            bollinger_lower=165.0,
+            bollinger_position="middle",
+            percent_b=0.68,
+            atr=3.5,
+            atr_percent=1.9,
+            support_levels=[190.0, 195.0],  # Tous au-dessus du prix
+            resistance_levels=[200.0],
+        )
+
+        levels = analysis_service._calculate_trading_levels(185.50, technical)
+
+        assert levels.suggested_stop_loss == round(185.50 - 2 * 3.5, 2)
+
 
 # =============================================================================
 # TESTS - Recommendation Generation
@@ -512,6 +549,65 @@ class TestFullAnalysis:
         assert result.recommendation is not None
         assert result.recommendation.action in ["BUY", "WAIT", "AVOID"]
 
+    @pytest.mark.asyncio
+    async def test_analyze_instrument_fetches_historical_once(
+        self,
+        analysis_service,
+        mock_yahoo_provider,
+        mock_technical_calculator,
+        mock_news_service,
+        mock_structure_analyzer,
+        sample_metadata,
+        sample_quote,
+        sample_historical,
+        sample_indicators,
+        sample_news,
+    ):
+        """Test un seul appel historique par analyse, non fige entre analyses."""
+        mock_yahoo_provider.get_metadata.return_value = sample_metadata
+        mock_yahoo_provider.get_current_quote.return_value = sample_quote
+        mock_yahoo_provider.get_historical_data.return_value = sample_historical
+        mock_technical_calculator.calculate_all.return_value = sample_indicators
+        mock_news_service.get_news_for_ticker.return_value = sample_news
+        mock_structure_analyzer.analyze.return_value = None
+
+        await analysis_service.analyze_instrument("AAPL")
+        assert mock_yahoo_provider.get_historical_data.await_count == 1
+
+        # Le cache (TTL court) est celui du provider: le service ne fige rien
+        await analysis_service.analyze_instrument("AAPL")
+        assert mock_yahoo_provider.get_historical_data.await_count == 2
+        assert mock_yahoo_provider.get_current_quote.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_many_keeps_order_and_errors(
+        self,
+        analysis_service,
+        mock_yahoo_provider,
+        mock_technical_calculator,
+        mock_news_service,
+        mock_structure_analyzer,
+        sample_metadata,
+        sample_quote,
+        sample_historical,
+        sample_indicators,
+        sample_news,
+    ):
+        """Test analyse par lot: ordre conserve et erreurs retournees."""
+        mock_yahoo_provider.get_metadata.return_value = sample_metadata
+        mock_yahoo_provider.get_current_quote.return_value = sample_quote
+        mock_yahoo_provider.get_historical_data.side_effect = (
+            lambda ticker, days: [] if ticker.value == "BAD" else sample_historical
+        )
+        mock_technical_calculator.calculate_all.return_value = sample_indicators
+        mock_news_service.get_news_for_ticker.return_value = sample_news
+        mock_structure_analyzer.analyze.return_value = None
+
+        results = await analysis_service.analyze_many(["AAPL", "BAD", "MSFT"], concurrency=2)
+
+        assert [r.info.symbol for r in (results[0], results[2])] == ["AAPL", "MSFT"]
+        assert isinstance(results[1], ValueError)
+
     @pytest.mark.asyncio
     async def test_analyze_instrument_insufficient_data(
         self,
@@ -530,6 +626,55 @@ class TestFullAnalysis:
             await analysis_service.analyze_instrument("AAPL")
 
 
+# =============================================================================
+# TESTS - Cache sentiment
+# =============================================================================
+
+class TestSentimentCache:
+    """Tests pour le cache du sentiment."""
+
+    def test_default_news_service_is_shared(self, mock_yahoo_provider):
+        """Test le service de news par defaut est le singleton partage."""
+        shared = MagicMock()
+
+        with patch.object(instrument_module, "get_news_service", return_value=shared):
+            service = InstrumentAnalysisService(yahoo_provider=mock_yahoo_provider)
+
+        assert service._news_service is shared
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_fetch(
+        self, analysis_service, mock_news_service, sample_news
+    ):
+        """Test appels concurrents fusionnes en une seule requete news."""
+        mock_news_service.get_news_for_ticker.return_value = sample_news
+
+        results = await asyncio.gather(
+            *(analysis_service._get_sentiment_analysis("AAPL") for _ in range(5))
+        )
+
+        assert mock_news_service.get_news_for_ticker.await_count == 1
+        assert all(r is results[0] for r in results)
+        assert results[0].news_count == 5
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_cached(
+        self, analysis_service, mock_news_service, sample_news
+    ):
+        """Test un echec renvoie le defaut sans etre conserve en cache."""
+        mock_news_service.get_news_for_ticker.side_effect = [
+            RuntimeError("API down"),
+            sample_news,
+        ]
+
+        first = await analysis_service._get_sentiment_analysis("AAPL")
+        second = await analysis_service._get_sentiment_analysis("AAPL")
+
+        assert first.sentiment_label == "unknown"
+        assert second.news_count == 5
+        assert mock_news_service.get_news_for_ticker.await_count == 2
+
+
 # =============================================================================
 # TESTS - Data Classes
 # =============================================================================
@@ -590,6 +735,69 @@ class TestDataClasses:
         assert len(data["pros"]) == 2
         assert len(data["cons"]) == 1
 
+    def test_analysis_to_json_bytes_matches_to_dict(self):
+        """Test serialisation orjson equivalente a to_dict."""
+        import json
+
+        analysis = InstrumentAnalysis(
+            info=InstrumentInfo(symbol="AAPL", name="Apple Inc.", currency="USD"),
+            price=PriceData(
+                current_price=185.50,
+                open=183.0,
+                high=186.0,
+                low=182.0,
+                previous_close=183.0,
+                change=2.50,
+                change_percent=1.37,
+                volume=50000000,
+            ),
+            technical=TechnicalAnalysis(
+                rsi=55.0,
+                rsi_signal="neutral",
+                macd_line=1.5,
+                macd_signal=1.2,
+                macd_histogram=0.3,
+                macd_trend="bullish",
+                trend="uptrend",
+                trend_strength="moderate",
+                sma_20=180.0,
+                sma_50=175.0,
+                sma_200=160.0,
+                ema_12=182.0,
+                ema_26=178.0,
+                price_vs_sma50="above",
+                price_vs_sma200="above",
+                bollinger_upper=195.0,
+                bollinger_middle=180.0,
+                bollinger_lower=165.0,
+                bollinger_position="middle",
+                percent_b=0.68,
+                atr=3.5,
+                atr_percent=1.9,
+                support_levels=[175.0],
+            ),
+            sentiment=SentimentAnalysis(
+                sentiment_score=0.3,
+                sentiment_label="bullish",
+                news_count=1,
+                recent_headlines=[{"headline": "News", "source": "Reuters"}],
+            ),
+            trading_levels=TradingLevels(
+                entry_price=185.50,
+                suggested_stop_loss=178.5,
+                suggested_take_profit_1=199.5,
+                suggested_take_profit_2=206.5,
+                stop_loss_distance_pct=3.77,
+                take_profit_1_distance_pct=7.55,
+                take_profit_2_distance_pct=11.32,
+                risk_reward_ratio=2.0,
+                invalidation_level=165.0,
+            ),
+            recommendation=BuyRecommendation(action="BUY", confidence=75.0, rating=4),
+        )
+
+        assert json.loads(analysis.to_json_bytes()) == analysis.to_dict()
+
 
 # =============================================================================
 # TESTS - Edge Cases
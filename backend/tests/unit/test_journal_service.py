@@ -0,0 +1,430 @@
+"""
+Tests unitaires pour le service de journal de trading.
+
+Ces tests verifient:
+- La creation et la cloture de trades
+- L'envoi des notifications via la file
+- La suppression d'un trade et de son journal
+- La mise a jour partielle des trades
+- Le dashboard
+- Le cache des statistiques
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.services import journal_service as journal_service_module
+from src.application.services.journal_service import JournalService
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.database.migrations import run_migrations
+from src.infrastructure.database.repositories.journal_repository import JournalRepository
+from src.infrastructure.database.repositories.trade_repository import (
+    Trade,
+    TradeDirection,
+    TradeRepository,
+    TradeStatus,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def active_trade():
+    """Trade actif de test."""
+    return Trade(
+        id="trade-1",
+        ticker="AAPL",
+        direction=TradeDirection.LONG,
+        status=TradeStatus.ACTIVE,
+        entry_price=150.0,
+        stop_loss=145.0,
+        take_profit=165.0,
+        position_size=10,
+    )
+
+
+@pytest.fixture
+def mock_trade_repo(active_trade):
+    """Mock du repository des trades."""
+    repo = MagicMock()
+    repo.create = AsyncMock(return_value=active_trade)
+    repo.activate = AsyncMock(return_value=active_trade)
+    repo.close = AsyncMock(return_value=active_trade)
+    repo.get_stats = AsyncMock(return_value={"total_trades": 0})
+    repo.get_by_status = AsyncMock(return_value=[active_trade])
+    repo.get_dashboard_active = AsyncMock(return_value=(
+        1,
+        [{"id": "trade-1", "ticker": "AAPL", "direction": "long", "entry_price": 150.0}],
+    ))
+    repo.get_dashboard_closed = AsyncMock(return_value=[
+        {"id": "trade-1", "ticker": "AAPL", "direction": "long", "net_pnl": 100.0, "r_multiple": 2.0}
+    ])
+    return repo
+
+
+@pytest.fixture
+def mock_journal_repo():
+    """Mock du repository du journal."""
+    repo = MagicMock()
+    repo.create = AsyncMock()
+    repo.get_common_mistakes = AsyncMock(return_value={"FOMO": 3})
+    repo.get_lessons = AsyncMock(return_value=["Respecter le stop"])
+    return repo
+
+
+@pytest.fixture
+def mock_notifier():
+    """Mock de la file de notifications."""
+    notifier = MagicMock()
+    notifier.enqueue = MagicMock(return_value=True)
+    return notifier
+
+
+@pytest.fixture
+def journal_service(mock_trade_repo, mock_journal_repo, mock_notifier):
+    """Service de journal avec mocks."""
+    return JournalService(
+        trade_repo=mock_trade_repo,
+        journal_repo=mock_journal_repo,
+        notifier=mock_notifier,
+    )
+
+
+@pytest.fixture
+async def sqlite_db(tmp_path):
+    """Base SQLite temporaire avec schema."""
+    db = DatabaseConnection(str(tmp_path / "journal.db"))
+    await db.connect()
+    await run_migrations(db)
+    yield db
+    await db.disconnect()
+
+
+# =============================================================================
+# TESTS - Notifications
+# =============================================================================
+
+class TestTradeNotifications:
+    """Tests pour les notifications de trades."""
+
+    @pytest.mark.asyncio
+    async def test_create_active_trade_enqueues_notification(
+        self, journal_service, mock_notifier
+    ):
+        """Test trade actif = notification mise en file."""
+        await journal_service.create_trade(
+            "AAPL", "long", entry_price=150.0, status="active"
+        )
+
+        mock_notifier.enqueue.assert_called_once()
+        key, method = mock_notifier.enqueue.call_args.args
+        assert key == ("trade-1", "opened")
+        assert method == "send_trade_opened"
+
+    @pytest.mark.asyncio
+    async def test_create_planned_trade_no_notification(
+        self, journal_service, mock_notifier
+    ):
+        """Test trade planifie = pas de notification."""
+        await journal_service.create_trade("AAPL", "long", entry_price=150.0)
+
+        mock_notifier.enqueue.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close_trade_enqueues_closed_notification(
+        self, journal_service, mock_notifier, active_trade
+    ):
+        """Test cloture = notification de cloture mise en file."""
+        active_trade.net_pnl = 100.0
+
+        await journal_service.close_trade("trade-1", exit_price=160.0)
+
+        key, method = mock_notifier.enqueue.call_args.args
+        assert key == ("trade-1", "closed")
+        assert method == "send_trade_closed"
+        assert mock_notifier.enqueue.call_args.kwargs["exit_price"] == 160.0
+        # 100 / (150 * 10) * 100
+        assert mock_notifier.enqueue.call_args.kwargs["pnl_percent"] == pytest.approx(6.6667, rel=1e-3)
+
+    def test_pnl_percent_without_pnl(self, active_trade):
+        """Test P&L% nul si le P&L n'est pas encore connu."""
+        assert active_trade.net_pnl is None
+        assert active_trade.pnl_percent == 0.0
+
+    @pytest.mark.asyncio
+    async def test_notify_false_skips_queue(self, journal_service, mock_notifier):
+        """Test notify=False = aucune notification."""
+        await journal_service.activate_trade("trade-1", 150.0, notify=False)
+
+        mock_notifier.enqueue.assert_not_called()
+
+
+# =============================================================================
+# TESTS - Validation
+# =============================================================================
+
+class TestValidation:
+    """Tests pour la validation des valeurs d'enum."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_direction_raises(self, journal_service):
+        """Test direction inconnue rejetee."""
+        with pytest.raises(ValueError, match="Direction invalide"):
+            await journal_service.create_trade("AAPL", "sideways")
+
+    @pytest.mark.asyncio
+    async def test_invalid_status_filter_returns_empty(self, journal_service):
+        """Test filtre de statut inconnu = liste vide."""
+        assert await journal_service.get_trades(status="unknown") == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_post_trade_value_raises(self, journal_service):
+        """Test valeur d'analyse post-trade inconnue rejetee."""
+        with pytest.raises(ValueError, match="EmotionalState"):
+            await journal_service.add_post_trade_analysis(
+                "trade-1",
+                execution_quality="good",
+                emotional_state="ecstatic",
+                process_compliance="followed",
+                trade_quality_score=7,
+            )
+
+
+# =============================================================================
+# TESTS - Creation transactionnelle
+# =============================================================================
+
+class TestCreateTradeTransaction:
+    """Tests pour la creation trade + journal en une transaction."""
+
+    @pytest.mark.asyncio
+    async def test_journal_failure_rolls_back_trade(
+        self, sqlite_db, mock_notifier, monkeypatch
+    ):
+        """Test echec de l'entree de journal = pas de trade orphelin."""
+        trade_repo = TradeRepository(sqlite_db)
+        journal_repo = JournalRepository(sqlite_db)
+        monkeypatch.setattr(
+            journal_repo, "create", AsyncMock(side_effect=RuntimeError("insert failed"))
+        )
+        service = JournalService(
+            trade_repo=trade_repo, journal_repo=journal_repo, notifier=mock_notifier
+        )
+
+        with pytest.raises(RuntimeError):
+            await service.create_trade("AAPL", "long", setup_type="breakout")
+
+        assert await trade_repo.get_all() == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_does_not_commit_transaction(
+        self, sqlite_db, mock_notifier, monkeypatch
+    ):
+        """Test une ecriture concurrente entre les deux inserts ne valide pas le trade."""
+        trade_repo = TradeRepository(sqlite_db)
+        journal_repo = JournalRepository(sqlite_db)
+        concurrent = []
+
+        async def failing_create(**kwargs):
+            # Autre requete sur la connexion partagee pendant la transaction
+            concurrent.append(asyncio.create_task(
+                trade_repo.create("MSFT", TradeDirection.LONG)
+            ))
+            await asyncio.sleep(0.05)
+            raise RuntimeError("insert failed")
+
+        monkeypatch.setattr(journal_repo, "create", failing_create)
+        service = JournalService(
+            trade_repo=trade_repo, journal_repo=journal_repo, notifier=mock_notifier
+        )
+
+        with pytest.raises(RuntimeError):
+            await service.create_trade("AAPL", "long", setup_type="breakout")
+        await concurrent[0]
+
+        assert [t.ticker for t in await trade_repo.get_all()] == ["MSFT"]
+
+
+# =============================================================================
+# TESTS - Suppression
+# =============================================================================
+
+class TestDeleteTrade:
+    """Tests pour la suppression de trades."""
+
+    @pytest.mark.asyncio
+    async def test_delete_trade_cascades_to_journal(self, sqlite_db, mock_notifier):
+        """Test suppression du trade = suppression de son entree de journal."""
+        service = JournalService(
+            trade_repo=TradeRepository(sqlite_db),
+            journal_repo=JournalRepository(sqlite_db),
+            notifier=mock_notifier,
+        )
+        trade = await service.create_trade("AAPL", "long", setup_type="breakout")
+        assert await service.get_journal_entry(trade.id) is not None
+
+        assert await service.delete_trade(trade.id) is True
+
+        assert await service.get_trade(trade.id) is None
+        assert await service.get_journal_entry(trade.id) is None
+
+
+# =============================================================================
+# TESTS - Mise a jour
+# =============================================================================
+
+class TestUpdateTrade:
+    """Tests pour la mise a jour de trades."""
+
+    @pytest.mark.asyncio
+    async def test_update_without_changes_skips_write(
+        self, journal_service, mock_trade_repo, active_trade
+    ):
+        """Test aucun champ fourni = pas d'UPDATE."""
+        mock_trade_repo.get_by_id = AsyncMock(return_value=active_trade)
+        mock_trade_repo.update_fields = AsyncMock()
+
+        assert await journal_service.update_trade("trade-1") is active_trade
+
+        mock_trade_repo.update_fields.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_partial_update_keeps_other_fields(self, sqlite_db, mock_notifier):
+        """Test seules les colonnes fournies sont modifiees."""
+        service = JournalService(
+            trade_repo=TradeRepository(sqlite_db),
+            journal_repo=JournalRepository(sqlite_db),
+            notifier=mock_notifier,
+        )
+        trade = await service.create_trade(
+            "AAPL", "long", entry_price=150.0, stop_loss=145.0, take_profit=165.0
+        )
+
+        updated = await service.update_trade(trade.id, stop_loss=148.0)
+
+        assert updated.stop_loss == 148.0
+        assert updated.take_profit == 165.0
+        assert await service.update_trade("missing", stop_loss=1.0) is None
+
+
+# =============================================================================
+# TESTS - Dashboard
+# =============================================================================
+
+class TestDashboard:
+    """Tests pour le dashboard du journal."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard_aggregates_all_sections(self, journal_service):
+        """Test toutes les sections du dashboard sont remplies."""
+        dashboard = await journal_service.get_dashboard()
+
+        assert dashboard["stats"] == {"total_trades": 0}
+        assert dashboard["active_trades"] == 1
+        assert dashboard["active_trades_list"][0]["ticker"] == "AAPL"
+        assert dashboard["recent_closed"][0]["id"] == "trade-1"
+        assert dashboard["top_mistakes"] == {"FOMO": 3}
+        assert dashboard["recent_lessons"] == ["Respecter le stop"]
+
+    @pytest.mark.asyncio
+    async def test_dashboard_lists_are_bounded(self, sqlite_db, mock_notifier):
+        """Test listes du dashboard bornees et projetees en SQL, comptage exact."""
+        service = JournalService(
+            trade_repo=TradeRepository(sqlite_db),
+            journal_repo=JournalRepository(sqlite_db),
+            notifier=mock_notifier,
+        )
+        for i in range(7):
+            await service.create_trade(f"T{i}", "long", entry_price=10.0, status="active")
+
+        dashboard = await service.get_dashboard()
+
+        assert dashboard["active_trades"] == 7
+        assert len(dashboard["active_trades_list"]) == 5
+        assert set(dashboard["active_trades_list"][0]) == {
+            "id", "ticker", "direction", "entry_price"
+        }
+        assert dashboard["recent_closed"] == []
+
+    @pytest.mark.asyncio
+    async def test_common_mistakes_top_k_in_sql(self, sqlite_db, mock_notifier):
+        """Test erreurs comptees, triees et limitees en SQL."""
+        service = JournalService(
+            trade_repo=TradeRepository(sqlite_db),
+            journal_repo=JournalRepository(sqlite_db),
+            notifier=mock_notifier,
+        )
+        for mistakes in (["FOMO", "Stop trop serre"], ["FOMO"], ["Revenge", "FOMO"]):
+            trade = await service.create_trade("AAPL", "long", setup_type="breakout")
+            await service.add_post_trade_analysis(
+                trade.id, "good", "calm", "followed", 7, mistakes=mistakes
+            )
+
+        top = await service.get_common_mistakes(limit=2)
+
+        assert top == {"FOMO": 3, "Revenge": 1}
+        assert len(await service.get_common_mistakes()) == 3
+
+
+# =============================================================================
+# TESTS - Cache des statistiques
+# =============================================================================
+
+class TestStatsCache:
+    """Tests pour le cache TTL des statistiques."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_stats_share_one_query(self, journal_service, mock_trade_repo):
+        """Test appels concurrents = une seule agregation."""
+        results = await asyncio.gather(*(journal_service.get_stats() for _ in range(5)))
+
+        assert mock_trade_repo.get_stats.await_count == 1
+        assert all(r == {"total_trades": 0} for r in results)
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_stats(self, journal_service, mock_trade_repo):
+        """Test une cloture de trade invalide le cache."""
+        await journal_service.get_stats()
+        await journal_service.close_trade("trade-1", exit_price=160.0, notify=False)
+        await journal_service.get_stats()
+
+        assert mock_trade_repo.get_stats.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rollup_reused_until_data_changes(
+        self, sqlite_db, mock_notifier, monkeypatch, tmp_path
+    ):
+        """Test stats par setup recalculees seulement si la base a change."""
+        monkeypatch.setattr(journal_service_module, "STATS_CACHE_TTL_SECONDS", 0)
+        journal_repo = JournalRepository(sqlite_db)
+        service = JournalService(
+            trade_repo=TradeRepository(sqlite_db),
+            journal_repo=journal_repo,
+            notifier=mock_notifier,
+        )
+        trade = await service.create_trade(
+            "AAPL", "long", entry_price=10.0, position_size=1,
+            status="active", setup_type="breakout",
+        )
+        await service.close_trade(trade.id, exit_price=12.0)
+
+        spy = AsyncMock(wraps=journal_repo.get_stats_by_setup)
+        monkeypatch.setattr(journal_repo, "get_stats_by_setup", spy)
+
+        first = await service.get_stats_by_setup()
+        await service.get_stats_by_setup()
+        assert spy.await_count == 1
+        assert first[0]["setup_type"] == "breakout"
+
+        # Ecriture par une autre connexion -> data_version change
+        other = DatabaseConnection(str(tmp_path / "journal.db"))
+        await other.connect()
+        await other.execute("UPDATE trades SET net_pnl = 5 WHERE id = ?", (trade.id,))
+        await other.disconnect()
+
+        await service.get_stats_by_setup()
+        assert spy.await_count == 2
@@ -0,0 +1,410 @@
+"""
+Tests unitaires pour l'analyseur de structure de marche.
+
+Ces tests verifient:
+- Le cache des analyses
+- L'analyse par lot
+- Le rejet des donnees invalides
+- La conversion en DataFrame
+- Le calcul de l'ATR
+- La detection des swing points
+- La detection des niveaux egaux
+- La detection des Fair Value Gaps
+- La detection des Order Blocks
+- La recherche du niveau le plus proche
+- L'extraction rapide des supports/resistances (find_key_levels)
+"""
+
+import math
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.application.interfaces.stock_data_provider import HistoricalDataPoint
+from src.application.services import market_structure_analyzer as analyzer_module
+from src.application.services.market_structure_analyzer import (
+    MarketStructureAnalyzer,
+    _OHLCArrays,
+)
+from src.domain.entities.market_structure import LiquidityType, SwingPoint, SwingType
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def analyzer():
+    """Analyseur de structure."""
+    return MarketStructureAnalyzer()
+
+
+@pytest.fixture
+def oscillating_data():
+    """Donnees oscillantes autour de 100 (nombreux swing points)."""
+    base_date = datetime(2024, 1, 1)
+    data = []
+    for i in range(300):
+        close = 100 + 10 * math.sin(i / 8) + (i % 5) * 0.1
+        data.append(HistoricalDataPoint(
+            date=base_date + timedelta(days=i),
+            open=close,
+            high=close + 1,
+            low=close - 1,
+            close=close,
+            volume=1_000_000,
+        ))
+    return data
+
+
+# =============================================================================
+# TESTS - Cache des analyses
+# =============================================================================
+
+class TestAnalysisCache:
+    """Tests pour le cache LRU de analyze."""
+
+    @pytest.mark.asyncio
+    async def test_same_snapshot_served_from_cache(self, analyzer, oscillating_data):
+        """Test meme instantane de donnees = analyse reutilisee."""
+        first = await analyzer.analyze("TEST", oscillating_data)
+        second = await analyzer.analyze("TEST", list(oscillating_data))
+
+        assert first is not None
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_new_candle_recomputes(self, analyzer, oscillating_data):
+        """Test nouvelle bougie = nouvelle analyse."""
+        first = await analyzer.analyze("TEST", oscillating_data[:-1])
+        second = await analyzer.analyze("TEST", oscillating_data)
+
+        assert second is not first
+        assert second.current_price == oscillating_data[-1].close
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, analyzer, oscillating_data, monkeypatch):
+        """Test les plus anciennes analyses sont evincees."""
+        monkeypatch.setattr(analyzer_module, "MAX_ANALYSIS_CACHE_SIZE", 2)
+
+        for ticker in ("A", "B", "C"):
+            await analyzer.analyze(ticker, oscillating_data)
+
+        assert [key[0] for key in analyzer._analysis_cache] == ["B", "C"]
+
+
+# =============================================================================
+# TESTS - Analyse par lot
+# =============================================================================
+
+class TestAnalyzeBatch:
+    """Tests pour analyze_batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_individual_analyses(self, oscillating_data):
+        """Test chaque ticker du lot = meme resultat qu'une analyse seule."""
+        datasets = {"A": oscillating_data, "B": oscillating_data[:120], "C": oscillating_data[:10]}
+
+        results = await MarketStructureAnalyzer().analyze_batch(datasets)
+
+        assert list(results) == ["A", "B", "C"]
+        assert results["C"] is None
+        for ticker in ("A", "B"):
+            single = await MarketStructureAnalyzer().analyze(ticker, datasets[ticker])
+            batch = results[ticker].to_dict()
+            expected = single.to_dict()
+            batch.pop("analyzed_at")
+            expected.pop("analyzed_at")
+            assert batch == expected
+
+
+# =============================================================================
+# TESTS - Donnees invalides
+# =============================================================================
+
+class TestInvalidData:
+    """Tests pour les gardes de _analyze_sync."""
+
+    @pytest.mark.asyncio
+    async def test_non_finite_prices_rejected(self, analyzer, oscillating_data):
+        """Test prix NaN = pas d'analyse (et rien en cache)."""
+        data = list(oscillating_data)
+        data[150] = replace(data[150], high=float("nan"))
+
+        assert await analyzer.analyze("TEST", data) is None
+        assert not analyzer._analysis_cache
+
+    @pytest.mark.asyncio
+    async def test_unconvertible_data_rejected(self, analyzer, oscillating_data):
+        """Test prix non numerique = pas d'analyse."""
+        data = list(oscillating_data)
+        data[10] = replace(data[10], low="n/a")
+
+        assert await analyzer.analyze("TEST", data) is None
+
+
+# =============================================================================
+# TESTS - Conversion
+# =============================================================================
+
+class TestToDataFrame:
+    """Tests pour _to_dataframe."""
+
+    def test_columns_and_sorted_index(self, analyzer, oscillating_data):
+        """Test colonnes OHLCV et index date trie, meme si l'entree ne l'est pas."""
+        df = analyzer._to_dataframe(oscillating_data[::-1])
+
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df.index.name == 'date'
+        assert df.index.is_monotonic_increasing
+        assert df['close'].iloc[-1] == oscillating_data[-1].close
+        assert df['volume'].iloc[0] == oscillating_data[0].volume
+
+
+# =============================================================================
+# TESTS - ATR
+# =============================================================================
+
+class TestATR:
+    """Tests pour _calculate_atr."""
+
+    def test_matches_rolling_true_range_mean(self, analyzer, oscillating_data):
+        """Test ATR = moyenne mobile simple 14 du true range."""
+        df = analyzer._to_dataframe(oscillating_data)
+        prev_close = df['close'].shift(1)
+        true_range = pd.concat(
+            [df['high'] - df['low'], (df['high'] - prev_close).abs(), (df['low'] - prev_close).abs()],
+            axis=1,
+        ).max(axis=1)
+
+        atr = analyzer._calculate_atr(_OHLCArrays.from_dataframe(df))
+
+        assert atr == pytest.approx(true_range.rolling(14).mean().iloc[-1])
+
+    def test_short_history_returns_zero(self, analyzer, oscillating_data):
+        """Test moins de 14 bougies = ATR nul."""
+        df = analyzer._to_dataframe(oscillating_data[:10])
+
+        assert analyzer._calculate_atr(_OHLCArrays.from_dataframe(df)) == 0
+
+
+# =============================================================================
+# TESTS - Swing points
+# =============================================================================
+
+class TestSwingPoints:
+    """Tests pour _detect_swing_points."""
+
+    def test_swings_are_strict_local_extrema(self, analyzer, oscillating_data):
+        """Test chaque swing depasse strictement ses N voisins de chaque cote."""
+        df = analyzer._to_dataframe(oscillating_data)
+        highs = df['high'].tolist()
+        lows = df['low'].tolist()
+        n = analyzer.swing_strength
+
+        expected = []
+        for i in range(n, len(df) - n):
+            neighbors = [i + j for j in range(-n, n + 1) if j != 0]
+            if all(highs[i] > highs[k] for k in neighbors):
+                expected.append((df.index[i], highs[i]))
+            if all(lows[i] < lows[k] for k in neighbors):
+                expected.append((df.index[i], lows[i]))
+
+        swings = analyzer._detect_swing_points(_OHLCArrays.from_dataframe(df)).points
+
+        assert [(s.date, s.price) for s in swings] == expected
+        assert [s.date for s in swings] == sorted(s.date for s in swings)
+
+    def test_too_few_bars(self, analyzer, oscillating_data):
+        """Test moins de 2N+1 bougies = aucun swing."""
+        df = analyzer._to_dataframe(oscillating_data[:5])
+
+        swings = analyzer._detect_swing_points(_OHLCArrays.from_dataframe(df))
+
+        assert len(swings) == 0
+        assert swings.points == []
+
+    def test_types_match_points(self, analyzer, oscillating_data):
+        """Test colonnes et vue SwingPoint coherentes (HH sur les highs, LL sur les lows)."""
+        df = analyzer._to_dataframe(oscillating_data)
+        swings = analyzer._detect_swing_points(_OHLCArrays.from_dataframe(df))
+
+        assert [s.price for s in swings.points] == swings.prices.tolist()
+        for swing, is_high in zip(swings.points, swings.is_high.tolist()):
+            expected = SwingType.HIGHER_HIGH if is_high else SwingType.LOWER_LOW
+            assert swing.swing_type == expected
+
+
+# =============================================================================
+# TESTS - Niveaux egaux
+# =============================================================================
+
+class TestEqualLevels:
+    """Tests pour _detect_equal_levels."""
+
+    def test_same_pairs_as_exhaustive_scan(self, analyzer):
+        """Test memes paires, dans le meme ordre, qu'une comparaison de toutes les paires."""
+        base_date = datetime(2024, 1, 1)
+        prices = [100.0, 100.4, 120.0, 99.8, 100.9, 120.5, 80.0, 100.2]
+        swings = [
+            SwingPoint(base_date + timedelta(days=i), p, SwingType.HIGHER_HIGH, strength=3)
+            for i, p in enumerate(prices)
+        ]
+        expected = [
+            ((a + b) / 2, base_date + timedelta(days=j))
+            for i, a in enumerate(prices)
+            for j, b in enumerate(prices)
+            if i < j and abs(a - b) / a <= 0.005
+        ]
+
+        zones = []
+        analyzer._detect_equal_levels(swings, zones, LiquidityType.EQUAL_HIGHS)
+
+        assert [(z.price_level, z.last_test) for z in zones] == expected
+        assert all(z.strength == 6 for z in zones)
+
+
+# =============================================================================
+# TESTS - Fair Value Gaps
+# =============================================================================
+
+class TestFairValueGaps:
+    """Tests pour _detect_fair_value_gaps."""
+
+    def test_gaps_match_bar_by_bar_scan(self, analyzer):
+        """Test memes FVGs (20 derniers, ordre chronologique) qu'un parcours bougie par bougie."""
+        base_date = datetime(2024, 1, 1)
+        data = []
+        for i in range(120):
+            close = 100 + 8 * math.sin(i / 3) + (3 if i % 7 == 0 else 0)
+            data.append(HistoricalDataPoint(
+                date=base_date + timedelta(days=i),
+                open=close, high=close + 0.5, low=close - 0.5, close=close, volume=1,
+            ))
+        df = analyzer._to_dataframe(data)
+        highs = df['high'].tolist()
+        lows = df['low'].tolist()
+
+        expected = []
+        for i in range(2, len(df)):
+            if lows[i] > highs[i - 2]:
+                expected.append((df.index[i - 2], lows[i], highs[i - 2], True))
+            if highs[i] < lows[i - 2]:
+                expected.append((df.index[i - 2], lows[i - 2], highs[i], False))
+
+        fvgs = analyzer._detect_fair_value_gaps(_OHLCArrays.from_dataframe(df))
+
+        assert len(expected) > 20
+        assert [(f.start_date, f.top, f.bottom, f.is_bullish) for f in fvgs] == expected[-20:]
+
+
+# =============================================================================
+# TESTS - Order Blocks
+# =============================================================================
+
+class TestOrderBlocks:
+    """Tests pour _detect_order_blocks."""
+
+    def test_blocks_match_lookback_scan(self, analyzer):
+        """Test memes order blocks qu'une recherche arriere sur 5 bougies."""
+        base_date = datetime(2024, 1, 1)
+        data = []
+        for i in range(150):
+            close = 100 + 6 * math.sin(i / 4) + (4 if i % 11 == 0 else 0)
+            open_ = close + (0.3 if i % 3 else -0.3)
+            data.append(HistoricalDataPoint(
+                date=base_date + timedelta(days=i),
+                open=open_, high=max(open_, close) + 0.2, low=min(open_, close) - 0.2,
+                close=close, volume=1,
+            ))
+        df = analyzer._to_dataframe(data)
+        opens, closes = df['open'].tolist(), df['close'].tolist()
+        threshold = 1.0
+
+        expected = []
+        for i in range(2, len(df) - 1):
+            for bullish, move, is_opposite in (
+                (True, closes[i + 1] - closes[i - 1], lambda j: closes[j] < opens[j]),
+                (False, closes[i - 1] - closes[i + 1], lambda j: closes[j] > opens[j]),
+            ):
+                if move > threshold:
+                    for j in range(i, max(0, i - 5), -1):
+                        if is_opposite(j):
+                            expected.append((df.index[j], bullish))
+                            break
+        bars = _OHLCArrays.from_dataframe(df)
+
+        blocks = analyzer._detect_order_blocks(bars, atr=threshold / 2)
+
+        assert len(expected) > 10
+        assert [(ob.date, ob.is_bullish) for ob in blocks] == expected[-10:]
+
+
+# =============================================================================
+# TESTS - Niveau le plus proche
+# =============================================================================
+
+class TestNearestLevel:
+    """Tests pour _find_nearest_level."""
+
+    def test_nearest_above_and_below(self, analyzer):
+        """Test niveau strictement au-dessus / en-dessous le plus proche."""
+        levels = [105.0, 95.0, 100.0, 110.0, 90.0]
+
+        assert analyzer._find_nearest_level(levels, 100.0, above=True) == 105.0
+        assert analyzer._find_nearest_level(levels, 100.0, above=False) == 95.0
+
+    def test_no_level_on_that_side(self, analyzer):
+        """Test aucun niveau du bon cote = None."""
+        assert analyzer._find_nearest_level([90.0, 95.0], 100.0, above=True) is None
+        assert analyzer._find_nearest_level([105.0], 100.0, above=False) is None
+        assert analyzer._find_nearest_level([], 100.0) is None
+
+
+# =============================================================================
+# TESTS - Niveaux cles
+# =============================================================================
+
+class TestFindKeyLevels:
+    """Tests pour find_key_levels."""
+
+    @pytest.mark.asyncio
+    async def test_levels_surround_current_price(self, analyzer, oscillating_data):
+        """Test supports sous le prix et resistances au-dessus, tries par proximite."""
+        current_price = oscillating_data[-1].close
+
+        supports, resistances = await analyzer.find_key_levels(
+            "TEST", oscillating_data, max_levels=3
+        )
+
+        assert 0 < len(supports) <= 3
+        assert 0 < len(resistances) <= 3
+        assert all(level < current_price for level in supports)
+        assert all(level > current_price for level in resistances)
+        assert supports == sorted(supports, reverse=True)
+        assert resistances == sorted(resistances)
+
+    @pytest.mark.asyncio
+    async def test_levels_match_full_swing_detection(self, analyzer, oscillating_data):
+        """Test niveaux identiques a un tri complet des swing points."""
+        df = analyzer._to_dataframe(oscillating_data)
+        swings = analyzer._detect_swing_points(_OHLCArrays.from_dataframe(df)).points
+        current_price = oscillating_data[-1].close
+        lows = sorted(
+            {s.price for s in swings if s.swing_type.value.endswith("L") and s.price < current_price},
+            reverse=True,
+        )
+
+        supports, _ = await analyzer.find_key_levels("TEST", oscillating_data, max_levels=2)
+
+        assert supports == lows[:2]
+
+    @pytest.mark.asyncio
+    async def test_insufficient_data(self, analyzer, oscillating_data):
+        """Test donnees insuffisantes."""
+        supports, resistances = await analyzer.find_key_levels("TEST", oscillating_data[:20])
+
+        assert supports == []
+        assert resistances == []
@@ -0,0 +1,473 @@
+"""
+Tests unitaires pour le service d'actualites.
+
+Ces tests verifient:
+- L'analyse de sentiment par mots cles
+- Le cache memoire devant SQLite
+- Les news generales du marche
+- Le resume multi-tickers
+- La sauvegarde en lot du cache
+- Le nettoyage du cache
+- La recherche plein texte
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.services import news_service as news_service_module
+from src.application.services.news_service import NewsService
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.database import migrations as migrations_module
+from src.infrastructure.database.migrations import run_migrations
+from src.infrastructure.database.repositories.news_repository import (
+    NewsArticle,
+    NewsRepository,
+    Sentiment,
+)
+from src.infrastructure.providers.finnhub_provider import FinnhubNews
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def mock_finnhub():
+    """Mock du provider Finnhub."""
+    finnhub = MagicMock()
+    finnhub.is_configured = True
+    finnhub.get_company_news = AsyncMock(return_value=[])
+    finnhub.get_market_news = AsyncMock(return_value=[])
+    return finnhub
+
+
+@pytest.fixture
+def mock_news_repo():
+    """Mock du repository des news."""
+    repo = MagicMock()
+    repo.is_cache_fresh = AsyncMock(return_value=False)
+    repo.get_by_ticker = AsyncMock(return_value=[])
+    repo.save_many = AsyncMock(return_value=0)
+    return repo
+
+
+@pytest.fixture
+def service(mock_finnhub, mock_news_repo):
+    """Service avec dependances mockees."""
+    return NewsService(finnhub=mock_finnhub, news_repo=mock_news_repo)
+
+
+@pytest.fixture
+async def sqlite_db(tmp_path):
+    """Base SQLite temporaire avec schema."""
+    db = DatabaseConnection(str(tmp_path / "news.db"))
+    await db.connect()
+    await run_migrations(db)
+    yield db
+    await db.disconnect()
+
+
+def make_news(headline: str, summary: str = "") -> FinnhubNews:
+    """Cree une news Finnhub de test."""
+    return FinnhubNews(
+        id="news-1",
+        headline=headline,
+        summary=summary,
+        source="Reuters",
+        url="https://example.com/news-1",
+        image_url=None,
+        category="company",
+        published_at="2024-01-01T10:00:00",
+        related_tickers=["AAPL"],
+    )
+
+
+# =============================================================================
+# TESTS - Sentiment
+# =============================================================================
+
+class TestConvertToArticle:
+    """Tests pour _convert_articles."""
+
+    def test_distinct_keywords_counted_once(self, service):
+        """Test chaque mot cle compte une fois, sous-chaines incluses (rises)."""
+        [article] = service._convert_articles(
+            [make_news("Apple SURGES and rises", "Shares rise, strong surge")], ["aapl"]
+        )
+
+        assert article.ticker == "AAPL"
+        assert article.sentiment == Sentiment.POSITIVE
+        assert article.sentiment_score == pytest.approx(0.6)
+
+    def test_negative_and_neutral(self, service):
+        """Test mots negatifs majoritaires = negatif, egalite = neutre."""
+        negative, neutral = service._convert_articles(
+            [make_news("Stock plunges", "Weak guidance"), make_news("Gain then drop")],
+            ["AAPL", "AAPL"],
+        )
+
+        assert negative.sentiment == Sentiment.NEGATIVE
+        assert negative.sentiment_score == pytest.approx(-0.5)
+        assert neutral.sentiment == Sentiment.NEUTRAL
+        assert neutral.sentiment_score == 0.0
+
+    def test_scores_clamped(self, service):
+        """Test score borne a [-1, 1] quand beaucoup de mots cles sont presents."""
+        positive, negative = service._convert_articles(
+            [
+                make_news("Surge gain rise jump beat strong bullish upgrade"),
+                make_news("Drop fall miss weak bearish downgrade plunge crash"),
+            ],
+            ["AAPL", "AAPL"],
+        )
+
+        assert positive.sentiment_score == 1.0
+        assert negative.sentiment_score == -1.0
+
+
+# =============================================================================
+# TESTS - Cache memoire
+# =============================================================================
+
+class TestHotCache:
+    """Tests pour le cache memoire de get_news_for_ticker."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_served_from_memory(self, service, mock_finnhub, mock_news_repo):
+        """Test apres un fetch Finnhub, les appels suivants ne touchent pas SQLite."""
+        mock_finnhub.get_company_news.return_value = [make_news("Apple news")]
+
+        first = await service.get_news_for_ticker("aapl", limit=5)
+        second = await service.get_news_for_ticker("AAPL", limit=5)
+
+        assert [a.id for a in second] == [a.id for a in first]
+        assert mock_news_repo.is_cache_fresh.await_count == 1
+        assert mock_finnhub.get_company_news.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_list_not_reused_for_larger_limit(self, service, mock_news_repo):
+        """Test liste tronquee par limit = nouvelle lecture pour une limite plus grande."""
+        mock_news_repo.is_cache_fresh.return_value = True
+        mock_news_repo.get_by_ticker.return_value = [
+            NewsArticle(id=str(i), ticker="AAPL", headline="News") for i in range(2)
+        ]
+
+        await service.get_news_for_ticker("AAPL", limit=2)
+        await service.get_news_for_ticker("AAPL", limit=1)
+        await service.get_news_for_ticker("AAPL", limit=5)
+
+        assert mock_news_repo.get_by_ticker.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_and_cleanup_bypass(self, service, mock_finnhub, mock_news_repo):
+        """Test force_refresh ignore le cache, cleanup le vide."""
+        mock_finnhub.get_company_news.return_value = [make_news("Apple news")]
+        mock_news_repo.cleanup_old = AsyncMock(return_value=0)
+
+        await service.get_news_for_ticker("AAPL")
+        await service.get_news_for_ticker("AAPL", force_refresh=True)
+        assert mock_finnhub.get_company_news.await_count == 2
+
+        await service.cleanup_old_cache()
+        await service.get_news_for_ticker("AAPL")
+        assert mock_news_repo.is_cache_fresh.await_count == 2
+
+
+# =============================================================================
+# TESTS - Rafraichissements concurrents
+# =============================================================================
+
+class TestRefreshCoalescing:
+    """Tests pour le partage des appels Finnhub en cours."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self, service, mock_finnhub):
+        """Test appels concurrents sur un cache perime = un seul appel Finnhub."""
+        async def slow_news(ticker):
+            await asyncio.sleep(0.01)
+            return [make_news("Apple news")]
+
+        mock_finnhub.get_company_news.side_effect = slow_news
+
+        results = await asyncio.gather(
+            service.get_news_for_ticker("AAPL", limit=1),
+            service.get_news_for_ticker("aapl", limit=5),
+            service.get_news_for_ticker("AAPL", force_refresh=True),
+        )
+
+        assert mock_finnhub.get_company_news.await_count == 1
+        assert all(len(articles) == 1 for articles in results)
+        assert service._refreshing == {}
+
+    @pytest.mark.asyncio
+    async def test_cache_save_runs_in_background(self, service, mock_finnhub, mock_news_repo):
+        """Test articles retournes sans attendre la sauvegarde, flush attend sa fin."""
+        saved = asyncio.Event()
+
+        async def slow_save(articles):
+            await asyncio.sleep(0.01)
+            saved.set()
+            raise RuntimeError("disk full")
+
+        mock_finnhub.get_company_news.return_value = [make_news("Apple news")]
+        mock_news_repo.save_many.side_effect = slow_save
+
+        articles = await service.get_news_for_ticker("AAPL")
+        assert len(articles) == 1
+        assert not saved.is_set()
+
+        await service.flush()
+        assert saved.is_set()
+        assert service._pending_saves == set()
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_falls_back_to_cache(self, service, mock_finnhub, mock_news_repo):
+        """Test erreur Finnhub = articles du cache SQLite."""
+        mock_finnhub.get_company_news.side_effect = RuntimeError("boom")
+        cached = [NewsArticle(id="a", ticker="AAPL", headline="Cached")]
+        mock_news_repo.get_by_ticker.return_value = cached
+
+        assert await service.get_news_for_ticker("AAPL") == cached
+
+
+# =============================================================================
+# TESTS - News du marche
+# =============================================================================
+
+class TestMarketNews:
+    """Tests pour get_market_news."""
+
+    @pytest.mark.asyncio
+    async def test_limit_and_related_ticker(self, service, mock_finnhub):
+        """Test au plus limit articles, ticker lie ou MARKET par defaut."""
+        first = make_news("Fed holds rates")
+        first.related_tickers = []
+        mock_finnhub.get_market_news.return_value = [first] + [make_news("Apple news")] * 4
+
+        articles = await service.get_market_news(limit=3)
+
+        assert [a.ticker for a in articles] == ["MARKET", "AAPL", "AAPL"]
+
+
+# =============================================================================
+# TESTS - Resume multi-tickers
+# =============================================================================
+
+class TestNewsSummary:
+    """Tests pour get_news_summary."""
+
+    @pytest.mark.asyncio
+    async def test_tickers_fetched_concurrently(self, service, monkeypatch):
+        """Test les tickers sont recuperes en parallele, cles en majuscules."""
+        running = 0
+        peak = 0
+
+        async def fake_get_news(ticker, limit=20, force_refresh=False):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [NewsArticle(id=f"{ticker}-1", ticker=ticker.upper(), headline="News")]
+
+        monkeypatch.setattr(service, "get_news_for_ticker", fake_get_news)
+
+        result = await service.get_news_summary(["aapl", "msft", "tsla"])
+
+        assert list(result) == ["AAPL", "MSFT", "TSLA"]
+        # Ticker passe deja en majuscules
+        assert result["MSFT"][0]["id"] == "MSFT-1"
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_slow_ticker_does_not_block_batch(self, service, monkeypatch):
+        """Test un ticker trop lent = liste vide, les autres sont retournes."""
+        monkeypatch.setattr(news_service_module, "API_TIMEOUT_SECONDS", 0.05)
+
+        async def fake_get_news(ticker, limit=20, force_refresh=False):
+            if ticker == "SLOW":
+                await asyncio.sleep(1)
+            return [NewsArticle(id=ticker, ticker=ticker, headline="News")]
+
+        monkeypatch.setattr(service, "get_news_for_ticker", fake_get_news)
+
+        result = await service.get_news_summary(["SLOW", "AAPL"])
+
+        assert result["SLOW"] == []
+        assert result["AAPL"][0]["id"] == "AAPL"
+
+    @pytest.mark.asyncio
+    async def test_failing_ticker_does_not_fail_batch(self, service, monkeypatch):
+        """Test un ticker en erreur = liste vide, les autres sont retournes."""
+        async def fake_get_news(ticker, limit=20, force_refresh=False):
+            if ticker == "BAD":
+                raise RuntimeError("database is locked")
+            return [NewsArticle(id=ticker, ticker=ticker, headline="News")]
+
+        monkeypatch.setattr(service, "get_news_for_ticker", fake_get_news)
+
+        result = await service.get_news_summary(["BAD", "AAPL"])
+
+        assert result["BAD"] == []
+        assert result["AAPL"][0]["id"] == "AAPL"
+
+
+# =============================================================================
+# TESTS - Entite
+# =============================================================================
+
+class TestNewsArticleToDict:
+    """Tests pour NewsArticle.to_dict."""
+
+    def test_fixed_fields_memoized_age_recomputed(self, monkeypatch):
+        """Test champs fixes construits une fois, age_hours recalcule, copie independante."""
+        article = NewsArticle(
+            id="a", ticker="AAPL", headline="News", sentiment=Sentiment.POSITIVE,
+            published_at=datetime.now().isoformat(),
+        )
+
+        first = article.to_dict()
+        first["headline"] = "changed"
+        monkeypatch.setattr(NewsArticle, "age_hours", property(lambda self: 5.0))
+        second = article.to_dict()
+
+        assert second["headline"] == "News"
+        assert second["sentiment"] == "positive"
+        assert second["age_hours"] == 5.0
+        assert list(second)[-1] == "age_hours"
+        assert article == NewsArticle(
+            id="a", ticker="AAPL", headline="News", sentiment=Sentiment.POSITIVE,
+            published_at=article.published_at, fetched_at=article.fetched_at,
+        )
+
+
+# =============================================================================
+# TESTS - Repository
+# =============================================================================
+
+class TestSaveMany:
+    """Tests pour NewsRepository.save_many."""
+
+    @pytest.mark.asyncio
+    async def test_batch_upsert_dedupes_ids(self, sqlite_db):
+        """Test un seul executemany, doublons fusionnes, articles existants mis a jour."""
+        repo = NewsRepository(sqlite_db)
+        await repo.save(NewsArticle(id="a", ticker="AAPL", headline="Old"))
+        spy = AsyncMock(wraps=sqlite_db.execute_many)
+        sqlite_db.execute_many = spy
+
+        count = await repo.save_many([
+            NewsArticle(id="a", ticker="aapl", headline="First"),
+            NewsArticle(id="b", ticker="AAPL", headline="Other"),
+            NewsArticle(id="a", ticker="AAPL", headline="Latest"),
+        ])
+
+        assert count == 2
+        assert spy.await_count == 1
+        articles = {a.id: a for a in await repo.get_by_ticker("AAPL")}
+        assert articles["a"].headline == "Latest"
+        assert set(articles) == {"a", "b"}
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, sqlite_db):
+        """Test lot vide = aucune ecriture."""
+        assert await NewsRepository(sqlite_db).save_many([]) == 0
+
+
+class TestCleanupOld:
+    """Tests pour NewsRepository.cleanup_old."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_only_expired_rows(self, sqlite_db):
+        """Test suppression des articles recuperes avant la limite, nombre retourne."""
+        repo = NewsRepository(sqlite_db)
+        await repo.save_many([
+            NewsArticle(id="old", ticker="AAPL", headline="Old", fetched_at="2000-01-01T00:00:00"),
+            NewsArticle(id="new", ticker="AAPL", headline="New"),
+        ])
+
+        assert await repo.cleanup_old(max_age_hours=72) == 1
+        assert [a.id for a in await repo.get_by_ticker("AAPL")] == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_delete_uses_fetched_index(self, sqlite_db):
+        """Test la suppression passe par l'index sur fetched_at (pas de scan complet)."""
+        plan = await sqlite_db.fetch_all(
+            "EXPLAIN QUERY PLAN DELETE FROM news_cache WHERE fetched_at < ?",
+            ("2000-01-01",),
+        )
+
+        assert any("idx_news_fetched" in row["detail"] for row in plan)
+
+
+class TestSearch:
+    """Tests pour NewsRepository.search (index FTS5)."""
+
+    @pytest.fixture
+    async def repo(self, sqlite_db):
+        """Repository avec quelques articles recents."""
+        repo = NewsRepository(sqlite_db)
+        recent = datetime.now().isoformat()
+        await repo.save_many([
+            NewsArticle(id="a", ticker="AAPL", headline="Apple unveils Vision Pro",
+                        summary="Headset launch", published_at=recent),
+            NewsArticle(id="b", ticker="MSFT", headline="Microsoft earnings",
+                        summary="Cloud revenue up 20%", published_at=recent),
+            NewsArticle(id="c", ticker="AAPL", headline="Old apple story",
+                        published_at="2000-01-01T00:00:00"),
+        ])
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_substring_case_insensitive(self, repo):
+        """Test sous-chaine dans titre ou resume, casse ignoree, articles anciens exclus."""
+        assert [a.id for a in await repo.search("APPLE")] == ["a"]
+        assert [a.id for a in await repo.search("venue")] == ["b"]
+        assert await repo.search("tesla") == []
+
+    @pytest.mark.asyncio
+    async def test_short_and_special_terms(self, repo):
+        """Test termes courts (LIKE) et caracteres speciaux echappes."""
+        assert [a.id for a in await repo.search("Pr")] == ["a"]
+        assert [a.id for a in await repo.search("0%")] == ["b"]
+        assert await repo.search('"') == []
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, repo, sqlite_db):
+        """Test l'index suit les upserts et suppressions du cache."""
+        await repo.save(NewsArticle(id="a", ticker="AAPL", headline="Apple cuts prices",
+                                    published_at=datetime.now().isoformat()))
+        assert await repo.search("vision") == []
+        assert [a.id for a in await repo.search("cuts")] == ["a"]
+
+        await sqlite_db.execute("DELETE FROM news_cache WHERE id = ?", ("a",))
+        assert await repo.search("cuts") == []
+
+
+class TestNewsFtsMigration:
+    """Tests pour la migration de l'index plein texte."""
+
+    @pytest.mark.asyncio
+    async def test_existing_database_is_indexed(self, tmp_path):
+        """Test une base en version 1 recoit l'index avec les articles deja en cache."""
+        db = DatabaseConnection(str(tmp_path / "v1.db"))
+        await db.connect()
+        async with db.transaction() as conn:
+            await conn.executescript(migrations_module.SCHEMA_SQL)
+            await conn.execute(
+                "INSERT INTO _migrations (version, description) VALUES (1, 'Initial schema')"
+            )
+        await NewsRepository(db).save(NewsArticle(
+            id="a", ticker="AAPL", headline="Apple news", published_at=datetime.now().isoformat()
+        ))
+
+        await run_migrations(db)
+        await run_migrations(db)
+
+        assert [a.id for a in await NewsRepository(db).search("apple")] == ["a"]
+        row = await db.fetch_one("SELECT MAX(version) AS version FROM _migrations")
+        assert row["version"] == 3
+        await db.disconnect()
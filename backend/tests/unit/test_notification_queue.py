@@ -0,0 +1,212 @@
+"""
+Tests unitaires pour la file de notifications Telegram.
+
+Ces tests verifient:
+- L'envoi en arriere-plan
+- Le dedoublonnage des notifications en attente
+- La tolerance aux erreurs d'envoi
+- Les envois concurrents
+- La pause commune apres un rate limit Telegram (429)
+- L'envoi des notifications en attente a l'arret
+- La resolution paresseuse du service Telegram
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.infrastructure.notifications import notification_queue as notification_queue_module
+from src.infrastructure.notifications.notification_queue import NotificationQueue
+from src.infrastructure.notifications.telegram_service import TelegramService
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def mock_telegram():
+    """Mock du service Telegram."""
+    telegram = MagicMock()
+    telegram.send_trade_opened = AsyncMock(return_value=True)
+    telegram.send_trade_closed = AsyncMock(return_value=True)
+    telegram.retry_delay = MagicMock(return_value=0.0)
+    telegram.wait_rate_limit = AsyncMock()
+    return telegram
+
+
+@pytest.fixture
+def queue(mock_telegram):
+    """File avec debit eleve pour des tests rapides."""
+    return NotificationQueue(telegram=mock_telegram, rate=1000)
+
+
+# =============================================================================
+# TESTS - File de notifications
+# =============================================================================
+
+class TestNotificationQueue:
+    """Tests pour NotificationQueue."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_sends_in_background(self, queue, mock_telegram):
+        """Test envoi effectue par le worker, pas par l'appelant."""
+        assert queue.enqueue(("t1", "opened"), "send_trade_opened", ticker="AAPL")
+        mock_telegram.send_trade_opened.assert_not_awaited()
+
+        await queue.join()
+
+        mock_telegram.send_trade_opened.assert_awaited_once_with(ticker="AAPL")
+
+    @pytest.mark.asyncio
+    async def test_pending_duplicates_are_dropped(self, queue, mock_telegram):
+        """Test meme cle en attente = un seul message."""
+        assert queue.enqueue(("t1", "closed"), "send_trade_closed", ticker="AAPL")
+        assert not queue.enqueue(("t1", "closed"), "send_trade_closed", ticker="AAPL")
+        assert queue.enqueue(("t2", "closed"), "send_trade_closed", ticker="MSFT")
+
+        await queue.join()
+
+        assert mock_telegram.send_trade_closed.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_send_error_does_not_stop_worker(self, queue, mock_telegram):
+        """Test une erreur d'envoi n'interrompt pas la file."""
+        mock_telegram.send_trade_opened.side_effect = [RuntimeError("down"), True]
+
+        queue.enqueue(("t1", "opened"), "send_trade_opened", ticker="AAPL")
+        queue.enqueue(("t2", "opened"), "send_trade_opened", ticker="MSFT")
+        await queue.join()
+
+        assert mock_telegram.send_trade_opened.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_send_does_not_block_next(self, queue, mock_telegram):
+        """Test un envoi lent n'empeche pas le suivant de partir."""
+        second_sent = asyncio.Event()
+
+        async def slow_then_fast(ticker):
+            if ticker == "AAPL":
+                await second_sent.wait()
+            else:
+                second_sent.set()
+            return True
+
+        mock_telegram.send_trade_opened.side_effect = slow_then_fast
+
+        queue.enqueue(("t1", "opened"), "send_trade_opened", ticker="AAPL")
+        queue.enqueue(("t2", "opened"), "send_trade_opened", ticker="MSFT")
+        await asyncio.wait_for(queue.join(), timeout=1)
+
+        assert mock_telegram.send_trade_opened.await_count == 2
+
+    def test_telegram_resolved_lazily(self, monkeypatch):
+        """Test le service Telegram n'est pas construit sans envoi."""
+        factory = MagicMock()
+        monkeypatch.setattr(notification_queue_module, "get_telegram_service", factory)
+
+        NotificationQueue()
+
+        factory.assert_not_called()
+
+
+# =============================================================================
+# TESTS - Rate limit Telegram
+# =============================================================================
+
+class FakeTelegramClient:
+    """Client HTTP Telegram: 429 pendant une fenetre, puis succes."""
+
+    def __init__(self, retry_after: float, limit: int):
+        self.retry_after = retry_after
+        self.limit = limit
+        self.calls = []
+        self.rejections = []
+        self.sent = 0
+        self.first_429 = asyncio.Event()
+
+    async def post(self, url, json):
+        now = time.monotonic()
+        self.calls.append(now)
+        index = len(self.calls)
+        await asyncio.sleep(0.01)
+
+        # Chat limite: au-dela de `limit` messages, 429 jusqu'a la fin du delai
+        throttled = not self.rejections or now < self.rejections[0] + self.retry_after
+        response = MagicMock()
+        if index > self.limit and throttled:
+            self.rejections.append(time.monotonic())
+            self.first_429.set()
+            response.status_code = 429
+            response.json.return_value = {"parameters": {"retry_after": self.retry_after}}
+        else:
+            self.sent += 1
+            response.status_code = 200
+            response.json.return_value = {"ok": True}
+        return response
+
+
+class TestRateLimit:
+    """Tests pour la pause commune apres un 429."""
+
+    @pytest.mark.asyncio
+    async def test_burst_waits_for_retry_after(self):
+        """Test rien n'est envoye pendant le delai et aucun message n'est perdu."""
+        telegram = TelegramService(bot_token="token", chat_id="chat")
+        client = FakeTelegramClient(retry_after=0.1, limit=2)
+        telegram._client = client
+        queue = NotificationQueue(telegram=telegram, rate=1000)
+
+        # Rafale (plusieurs 429 en vol), puis nouveaux messages pendant le delai
+        for i in range(5):
+            queue.enqueue(i, "send_message", text=f"Trade {i}")
+        await client.first_429.wait()
+        for i in range(5, 8):
+            queue.enqueue(i, "send_message", text=f"Trade {i}")
+        await asyncio.wait_for(queue.join(), timeout=5)
+
+        assert client.sent == 8
+        blocked_until = client.rejections[0] + client.retry_after
+        during_backoff = [t for t in client.calls if client.rejections[0] < t < blocked_until]
+        assert during_backoff == []
+
+
+# =============================================================================
+# TESTS - Arret de l'application
+# =============================================================================
+
+class TestShutdownDrain:
+    """Tests pour l'envoi des notifications en attente a l'arret."""
+
+    def test_not_started_without_notification(self, queue):
+        """Test la file n'est demarree qu'a la premiere notification."""
+        assert not queue.is_started
+
+    @pytest.mark.asyncio
+    async def test_shutdown_waits_for_pending_notifications(
+        self, queue, mock_telegram, monkeypatch
+    ):
+        """Test l'arret attend les notifications en file et en cours."""
+        from fastapi import FastAPI
+
+        from src.api.app import configure_lifecycle
+
+        async def slow_send(ticker):
+            await asyncio.sleep(0.05)
+            return True
+
+        mock_telegram.send_trade_closed.side_effect = slow_send
+        monkeypatch.setattr(notification_queue_module, "_notification_queue", queue)
+        app = FastAPI()
+        configure_lifecycle(app)
+
+        queue.enqueue(("t1", "closed"), "send_trade_closed", ticker="AAPL")
+        queue.enqueue(("t2", "closed"), "send_trade_closed", ticker="MSFT")
+        assert queue.is_started
+
+        await app.router.on_shutdown[0]()
+
+        assert mock_telegram.send_trade_closed.await_count == 2
+        assert mock_telegram.send_trade_closed.await_args_list[-1].kwargs == {"ticker": "MSFT"}
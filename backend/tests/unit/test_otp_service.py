@@ -0,0 +1,130 @@
+"""
+Tests unitaires pour le service OTP.
+
+Ces tests verifient:
+- Le hachage des codes
+- La demande de codes (limitation de debit)
+- La verification des codes
+- Le nettoyage des codes expires
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.application.services import otp_service as otp_service_module
+from src.application.services.otp_service import OTPAction, OTPService
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def service():
+    """Service OTP neuf."""
+    return OTPService()
+
+
+# =============================================================================
+# TESTS - Hachage
+# =============================================================================
+
+class TestHashCode:
+    """Tests pour _hash_code."""
+
+    def test_keyed_per_instance(self, service):
+        """Test hash stable pour une instance, different d'un SHA256 nu et d'une autre instance."""
+        code_hash = service._hash_code("123456")
+
+        assert service._hash_code("123456") == code_hash
+        assert code_hash != hashlib.sha256(b"123456").hexdigest()
+        assert OTPService()._hash_code("123456") != code_hash
+
+
+# =============================================================================
+# TESTS - Demande
+# =============================================================================
+
+class TestRequestOTP:
+    """Tests pour request_otp."""
+
+    def test_first_request_not_rate_limited(self, service, monkeypatch):
+        """Test premiere demande acceptee meme si l'horloge monotone est proche de 0."""
+        monkeypatch.setattr(otp_service_module.time, "monotonic", lambda: 1.0)
+
+        code, message = service.request_otp(OTPAction.UPDATE_SAXO)
+
+        assert code in message
+
+
+# =============================================================================
+# TESTS - Verification
+# =============================================================================
+
+class TestVerifyOTP:
+    """Tests pour verify_otp."""
+
+    def test_valid_code_consumed(self, service):
+        """Test code correct accepte une seule fois."""
+        code, _ = service.request_otp(OTPAction.UPDATE_SAXO)
+
+        assert service.verify_otp(OTPAction.UPDATE_SAXO, code)[0] is True
+        assert service.verify_otp(OTPAction.UPDATE_SAXO, code)[0] is False
+
+    def test_wrong_code_counts_attempts(self, service):
+        """Test code incorrect refuse, OTP invalide apres le maximum de tentatives."""
+        code, _ = service.request_otp(OTPAction.UPDATE_SAXO)
+        wrong = "000000" if code != "000000" else "111111"
+
+        for remaining in (2, 1, 0):
+            valid, message = service.verify_otp(OTPAction.UPDATE_SAXO, wrong)
+            assert valid is False
+            assert f"{remaining} tentative" in message
+
+        valid, message = service.verify_otp(OTPAction.UPDATE_SAXO, code)
+        assert valid is False
+        assert "Trop de tentatives" in message
+
+
+    def test_code_spent_once_across_threads(self, service):
+        """Test verifications concurrentes (threadpool) = un seul succes."""
+        code, _ = service.request_otp(OTPAction.DELETE_CREDENTIALS)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda _: service.verify_otp(OTPAction.DELETE_CREDENTIALS, code)[0],
+                range(32),
+            ))
+
+        assert results.count(True) == 1
+
+
+# =============================================================================
+# TESTS - Nettoyage
+# =============================================================================
+
+class TestCleanupExpired:
+    """Tests pour cleanup_expired."""
+
+    def test_only_expired_removed(self, service, monkeypatch):
+        """Test seuls les OTPs expires sont supprimes, les entrees obsoletes ignorees."""
+        clock = [1000.0]
+        monkeypatch.setattr(otp_service_module.time, "monotonic", lambda: clock[0])
+
+        service.request_otp(OTPAction.UPDATE_SAXO)
+        clock[0] += service.MIN_REQUEST_INTERVAL
+        service.request_otp(OTPAction.UPDATE_TELEGRAM)
+        clock[0] += service.MIN_REQUEST_INTERVAL
+        # Remplace l'OTP Saxo : l'ancienne entree du tas devient obsolete
+        service.request_otp(OTPAction.UPDATE_SAXO)
+
+        clock[0] = 1000.0 + service.OTP_VALIDITY_SECONDS + service.MIN_REQUEST_INTERVAL + 1
+        assert service.cleanup_expired() == 1
+        assert set(service._active_otps) == {OTPAction.UPDATE_SAXO}
+
+        clock[0] += service.MIN_REQUEST_INTERVAL
+        assert service.cleanup_expired() == 1
+        assert service._active_otps == {}
+        assert service._expiry_heap == []
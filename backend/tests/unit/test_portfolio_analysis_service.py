@@ -0,0 +1,588 @@
+"""
+Tests unitaires pour le service d'analyse du portefeuille.
+
+Ces tests verifient:
+- Le chargement unique de l'historique et des indicateurs par position
+- Le prechargement groupe des historiques du portefeuille
+- Le cache persistant des historiques du jour
+- La serialisation des positions enrichies
+- Le partage du service de news entre analyses
+- La limitation et le partage des appels externes
+- Le repli HOLD quand les donnees de marche sont indisponibles
+- La diffusion des positions au fil de leur analyse
+- Les metriques de risque (SL/TP suggeres, ratio, perte maximale)
+- La classification des signaux RSI et MACD
+"""
+
+import asyncio
+import math
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import orjson
+import pytest
+
+from src.application.interfaces.stock_data_provider import HistoricalDataPoint
+from src.application.services import portfolio_analysis_service as portfolio_module
+from src.application.services.portfolio_analysis_service import (
+    PortfolioAnalysisService,
+    PositionRecommendation,
+    _make_ticker,
+)
+from src.application.services.technical_calculator import TechnicalCalculator
+from src.domain.exceptions import DataFetchError
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.database.migrations import run_migrations
+from src.infrastructure.database.repositories.news_repository import NewsArticle
+from src.infrastructure.database.repositories.price_history_repository import (
+    CachedHistory,
+    PriceHistoryRepository,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_history(days: int = 300) -> list:
+    """Cree un historique oscillant de test."""
+    base_date = datetime(2024, 1, 1)
+    data = []
+    for i in range(days):
+        close = 100 + 10 * math.sin(i / 8) + i * 0.05
+        data.append(HistoricalDataPoint(
+            date=base_date + timedelta(days=i),
+            open=close,
+            high=close + 1,
+            low=close - 1,
+            close=close,
+            volume=1_000_000 + i,
+        ))
+    return data
+
+
+@pytest.fixture
+def mock_yahoo():
+    """Mock du provider Yahoo Finance."""
+    yahoo = MagicMock()
+    yahoo.get_historical_data = AsyncMock(return_value=make_history())
+    yahoo.get_historical_data_bulk = AsyncMock(return_value={})
+    return yahoo
+
+
+@pytest.fixture
+def calculator():
+    """Calculateur reel espionne."""
+    calc = TechnicalCalculator()
+    calc.calculate_all = AsyncMock(wraps=calc.calculate_all)
+    return calc
+
+
+@pytest.fixture
+def mock_news_service():
+    """Mock du service de news."""
+    news = MagicMock()
+    news.get_news_for_ticker = AsyncMock(return_value=[])
+    return news
+
+
+@pytest.fixture
+def mock_history_repo():
+    """Mock du cache persistant des historiques."""
+    repo = MagicMock()
+    repo.get_many = AsyncMock(return_value={})
+    repo.save_many = AsyncMock(return_value=0)
+    return repo
+
+
+@pytest.fixture
+def service(mock_yahoo, calculator, mock_news_service, mock_history_repo):
+    """Service avec dependances mockees."""
+    return PortfolioAnalysisService(
+        yahoo_provider=mock_yahoo,
+        technical_calculator=calculator,
+        news_service=mock_news_service,
+        history_repo=mock_history_repo,
+    )
+
+
+@pytest.fixture
+async def sqlite_db(tmp_path):
+    """Base SQLite temporaire avec schema."""
+    db = DatabaseConnection(str(tmp_path / "history.db"))
+    await db.connect()
+    await run_migrations(db)
+    yield db
+    await db.disconnect()
+
+
+@pytest.fixture
+def position():
+    """Position de test."""
+    return {
+        "symbol": "AAPL",
+        "description": "Apple Inc.",
+        "quantity": 10,
+        "current_price": 110.0,
+        "average_price": 100.0,
+        "market_value": 1100.0,
+        "pnl": 100.0,
+        "pnl_percent": 10.0,
+        "currency": "USD",
+        "asset_type": "Stock",
+    }
+
+
+# =============================================================================
+# TESTS - Donnees de marche partagees
+# =============================================================================
+
+class TestSharedMarketData:
+    """Tests pour le chargement unique des donnees par position."""
+
+    @pytest.mark.asyncio
+    async def test_history_and_indicators_loaded_once(
+        self, service, mock_yahoo, calculator, position
+    ):
+        """Test qu'une position ne declenche qu'un appel Yahoo et un calcul."""
+        result = await service.analyze_position(position, 5000.0)
+
+        assert mock_yahoo.get_historical_data.await_count == 1
+        assert calculator.calculate_all.await_count == 1
+        assert result.technical is not None
+        assert result.recommendation is not None
+        assert result.recommendation.confidence >= 0
+        assert result.risk is not None
+        assert result.sentiment is not None
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_falls_back_to_hold(self, service, mock_yahoo, position):
+        """Test qu'une erreur Yahoo donne une recommandation HOLD sans technique."""
+        mock_yahoo.get_historical_data.side_effect = DataFetchError("timeout")
+
+        result = await service.analyze_position(position, 5000.0)
+
+        assert result.technical is None
+        assert result.recommendation.action == "HOLD"
+        assert result.recommendation.confidence == 0
+        assert result.recommendation.reasoning[0].startswith("Erreur d'analyse")
+        assert result.risk is not None
+
+    @pytest.mark.asyncio
+    async def test_short_history_skips_indicators(
+        self, service, mock_yahoo, calculator, position
+    ):
+        """Test qu'un historique trop court n'appelle pas le calculateur."""
+        mock_yahoo.get_historical_data.return_value = make_history(20)
+
+        result = await service.analyze_position(position, 5000.0)
+
+        calculator.calculate_all.assert_not_awaited()
+        assert result.technical is None
+        assert result.recommendation.reasoning == ["Donnees insuffisantes pour analyse"]
+
+
+# =============================================================================
+# TESTS - Prechargement du portefeuille
+# =============================================================================
+
+class TestPortfolioPrefetch:
+    """Tests pour le prechargement groupe des historiques."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_history_shared_by_positions(
+        self, service, mock_yahoo, calculator, position
+    ):
+        """Test un seul appel groupe et aucun appel ni calcul individuel."""
+        other = dict(position, symbol="msft")
+        mock_yahoo.get_historical_data_bulk.return_value = {
+            "AAPL": make_history(),
+            "MSFT": make_history(),
+        }
+
+        results = await service.analyze_portfolio([position, other], 5000.0)
+
+        assert mock_yahoo.get_historical_data_bulk.await_count == 1
+        mock_yahoo.get_historical_data.assert_not_awaited()
+        calculator.calculate_all.assert_not_awaited()
+        assert [r.symbol for r in results] == ["AAPL", "msft"]
+        assert all(r.technical is not None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_missing_bulk_entry_falls_back(self, service, mock_yahoo, position):
+        """Test un symbole absent du lot recupere individuellement."""
+        mock_yahoo.get_historical_data_bulk.side_effect = RuntimeError("boom")
+
+        results = await service.analyze_portfolio([position], 5000.0)
+
+        assert mock_yahoo.get_historical_data.await_count == 1
+        assert results[0].technical is not None
+
+
+# =============================================================================
+# TESTS - Cache persistant des historiques
+# =============================================================================
+
+class TestHistoryCache:
+    """Tests pour le cache persistant des historiques du jour."""
+
+    @pytest.mark.asyncio
+    async def test_cached_history_skips_yahoo(
+        self, service, mock_yahoo, mock_history_repo, position
+    ):
+        """Test un historique recent en cache n'appelle pas Yahoo."""
+        mock_history_repo.get_many.return_value = {"AAPL": make_history()}
+
+        await service.analyze_portfolio([position], 5000.0)
+        await service.analyze_position(position, 5000.0)
+
+        mock_yahoo.get_historical_data_bulk.assert_not_awaited()
+        mock_yahoo.get_historical_data.assert_not_awaited()
+        mock_history_repo.save_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_fetched_history_saved(
+        self, service, mock_yahoo, mock_history_repo, position
+    ):
+        """Test un historique recupere sur Yahoo est mis en cache."""
+        mock_yahoo.get_historical_data_bulk.return_value = {"AAPL": make_history()}
+
+        await service.analyze_portfolio([position], 5000.0)
+
+        saved = mock_history_repo.save_many.await_args.args[0]
+        assert [(h.ticker, h.days) for h in saved] == [("AAPL", 365)]
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_ignored(
+        self, service, mock_yahoo, mock_history_repo, position
+    ):
+        """Test une base indisponible n'empeche pas l'analyse."""
+        mock_history_repo.get_many.side_effect = RuntimeError("no table")
+        mock_history_repo.save_many.side_effect = RuntimeError("no table")
+
+        result = await service.analyze_position(position, 5000.0)
+
+        assert mock_yahoo.get_historical_data.await_count == 1
+        assert result.technical is not None
+
+    @pytest.mark.asyncio
+    async def test_repository_round_trip(self, sqlite_db):
+        """Test sauvegarde puis relecture du jour, jour suivant ignore."""
+        repo = PriceHistoryRepository(sqlite_db)
+        history = make_history(5)
+
+        await repo.save_many([
+            CachedHistory(ticker="aapl", days=365, trading_day="2024-06-01", points=history),
+        ])
+
+        assert await repo.get_many(["AAPL"], 365, "2024-06-01") == {"AAPL": history}
+        assert await repo.get_many(["AAPL"], 365, "2024-06-02") == {}
+        assert await repo.get_many(["AAPL"], 30, "2024-06-01") == {}
+
+    @pytest.mark.asyncio
+    async def test_repository_ignores_stale_rows(self, sqlite_db):
+        """Test un historique plus vieux que l'age maximal n'est pas servi."""
+        repo = PriceHistoryRepository(sqlite_db)
+        day = portfolio_module.today_utc()
+        await repo.save_many([
+            CachedHistory(ticker="AAPL", days=365, trading_day=day, points=make_history(5)),
+        ])
+
+        assert list(await repo.get_many(["AAPL"], 365, day, max_age_seconds=300)) == ["AAPL"]
+
+        await sqlite_db.execute(
+            "UPDATE price_history_cache SET fetched_at = datetime('now', '-10 minutes')"
+        )
+
+        assert await repo.get_many(["AAPL"], 365, day, max_age_seconds=300) == {}
+        assert list(await repo.get_many(["AAPL"], 365, day)) == ["AAPL"]
+
+    @pytest.mark.asyncio
+    async def test_service_reads_with_ttl(self, service, mock_history_repo, position):
+        """Test le service ne lit que des historiques recents."""
+        await service.analyze_portfolio([position], 5000.0)
+
+        kwargs = mock_history_repo.get_many.await_args.kwargs
+        assert kwargs["max_age_seconds"] == portfolio_module.HISTORY_CACHE_TTL_SECONDS
+
+
+# =============================================================================
+# TESTS - Serialisation
+# =============================================================================
+
+class TestSerialization:
+    """Tests pour to_dict des dataclasses a slots."""
+
+    @pytest.mark.asyncio
+    async def test_to_dict_matches_asdict(self, service, position):
+        """Test to_dict des analyses identique a asdict, sans __dict__."""
+        result = await service.analyze_position(position, 5000.0)
+
+        for analysis in (result.technical, result.sentiment, result.risk, result.recommendation):
+            assert analysis.to_dict() == asdict(analysis)
+            assert not hasattr(analysis, "__dict__")
+
+        data = result.to_dict()
+        assert data["technical"] == asdict(result.technical)
+        assert data["current_price"] == 110.0
+
+    @pytest.mark.asyncio
+    async def test_json_bytes_match_to_dict(self, service, position):
+        """Test to_json_bytes (orjson) identique a to_dict."""
+        result = await service.analyze_position(position, 5000.0)
+
+        assert orjson.loads(result.to_json_bytes()) == result.to_dict()
+
+    def test_amounts_rounded_at_construction(self, service, position):
+        """Test montants arrondis une seule fois, a la construction."""
+        enhanced = service._create_minimal_position(
+            dict(position, current_price=110.456, pnl=-3.14159, pnl_percent=12.345678)
+        )
+
+        assert enhanced.current_price == 110.46
+        assert enhanced.pnl == -3.14
+        assert orjson.loads(enhanced.to_json_bytes())["pnl_percent"] == 12.35
+
+    def test_to_dict_copies_lists(self):
+        """Test les listes serialisees sont des copies."""
+        recommendation = PositionRecommendation(
+            symbol="AAPL", action="HOLD", confidence=0, reasoning=["RSI neutre (50)"]
+        )
+
+        data = recommendation.to_dict()
+        data["reasoning"].append("modifie")
+
+        assert recommendation.reasoning == ["RSI neutre (50)"]
+
+    def test_ticker_memoized(self):
+        """Test un meme symbole donne la meme instance de Ticker."""
+        assert _make_ticker("AAPL") is _make_ticker("AAPL")
+        assert _make_ticker("aapl").value == "AAPL"
+
+    @pytest.mark.asyncio
+    async def test_ticker_validated_once_per_symbol(self, service, mock_yahoo, position):
+        """Test un Ticker construit une seule fois par symbole du portefeuille."""
+        _make_ticker.cache_clear()
+        mock_yahoo.get_historical_data_bulk.return_value = {"AAPL": make_history()}
+
+        with patch.object(
+            portfolio_module, "Ticker", wraps=portfolio_module.Ticker
+        ) as ticker_cls:
+            await service.analyze_portfolio(
+                [position, dict(position), dict(position, symbol="MSFT")], 5000.0
+            )
+
+        assert sorted(call.args[0] for call in ticker_cls.call_args_list) == ["AAPL", "MSFT"]
+
+
+# =============================================================================
+# TESTS - Sentiment
+# =============================================================================
+
+class TestSentiment:
+    """Tests pour l'analyse de sentiment."""
+
+    def test_default_news_service_is_shared(self, mock_yahoo, mock_history_repo):
+        """Test le service de news par defaut est le singleton partage."""
+        shared = MagicMock()
+
+        with patch.object(portfolio_module, "get_news_service", return_value=shared):
+            first, second = (
+                PortfolioAnalysisService(yahoo_provider=mock_yahoo, history_repo=mock_history_repo)
+                for _ in range(2)
+            )
+
+        assert first._news_service is shared
+        assert second._news_service is shared
+
+    @pytest.mark.asyncio
+    async def test_average_ignores_missing_scores(self, service, mock_news_service):
+        """Test moyenne des scores connus, articles sans score ignores."""
+        mock_news_service.get_news_for_ticker.return_value = [
+            NewsArticle(id=str(i), ticker="AAPL", headline=f"News {i}", sentiment_score=score)
+            for i, score in enumerate([0.5, None, 0.2])
+        ]
+
+        sentiment = await service._analyze_sentiment("AAPL")
+
+        assert sentiment.sentiment_score == 0.35
+        assert sentiment.sentiment_label == "bullish"
+        assert sentiment.news_count == 3
+        assert sentiment.recent_headlines == ["News 0", "News 1", "News 2"]
+
+    @pytest.mark.asyncio
+    async def test_no_scores_is_neutral(self, service, mock_news_service):
+        """Test articles sans score: sentiment neutre."""
+        mock_news_service.get_news_for_ticker.return_value = [
+            NewsArticle(id="1", ticker="AAPL", headline="News"),
+        ]
+
+        sentiment = await service._analyze_sentiment("AAPL")
+
+        assert sentiment.sentiment_score == 0.0
+        assert sentiment.sentiment_label == "neutral"
+
+
+# =============================================================================
+# TESTS - Concurrence
+# =============================================================================
+
+class TestConcurrency:
+    """Tests pour la limitation et le partage des appels externes."""
+
+    @pytest.mark.asyncio
+    async def test_same_ticker_fetched_once(self, service, mock_yahoo, position):
+        """Test deux positions sur le meme ticker partagent un appel Yahoo."""
+        async def slow_history(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return make_history()
+
+        mock_yahoo.get_historical_data.side_effect = slow_history
+
+        results = await service.analyze_portfolio([position, dict(position)], 5000.0)
+
+        assert mock_yahoo.get_historical_data.await_count == 1
+        assert all(r.technical is not None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_news_calls_bounded(self, service, mock_news_service, position):
+        """Test le nombre d'appels news simultanes est borne."""
+        running = 0
+        peak = 0
+
+        async def slow_news(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        mock_news_service.get_news_for_ticker.side_effect = slow_news
+        positions = [dict(position, symbol=f"T{i}") for i in range(12)]
+
+        await service.analyze_portfolio(positions, 5000.0)
+
+        assert mock_news_service.get_news_for_ticker.await_count == 12
+        assert peak == portfolio_module.MAX_CONCURRENT_REQUESTS
+
+
+# =============================================================================
+# TESTS - Flux des positions
+# =============================================================================
+
+class TestStreaming:
+    """Tests pour la diffusion des positions au fil de l'eau."""
+
+    @pytest.mark.asyncio
+    async def test_fast_position_yielded_first(self, service, mock_news_service, position):
+        """Test une position rapide est emise avant une position lente."""
+        async def news(ticker, *args, **kwargs):
+            await asyncio.sleep(0.05 if ticker == "SLOW" else 0)
+            return []
+
+        mock_news_service.get_news_for_ticker.side_effect = news
+        positions = [dict(position, symbol="SLOW"), dict(position, symbol="FAST")]
+
+        symbols = [p.symbol async for p in service.iter_portfolio(positions, 5000.0)]
+
+        assert symbols == ["FAST", "SLOW"]
+
+    @pytest.mark.asyncio
+    async def test_failed_position_yields_minimal(self, service, position):
+        """Test une analyse en echec donne une position minimale."""
+        with patch.object(service, "analyze_position", side_effect=RuntimeError("boom")):
+            results = [p async for p in service.iter_portfolio([position], 5000.0)]
+
+        assert len(results) == 1
+        assert results[0].symbol == "AAPL"
+        assert results[0].technical is None
+
+    @pytest.mark.asyncio
+    async def test_empty_portfolio_yields_nothing(self, service, mock_yahoo):
+        """Test un portefeuille vide ne produit rien."""
+        results = [p async for p in service.iter_portfolio([], 0.0)]
+
+        assert results == []
+        mock_yahoo.get_historical_data_bulk.assert_not_awaited()
+
+
+# =============================================================================
+# TESTS - Risque
+# =============================================================================
+
+class TestRisk:
+    """Tests pour les metriques de risque."""
+
+    @pytest.mark.asyncio
+    async def test_levels_from_entry_price(self, service, position):
+        """Test SL/TP, ratio et perte maximale depuis le prix d'entree."""
+        risk = await service._analyze_risk(dict(position, quantity=-10), 5000.0)
+
+        assert risk.portfolio_weight == 22.0
+        assert risk.concentration_risk == "medium"
+        assert risk.suggested_stop_loss == 92.0
+        assert risk.suggested_take_profit == 124.0
+        assert risk.stop_loss_distance_pct == 8.0
+        assert risk.take_profit_distance_pct == 24.0
+        assert risk.risk_reward_ratio == 3.0
+        assert risk.max_loss_amount == 80.0
+
+    @pytest.mark.asyncio
+    async def test_current_price_without_entry(self, service, position):
+        """Test repli sur le prix courant, sans perte maximale."""
+        risk = await service._analyze_risk(dict(position, average_price=0), 5000.0)
+
+        assert risk.suggested_stop_loss == 101.2
+        assert risk.suggested_take_profit == 136.4
+        assert risk.risk_reward_ratio == 3.0
+        assert risk.max_loss_amount == 0
+
+    @pytest.mark.asyncio
+    async def test_no_price(self, service, position):
+        """Test aucun prix connu: ratio nul."""
+        risk = await service._analyze_risk(
+            dict(position, average_price=0, current_price=0), 0.0
+        )
+
+        assert risk.portfolio_weight == 0
+        assert risk.suggested_stop_loss == 0
+        assert risk.risk_reward_ratio == 0
+
+
+# =============================================================================
+# TESTS - Signaux RSI / MACD
+# =============================================================================
+
+class TestSignals:
+    """Tests pour la classification vectorisee des signaux."""
+
+    def test_rsi_zone_boundaries(self):
+        """Test bornes 20/30 incluses au-dessus, 70/80 incluses en dessous."""
+        rsi = np.array([10, 20, 25, 30, 50, 70, 75, 80, 90, np.nan])
+
+        zones = portfolio_module._rsi_zones(rsi)
+
+        assert zones.tolist() == [0, 1, 1, 2, 2, 2, 3, 3, 4, 2]
+        assert [portfolio_module._RSI_SIGNALS[z] for z in zones[[0, 4, 8]]] == [
+            "oversold", "neutral", "overbought",
+        ]
+
+    def test_macd_trend_by_sign(self):
+        """Test tendance MACD selon le signe de l'histogramme."""
+        signs = portfolio_module._macd_signs(np.array([0.5, -0.5, 0.0, np.nan]))
+
+        assert [portfolio_module._MACD_TRENDS[s] for s in signs] == [
+            "bullish", "bearish", "neutral", "neutral",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_recommendation_uses_native_types(self, service, position):
+        """Test score et confiance en types Python (serialisables)."""
+        result = await service.analyze_position(position, 5000.0)
+
+        assert type(result.recommendation.confidence) is int
+        assert result.recommendation.reasoning[0].startswith("RSI ")
+        assert type(result.technical.rsi_signal) is str
@@ -0,0 +1,270 @@
+"""
+Tests unitaires pour le calculateur d'indicateurs techniques.
+
+Ces tests verifient:
+- Le calcul complet des indicateurs
+- L'On-Balance Volume (OBV) vectorise
+- L'Average True Range (ATR) vectorise
+- Le RSI et les EMA partagees entre MACD et moyennes mobiles
+- Le calcul matriciel de plusieurs actifs
+- Le calcul dans un pool de processus
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.application.services import technical_calculator as calculator_module
+from src.application.services.technical_calculator import (
+    TechnicalCalculator,
+    get_indicator_pool,
+)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def calculator():
+    """Calculateur d'indicateurs."""
+    return TechnicalCalculator()
+
+
+@pytest.fixture
+def price_frame():
+    """DataFrame de prix avec hausses, baisses et cloture inchangees."""
+    rng = np.random.default_rng(42)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, 300)), 1)
+    volume = rng.integers(100_000, 1_000_000, 300)
+    high = close + rng.uniform(0, 2, 300)
+    low = close - rng.uniform(0, 2, 300)
+    return pd.DataFrame({"high": high, "low": low, "close": close, "volume": volume})
+
+
+# =============================================================================
+# TESTS - OBV
+# =============================================================================
+
+class TestOnBalanceVolume:
+    """Tests pour l'On-Balance Volume."""
+
+    def test_obv_matches_reference_loop(self, calculator, price_frame):
+        """Test OBV vectorise identique a la definition iterative."""
+        close = price_frame["close"].tolist()
+        volume = price_frame["volume"].tolist()
+
+        expected = [0]
+        for i in range(1, len(close)):
+            if close[i] > close[i - 1]:
+                expected.append(expected[-1] + volume[i])
+            elif close[i] < close[i - 1]:
+                expected.append(expected[-1] - volume[i])
+            else:
+                expected.append(expected[-1])
+
+        obv = calculator._calculate_obv(price_frame)
+
+        assert obv.iloc[0] == 0
+        assert np.allclose(obv.to_numpy(), expected)
+
+
+# =============================================================================
+# TESTS - ATR
+# =============================================================================
+
+class TestAverageTrueRange:
+    """Tests pour l'Average True Range."""
+
+    def test_atr_matches_pandas_reference(self, calculator, price_frame):
+        """Test ATR identique au calcul pandas (concat + max)."""
+        high, low, close = price_frame["high"], price_frame["low"], price_frame["close"]
+        true_range = pd.concat(
+            [high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()],
+            axis=1,
+        ).max(axis=1)
+        expected = float(true_range.ewm(span=14, adjust=False).mean().iloc[-1])
+
+        atr, atr_percent = calculator._calculate_atr(price_frame)
+
+        assert atr == pytest.approx(expected)
+        assert atr_percent == pytest.approx(expected / close.iloc[-1] * 100)
+
+
+# =============================================================================
+# TESTS - RSI et EMA partagees
+# =============================================================================
+
+class TestRsiAndSharedEma:
+    """Tests pour le RSI et les EMA 12/26 partagees."""
+
+    def test_rsi_matches_pandas_reference(self, calculator, price_frame):
+        """Test RSI identique au calcul pandas (deux ewm separes)."""
+        delta = price_frame["close"].diff()
+        avg_gain = delta.where(delta > 0, 0).ewm(span=14, adjust=False).mean()
+        avg_loss = (-delta).where(delta < 0, 0).ewm(span=14, adjust=False).mean()
+        expected = float((100 - 100 / (1 + avg_gain / avg_loss)).iloc[-1])
+
+        assert calculator._calculate_rsi(price_frame).value == pytest.approx(expected, rel=1e-12)
+
+    def test_rsi_without_losses(self, calculator, price_frame):
+        """Test RSI a 100 sans aucune baisse, neutre sans mouvement."""
+        rising = price_frame.assign(close=np.arange(300, dtype=float))
+        flat = price_frame.assign(close=100.0)
+
+        assert calculator._calculate_rsi(rising).value == 100.0
+        assert calculator._calculate_rsi(flat).value == 50.0
+
+    def test_shared_ema_matches_internal(self, calculator, price_frame):
+        """Test MACD et moyennes mobiles identiques avec EMA fournies."""
+        ema_12 = price_frame["close"].ewm(span=12, adjust=False).mean()
+        ema_26 = price_frame["close"].ewm(span=26, adjust=False).mean()
+
+        assert calculator._calculate_macd(
+            price_frame, ema_fast=ema_12, ema_slow=ema_26
+        ) == calculator._calculate_macd(price_frame)
+        assert calculator._calculate_moving_averages(
+            price_frame, ema_12=float(ema_12.iloc[-1]), ema_26=float(ema_26.iloc[-1])
+        ) == calculator._calculate_moving_averages(price_frame)
+
+
+# =============================================================================
+# TESTS - Calcul complet
+# =============================================================================
+
+class TestCalculateAll:
+    """Tests pour le calcul complet des indicateurs."""
+
+    @pytest.mark.asyncio
+    async def test_calculate_all(self, calculator, mock_historical_data):
+        """Test calcul de tous les indicateurs."""
+        indicators = await calculator.calculate_all("AAPL", mock_historical_data)
+
+        assert indicators is not None
+        assert 0 <= indicators.rsi.value <= 100
+        assert indicators.bollinger.lower_band < indicators.bollinger.upper_band
+        assert indicators.atr > 0
+
+    @pytest.mark.asyncio
+    async def test_calculate_all_insufficient_data(self, calculator, mock_historical_data):
+        """Test donnees insuffisantes."""
+        indicators = await calculator.calculate_all("AAPL", mock_historical_data[:10])
+
+        assert indicators is None
+
+
+# =============================================================================
+# TESTS - Calcul groupe
+# =============================================================================
+
+class TestCalculateBatch:
+    """Tests pour le calcul matriciel de plusieurs actifs."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_per_ticker(self, calculator, mock_historical_data):
+        """Test indicateurs identiques a calculate_all, longueurs differentes."""
+        data = {
+            "LONG": mock_historical_data,
+            "MID": mock_historical_data[-120:],
+            "SHORT": mock_historical_data[:10],
+        }
+
+        batch = await calculator.calculate_batch(data)
+
+        assert set(batch) == {"LONG", "MID"}
+        for ticker in batch:
+            expected = asdict(await calculator.calculate_all(ticker, data[ticker]))
+            actual = asdict(batch[ticker])
+            expected.pop("calculated_at")
+            actual.pop("calculated_at")
+            for name, fields in expected.items():
+                assert actual[name] == pytest.approx(fields, rel=1e-9), name
+
+    @pytest.mark.asyncio
+    async def test_batch_empty(self, calculator, mock_historical_data):
+        """Test aucun actif eligible."""
+        assert await calculator.calculate_batch({}) == {}
+        assert await calculator.calculate_batch({"AAPL": mock_historical_data[:10]}) == {}
+
+
+# =============================================================================
+# TESTS - Pool de processus
+# =============================================================================
+
+class TestProcessPool:
+    """Tests pour le calcul dans un pool de processus."""
+
+    @pytest.fixture
+    def pooled_calculator(self):
+        """Calculateur adosse a un pool de deux processus."""
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            yield TechnicalCalculator(executor=pool, workers=2)
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_thread(self, calculator, pooled_calculator, mock_historical_data):
+        """Test resultats identiques en processus et en thread."""
+        data = {"AAPL": mock_historical_data, "MSFT": mock_historical_data[-120:]}
+
+        single = asdict(await pooled_calculator.calculate_all("AAPL", mock_historical_data))
+        pooled = await pooled_calculator.calculate_batch(data)
+        threaded = await calculator.calculate_batch(data)
+
+        expected = asdict(await calculator.calculate_all("AAPL", mock_historical_data))
+        expected.pop("calculated_at")
+        single.pop("calculated_at")
+        assert single == expected
+
+        # Lots decoupes par worker: memes valeurs au dernier ulp pres
+        assert set(pooled) == {"AAPL", "MSFT"}
+        for ticker in pooled:
+            actual = asdict(pooled[ticker])
+            reference = asdict(threaded[ticker])
+            actual.pop("calculated_at")
+            reference.pop("calculated_at")
+            for name, fields in reference.items():
+                assert actual[name] == pytest.approx(fields, rel=1e-9), name
+
+    @staticmethod
+    async def _batch_chunks(calculator, data):
+        """Lots envoyes au pool par calculate_batch."""
+        chunks = []
+
+        async def run_in_executor(executor, func, chunk):
+            chunks.append(sorted(chunk))
+            return {}
+
+        with patch("asyncio.get_running_loop") as get_loop:
+            get_loop.return_value.run_in_executor = run_in_executor
+            await calculator.calculate_batch(data)
+        return chunks
+
+    @pytest.mark.asyncio
+    async def test_one_chunk_per_worker(self, mock_historical_data):
+        """Test un lot par worker declare, pas par coeur."""
+        calculator = TechnicalCalculator(executor=MagicMock(), workers=2)
+        data = {f"T{i}": mock_historical_data[-120:] for i in range(5)}
+
+        chunks = await self._batch_chunks(calculator, data)
+
+        assert chunks == [["T0", "T1", "T2"], ["T3", "T4"]]
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_chunks_from_settings(self, mock_historical_data, monkeypatch):
+        """Test le pool partage est decoupe selon INDICATOR_WORKERS."""
+        monkeypatch.setattr(calculator_module, "get_indicator_pool", MagicMock)
+        monkeypatch.setattr(
+            calculator_module, "get_settings", lambda: MagicMock(INDICATOR_WORKERS=3)
+        )
+        data = {f"T{i}": mock_historical_data[-120:] for i in range(6)}
+
+        chunks = await self._batch_chunks(TechnicalCalculator(), data)
+
+        assert len(chunks) == 3
+
+    def test_no_pool_by_default(self):
+        """Test aucun pool de processus sans INDICATOR_WORKERS."""
+        assert get_indicator_pool() is None
@@ -0,0 +1,154 @@
+"""
+Tests unitaires pour le provider Yahoo Finance.
+
+Ces tests verifient:
+- Le cache TTL des donnees historiques
+- Le telechargement groupe de plusieurs historiques
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.application.interfaces.stock_data_provider import HistoricalDataPoint
+from src.domain.value_objects.ticker import Ticker
+from src.infrastructure.providers.yahoo_finance_provider import YahooFinanceProvider
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def history():
+    """Historique minimal."""
+    return [
+        HistoricalDataPoint(
+            date=datetime(2024, 1, i + 1),
+            open=100.0,
+            high=101.0,
+            low=99.0,
+            close=100.5,
+            volume=1_000_000,
+        )
+        for i in range(3)
+    ]
+
+
+# =============================================================================
+# TESTS - Cache historique
+# =============================================================================
+
+class TestHistoricalCache:
+    """Tests pour le cache TTL des historiques."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_served_from_cache(self, history):
+        """Test un seul appel Yahoo pour deux lectures identiques."""
+        provider = YahooFinanceProvider(cache_ttl=60)
+        fetch = AsyncMock(return_value=list(history))
+
+        with patch.object(provider, "_fetch_historical_data", fetch):
+            first = await provider.get_historical_data(Ticker("AAPL"), days=365)
+            first.clear()
+            second = await provider.get_historical_data(Ticker("AAPL"), days=365)
+
+        assert fetch.await_count == 1
+        assert second == history
+
+    @pytest.mark.asyncio
+    async def test_cache_keyed_on_days(self, history):
+        """Test periodes differentes recuperees separement."""
+        provider = YahooFinanceProvider(cache_ttl=60)
+        fetch = AsyncMock(return_value=history)
+
+        with patch.object(provider, "_fetch_historical_data", fetch):
+            await provider.get_historical_data(Ticker("AAPL"), days=365)
+            await provider.get_historical_data(Ticker("AAPL"), days=30)
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_with_zero_ttl(self, history):
+        """Test TTL nul : aucun cache."""
+        provider = YahooFinanceProvider(cache_ttl=0)
+        fetch = AsyncMock(return_value=history)
+
+        with patch.object(provider, "_fetch_historical_data", fetch):
+            await provider.get_historical_data(Ticker("AAPL"))
+            await provider.get_historical_data(Ticker("AAPL"))
+
+        assert fetch.await_count == 2
+
+
+# =============================================================================
+# TESTS - Telechargement groupe
+# =============================================================================
+
+def make_bulk_frame(symbols):
+    """Cree un DataFrame yf.download(group_by='ticker') de test."""
+    index = pd.date_range("2024-01-01", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product(
+        [symbols, ["Open", "High", "Low", "Close", "Volume"]]
+    )
+    frame = pd.DataFrame(100.0, index=index, columns=columns)
+    # Jour ferme pour le dernier symbole
+    frame.loc[index[0], symbols[-1]] = np.nan
+    return frame
+
+
+class TestHistoricalBulk:
+    """Tests pour get_historical_data_bulk."""
+
+    @pytest.mark.asyncio
+    async def test_single_download_split_by_ticker(self):
+        """Test un seul yf.download pour plusieurs tickers, Saxo converti."""
+        provider = YahooFinanceProvider(cache_ttl=60)
+        frame = make_bulk_frame(["AAPL", "MC.PA"])
+
+        with patch("yfinance.download", return_value=frame) as download:
+            result = await provider.get_historical_data_bulk(
+                [Ticker("AAPL"), Ticker("MC:XPAR")], days=365
+            )
+
+        assert download.call_count == 1
+        assert download.call_args.kwargs["tickers"] == "AAPL MC.PA"
+        assert len(result["AAPL"]) == 3
+        assert len(result["MC:XPAR"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_results_cached(self):
+        """Test les historiques du lot servis ensuite depuis le cache."""
+        provider = YahooFinanceProvider(cache_ttl=60)
+        fetch = AsyncMock()
+
+        with patch("yfinance.download", return_value=make_bulk_frame(["AAPL"])):
+            await provider.get_historical_data_bulk([Ticker("AAPL")], days=365)
+
+        with patch.object(provider, "_fetch_historical_data", fetch), \
+                patch("yfinance.download") as download:
+            single = await provider.get_historical_data(Ticker("AAPL"), days=365)
+            again = await provider.get_historical_data_bulk([Ticker("AAPL")], days=365)
+
+        fetch.assert_not_awaited()
+        download.assert_not_called()
+        assert len(single) == 2
+        assert len(again["AAPL"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_and_failed_tickers_omitted(self):
+        """Test tickers absents ou erreur de telechargement ignores."""
+        provider = YahooFinanceProvider(cache_ttl=60)
+
+        with patch("yfinance.download", return_value=make_bulk_frame(["AAPL"])):
+            result = await provider.get_historical_data_bulk(
+                [Ticker("AAPL"), Ticker("ZZZZ")], days=365
+            )
+        assert set(result) == {"AAPL"}
+
+        with patch("yfinance.download", side_effect=RuntimeError("boom")):
+            result = await provider.get_historical_data_bulk([Ticker("MSFT")], days=365)
+        assert result == {}